@@ -1,16 +1,24 @@
 from django.db import models
 from django.conf import settings
+from common.models import VersionedModel
+from common.text import EXCERPT_LENGTH, make_excerpt
 
-class Client(models.Model):
+class Client(VersionedModel):
     name = models.CharField(max_length=255)
     email = models.EmailField(unique=True)
     phone = models.CharField(max_length=50)
     notes = models.TextField(blank=True, null=True)
+    # Precomputed so list queries can defer the full notes
+    notes_excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, default="", editable=False)
     agent = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="clients"
     )
 
+    def save(self, *args, **kwargs):
+        self.notes_excerpt = make_excerpt(self.notes)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.name} ({self.email})"
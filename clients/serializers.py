@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import Client
+from common.sparse import SparseFieldsetsMixin
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Client
         fields = ['id', 'name', 'email', 'phone', 'notes', 'agent']
@@ -15,4 +16,10 @@ class ClientSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = self.context['request'].user
         validated_data['agent'] = user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+
+class ClientListSerializer(ClientSerializer):
+    # Lists return the stored excerpt instead of the full notes
+    class Meta(ClientSerializer.Meta):
+        fields = ['id', 'name', 'email', 'phone', 'notes_excerpt', 'agent']
\ No newline at end of file
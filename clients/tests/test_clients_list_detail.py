@@ -1,3 +1,5 @@
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from rest_framework import status
 from django.urls import reverse
 from accounts.models import CustomUser
@@ -137,4 +139,24 @@ class ClientsListDetailTests(BaseUserTestCase):
         
         response = self.client.get(url)
 
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    # ! Test that the list returns an excerpt of the notes without loading them
+    def test_clients_list_returns_notes_excerpt(self):
+        Client.objects.filter(pk=self.client1.pk).delete()
+        client = Client.objects.create(
+            name="Client2", email="client2@test.com", phone="1", notes="Long notes " * 100, agent=self.agent_user
+        )
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("client-list-create"))
+
+        self.assertNotIn("notes", response.data[0])
+        self.assertEqual(len(response.data[0]["notes_excerpt"]), 200)
+        self.assertTrue(response.data[0]["notes_excerpt"].endswith("…"))
+        self.assertNotIn('."notes"', context.captured_queries[-1]["sql"])
+
+        response = self.client.get(reverse("client-detail", args=[client.id]))
+        self.assertEqual(response.data["notes"], client.notes)
@@ -1,11 +1,13 @@
 from rest_framework import generics
 from .models import Client
-from .serializers import ClientSerializer
+from .serializers import ClientListSerializer, ClientSerializer
 from .permissions import IsAgentOrAdminClient
 from drf_spectacular.utils import extend_schema
+from common.conditional import ConditionalRetrieveMixin
+from common.sparse import SparseFieldsetsViewMixin
 
 @extend_schema(tags=["Clients"])
-class ClientListCreateView(generics.ListCreateAPIView):
+class ClientListCreateView(SparseFieldsetsViewMixin, generics.ListCreateAPIView):
     serializer_class = ClientSerializer
     permission_classes = [IsAgentOrAdminClient]
 
@@ -14,17 +16,25 @@ class ClientListCreateView(generics.ListCreateAPIView):
             return Client.objects.none()
 
         
+        # The notes are only read by the detail endpoint
         user = self.request.user
         if user.role == 'admin':
-            return Client.objects.all()
-        return Client.objects.filter(agent=user)
+            return Client.objects.defer('notes')
+        return Client.objects.filter(agent=user).defer('notes')
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return ClientListSerializer
+        return ClientSerializer
 
     def perform_create(self, serializer):
         serializer.save(agent=self.request.user)
 @extend_schema(tags=["Clients"])
-class ClientRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class ClientRetrieveUpdateDestroyView(ConditionalRetrieveMixin, SparseFieldsetsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ClientSerializer
     permission_classes = [IsAgentOrAdminClient]
+    # Read by the object permission check
+    sparse_required_fields = ('agent', 'updated_at', 'version')
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
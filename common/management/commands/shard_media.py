@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from common.storage import ContentAddressedStorage, media_storage, shard_files
+from contracts.models import Contract
+from properties import cache as list_cache
+from properties.changes import record_changes
+from properties.models import Property, PropertyImage
+
+
+class Command(BaseCommand):
+    help = "Move property images and contract documents stored in flat directories into sharded ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        storage = media_storage()
+        if not isinstance(storage, ContentAddressedStorage):
+            raise CommandError("The media storage does not shard files.")
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        images = 0
+        for moved in shard_files(PropertyImage, 'image', batch_size, storage):
+            if moved:
+                # Listings and property details embed the image URLs
+                property_ids = set(
+                    PropertyImage.objects.filter(pk__in=moved).values_list('property_id', flat=True)
+                )
+                Property.objects.filter(pk__in=property_ids).update(updated_at=timezone.now())
+                record_changes(property_ids)
+                list_cache.invalidate()
+            images += len(moved)
+            self.stdout.write(f"Moved {images} images...")
+
+        documents = 0
+        for moved in shard_files(Contract, 'document', batch_size, storage):
+            documents += len(moved)
+            self.stdout.write(f"Moved {documents} contract documents...")
+
+        self.stdout.write(self.style.SUCCESS(f"Moved {images} images and {documents} contract documents."))
@@ -0,0 +1,48 @@
+from datetime import timedelta
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from common.media import file_fields, sweep_stored_files, sweep_untracked_files, walk_files
+from common.storage import media_storage
+from properties.models import PropertyImage
+from properties.renditions import RENDITIONS_DIR
+
+
+class Command(BaseCommand):
+    help = "Remove media files that no row references anymore, e.g. deletions lost in a restart"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=float, default=24,
+            help="Leave files and references changed more recently alone",
+        )
+
+    def handle(self, *args, **options):
+        if options['grace_hours'] < 0:
+            raise CommandError("--grace-hours must not be negative.")
+        older_than = timezone.now() - timedelta(hours=options['grace_hours'])
+        storage = media_storage()
+        fields = file_fields(storage)
+
+        released = sweep_stored_files(storage, fields, older_than)
+        # Renditions share the images directory but belong to the default storage
+        removed = sweep_untracked_files(storage, fields, older_than, exclude=(RENDITIONS_DIR + '/',))
+
+        # Renditions of deleted images; image ids are never reused
+        image_ids = {str(pk) for pk in PropertyImage.objects.values_list('pk', flat=True)}
+        renditions = 0
+        try:
+            directories = default_storage.listdir(RENDITIONS_DIR)[0]
+        except FileNotFoundError:
+            directories = []
+        for directory in directories:
+            if directory.isdigit() and directory not in image_ids:
+                names = list(walk_files(default_storage, f'{RENDITIONS_DIR}/{directory}'))
+                for name in names:
+                    default_storage.delete(name)
+                renditions += len(names)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Released {released} stored files, removed {removed} untracked files "
+            f"and {renditions} orphaned renditions."
+        ))
@@ -0,0 +1,165 @@
+import logging
+import posixpath
+import queue
+import threading
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Files whose rows have been deleted, waiting to be unlinked by the cleanup worker.
+# The queue lives in memory: files still queued when the process stops are found
+# later by sweep_media.
+_pending = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def delete_files_on_commit(storage, names):
+    # Files are only removed once the deleting transaction commits, never inside the request
+    names = [name for name in names if name]
+    if names:
+        transaction.on_commit(lambda: enqueue_file_deletion(storage, names))
+
+
+def enqueue_file_deletion(storage, names):
+    if not settings.MEDIA_CLEANUP_IN_BACKGROUND:
+        delete_files(storage, names)
+        return
+    for name in names:
+        _pending.put((storage, name))
+    _start_worker()
+
+
+def wait_for_file_deletions():
+    # Blocks until every queued file has been processed
+    _pending.join()
+
+
+def delete_files(storage, names):
+    # Storages may implement a batched delete_many(); otherwise files are removed one by one
+    delete_many = getattr(storage, 'delete_many', None)
+    if delete_many is not None:
+        delete_many(names)
+        return
+    for name in names:
+        storage.delete(name)
+
+
+def _start_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run_worker, name='media-cleanup', daemon=True)
+            _worker.start()
+
+
+def _run_worker():
+    from django.db import close_old_connections
+
+    while True:
+        batch = [_pending.get()]
+        while len(batch) < settings.MEDIA_CLEANUP_BATCH_SIZE:
+            try:
+                batch.append(_pending.get_nowait())
+            except queue.Empty:
+                break
+
+        by_storage = defaultdict(list)
+        for storage, name in batch:
+            by_storage[storage].append(name)
+        try:
+            for storage, names in by_storage.items():
+                try:
+                    delete_files(storage, names)
+                except Exception:
+                    logger.exception("Could not delete media files %s", names)
+        finally:
+            close_old_connections()
+            for _ in batch:
+                _pending.task_done()
+
+
+def file_fields(storage):
+    # (model, field name) of every file field stored in the storage
+    return [
+        (model, field.name)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and field.storage is storage
+    ]
+
+
+def referenced_names(fields):
+    counts = Counter()
+    for model, field_name in fields:
+        rows = model._default_manager.exclude(**{field_name: ''}).values(field_name).annotate(references=Count('pk'))
+        for row in rows:
+            counts[row[field_name]] += row['references']
+    return counts
+
+
+def sweep_stored_files(storage, fields, older_than):
+    # Matches the reference counts of content-addressed files to the rows that actually
+    # reference them and releases the files nobody references. Rows changed after
+    # older_than are skipped, and each fix is a compare-and-set, so concurrent uploads
+    # and deletions win. Returns the number of released files.
+    from .models import StoredFile
+
+    references = referenced_names(fields)
+    released = 0
+    for stored in StoredFile.objects.filter(updated_at__lt=older_than).iterator():
+        actual = references.get(stored.name, 0)
+        if actual == stored.ref_count:
+            continue
+        fixed = StoredFile.objects.filter(
+            pk=stored.pk, ref_count=stored.ref_count, updated_at=stored.updated_at
+        ).update(ref_count=max(actual, 1), updated_at=timezone.now())
+        if fixed and not actual:
+            # Releases the last reference: the row and the file go together
+            storage.delete(stored.name)
+            released += 1
+    return released
+
+
+def walk_files(storage, directory):
+    try:
+        directories, files = storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield posixpath.join(directory, name)
+    for subdirectory in directories:
+        yield from walk_files(storage, posixpath.join(directory, subdirectory))
+
+
+def sweep_untracked_files(storage, fields, older_than, exclude=()):
+    # Removes files of the upload directories that no row references and that the storage
+    # does not track (written before content addressing). Returns the number of removed files.
+    from .models import StoredFile
+
+    upload_to = [model._meta.get_field(field_name).upload_to for model, field_name in fields]
+    directories = {path.strip('/') for path in upload_to if isinstance(path, str)}
+    references = referenced_names(fields)
+    removed = 0
+    for directory in sorted(directories):
+        candidates = [
+            name for name in walk_files(storage, directory)
+            if name not in references and not any(name.startswith(prefix) for prefix in exclude)
+        ]
+        tracked = set()
+        for i in range(0, len(candidates), 500):
+            batch = candidates[i:i + 500]
+            tracked.update(StoredFile.objects.filter(name__in=batch).values_list('name', flat=True))
+        for name in candidates:
+            if name in tracked or storage.get_modified_time(name) >= older_than:
+                continue
+            # Without a StoredFile row the content-addressed storage simply unlinks it
+            storage.delete(name)
+            removed += 1
+    return removed
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedfile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
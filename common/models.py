@@ -0,0 +1,44 @@
+from django.db import models
+from django.db.models import F
+
+
+class StoredFile(models.Model):
+    # A content-addressed file and the number of rows referencing it
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set on every reference change; sweep_media leaves recently changed rows alone
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+
+class VersionedQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        # Bulk updates change the representation too
+        kwargs.setdefault('version', F('version') + 1)
+        return super().update(**kwargs)
+
+
+class VersionedModel(models.Model):
+    # Bumped on every save, used as the ETag of the detail endpoint
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = VersionedQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        # Incremented by the database, so concurrent saves never share a version
+        self.version = F('version') + 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'version'}
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['version'])
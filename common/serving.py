@@ -0,0 +1,113 @@
+import mimetypes
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.urls import re_path
+from django.utils.http import content_disposition_header, http_date, quote_etag
+from django.views.static import serve
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header, size):
+    # Returns (start, end) inclusive for a single byte range, None to send the whole
+    # file (no or multiple ranges) and False if the range cannot be satisfied
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def iter_range(file, start, length):
+    try:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def serve_file(request, field_file, filename=None, as_attachment=False):
+    # Serves a stored file after the caller checked permissions. With MEDIA_SENDFILE_BACKEND
+    # the web server sends the bytes (X-Accel-Redirect for nginx, X-Sendfile for Apache);
+    # otherwise it is streamed in chunks with single byte range support.
+    storage = field_file.storage
+    name = field_file.name
+    size = storage.size(name)
+    modified = storage.get_modified_time(name)
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    # Stored names are content-addressed, so name and size identify the bytes
+    etag = quote_etag(f'{posixpath.basename(name)}-{size}')
+
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    if backend == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        # Legacy names may contain spaces or non-ASCII characters
+        response['X-Accel-Redirect'] = settings.MEDIA_SENDFILE_INTERNAL_URL + quote(name)
+    elif backend == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = storage.path(name)
+    else:
+        byte_range = parse_range(request.headers.get('Range'), size)
+        if_range = request.headers.get('If-Range')
+        if if_range and if_range not in (etag, http_date(modified.timestamp())):
+            # The client's partial copy is outdated: send the whole file
+            byte_range = None
+
+        if byte_range is False:
+            response = HttpResponse(status=416, content_type=content_type)
+            response['Content-Range'] = f'bytes */{size}'
+        elif byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                iter_range(storage.open(name, 'rb'), start, length), status=206, content_type=content_type
+            )
+            response['Content-Length'] = str(length)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        else:
+            # Handed to the server's file wrapper (sendfile where available)
+            response = FileResponse(storage.open(name, 'rb'), content_type=content_type)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(modified.timestamp())
+    response['Cache-Control'] = 'private, no-cache'
+    if filename:
+        response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    return response
+
+
+def is_private_media(name):
+    name = posixpath.normpath(name).lstrip('/')
+    return any(name.startswith(directory) for directory in settings.MEDIA_PRIVATE_DIRECTORIES)
+
+
+def serve_public_media(request, path):
+    # Development server for MEDIA_ROOT that never serves the private directories
+    if is_private_media(path):
+        raise Http404
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
+
+
+def public_media_urlpatterns():
+    prefix = re.escape(settings.MEDIA_URL.lstrip('/'))
+    return [re_path(rf'^{prefix}(?P<path>.*)$', serve_public_media)]
@@ -0,0 +1,160 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_field_list(request, param):
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def get_sparse_params(request):
+    if request is None or request.method not in SAFE_METHODS:
+        return None, None
+    return parse_field_list(request, FIELDS_PARAM), parse_field_list(request, OMIT_PARAM)
+
+
+def wants_sparse_fields(request):
+    only, omit = get_sparse_params(request)
+    return only is not None or omit is not None
+
+
+class SparseFieldsetsMixin:
+    # Serializer mixin: ?fields=id,title keeps only those fields, ?omit=description drops
+    # fields. Only applies to reads and to the top-level serializer of the request.
+
+    def is_request_root(self):
+        root = self.root
+        return root is self or (root is self.parent and isinstance(root, serializers.ListSerializer))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, omit = get_sparse_params(self.context.get('request'))
+        if (only is None and omit is None) or not self.is_request_root():
+            return fields
+
+        readable = {name for name, field in fields.items() if not field.write_only}
+        unknown = ((only or set()) | (omit or set())) - readable
+        if unknown:
+            raise ValidationError({FIELDS_PARAM: f"Unknown fields: {', '.join(sorted(unknown))}."})
+
+        keep = (only if only is not None else readable) - (omit or set())
+        return {name: field for name, field in fields.items() if name in keep}
+
+
+def flatten_select_related(tree, prefix=''):
+    for name, subtree in tree.items():
+        path = f'{prefix}{name}'
+        if subtree:
+            yield from flatten_select_related(subtree, f'{path}__')
+        else:
+            yield path
+
+
+def related_columns(related_model, serializer, prefix):
+    # Columns read by a nested serializer, or nothing (all columns) if it reads more than plain fields
+    columns = set()
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        try:
+            model_field = related_model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return set()
+        if model_field.is_relation or not model_field.concrete:
+            return set()
+        columns.add(f'{prefix}__{field.source}')
+    return columns
+
+
+def sparse_queryset(queryset, serializer, required_fields=()):
+    # Loads only the columns and relations the pruned serializer reads:
+    # only() on concrete fields, dropping unused select_related joins and prefetches
+    model = queryset.model
+    only = {model._meta.pk.name}
+    joins = set()
+    prefetches = set()
+
+    for name in required_fields:
+        try:
+            if model._meta.get_field(name).concrete:
+                only.add(name)
+        except FieldDoesNotExist:
+            pass
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+            # Arbitrary attribute access: columns cannot be restricted
+            only = None
+        parts = field.source.split('.')
+        try:
+            model_field = model._meta.get_field(parts[0])
+        except FieldDoesNotExist:
+            # Annotations, properties and prefetches into to_attr lists
+            prefetches.add(parts[0])
+            continue
+
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetches.add(parts[0])
+        elif model_field.is_relation:
+            # Plain primary key fields read the local column and need no join
+            nested = isinstance(field, serializers.BaseSerializer)
+            if len(parts) > 1 or nested:
+                joins.add(parts[0])
+            if only is not None:
+                only.add(parts[0])
+                if len(parts) > 1:
+                    only.add('__'.join(parts))
+                elif nested:
+                    only.update(related_columns(model_field.related_model, field, parts[0]))
+        elif only is not None:
+            only.add(parts[0])
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        paths = [path for path in flatten_select_related(select_related) if path.split('__')[0] in joins]
+        # select_related() without arguments would follow every relation
+        queryset = queryset.select_related(None)
+        if paths:
+            queryset = queryset.select_related(*paths)
+
+    # Prefetches below a kept relation (e.g. property__images) are kept too
+    lookups = queryset._prefetch_related_lookups
+    if lookups:
+        queryset = queryset.prefetch_related(None).prefetch_related(*[
+            lookup for lookup in lookups
+            if getattr(lookup, 'prefetch_to', lookup).split('__')[0] in prefetches | joins
+        ])
+
+    if only is not None:
+        queryset = queryset.only(*only)
+    return queryset
+
+
+class SparseFieldsetsViewMixin:
+    # View mixin matching the queryset to ?fields= / ?omit=.
+    # sparse_required_fields are always loaded (ordering keys, validators...).
+    sparse_required_fields = ()
+
+    def get_sparse_required_fields(self):
+        required = set(self.sparse_required_fields)
+        ordering = getattr(getattr(self, 'paginator', None), 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        required.update(name.lstrip('-') for name in ordering)
+        return required
+
+    # Applied in filter_queryset so views overriding get_queryset are covered too
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not wants_sparse_fields(self.request):
+            return queryset
+        return sparse_queryset(queryset, self.get_serializer(), self.get_sparse_required_fields())
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import posixpath
+import re
+from collections import Counter
+
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+# Names written by ContentAddressedStorage: <directory>/ab/cd/<sha256>.<ext>
+SHARDED_NAME = r'^[^/]+/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.[^/]*)?$'
+
+
+def media_storage():
+    # Storage of uploaded media, configured under STORAGES["media"]
+    return storages['media']
+
+
+def is_sharded(name):
+    return re.match(SHARDED_NAME, name) is not None
+
+
+# Stores every file once under the SHA-256 of its content, in directories sharded by
+# hash prefix (property_images/ab/cd/<sha256>.jpg), and counts the rows referencing it.
+# A file is only unlinked when its last reference is deleted.
+class ContentAddressedStorage(FileSystemStorage):
+
+    def __init__(self, *args, **kwargs):
+        # Identical names always mean identical content, so overwriting is harmless
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(*args, **kwargs)
+
+    def hashed_name(self, name, digest):
+        directory = posixpath.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(directory, digest[:2], digest[2:4], f'{digest}{extension}')
+
+    def _save(self, name, content):
+        from .models import StoredFile
+
+        sha256 = hashlib.sha256()
+        size = 0
+        content.seek(0)
+        for chunk in content.chunks():
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            sha256.update(chunk)
+            size += len(chunk)
+        content.seek(0)
+        digest = sha256.hexdigest()
+        name = self.hashed_name(name, digest)
+
+        created = False
+        updated = StoredFile.objects.filter(name=name).update(
+            ref_count=F('ref_count') + 1, updated_at=timezone.now()
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    StoredFile.objects.create(name=name, sha256=digest, size=size, ref_count=1)
+                created = True
+            except IntegrityError:
+                StoredFile.objects.filter(name=name).update(
+                    ref_count=F('ref_count') + 1, updated_at=timezone.now()
+                )
+
+        # A new row always writes the file: a stale copy may be about to be unlinked
+        if created or not self.exists(name):
+            name = super()._save(name, content)
+        return name
+
+    def shard(self, name):
+        # Copies a file of the flat layout into its sharded location and returns the new name.
+        # The original stays in place until nothing references it.
+        with self.open(name, 'rb') as file:
+            return self.save(name, file)
+
+    def delete(self, name):
+        self.delete_many([name])
+
+    def delete_many(self, names):
+        # Releases one reference per name and unlinks the files nobody references anymore
+        from .models import StoredFile
+
+        counts = Counter(name for name in names if name)
+        if not counts:
+            return
+        with transaction.atomic():
+            # The UPDATE locks the rows, so a concurrent save of the same content waits for
+            # this transaction and then recreates the row and rewrites the file
+            for name, count in counts.items():
+                StoredFile.objects.filter(name=name).update(
+                    ref_count=F('ref_count') - count, updated_at=timezone.now()
+                )
+            tracked = set(StoredFile.objects.filter(name__in=counts).values_list('name', flat=True))
+            orphans = set(
+                StoredFile.objects.filter(name__in=counts, ref_count__lte=0).values_list('name', flat=True)
+            )
+            StoredFile.objects.filter(name__in=orphans).delete()
+
+            # Unlinked while the locks are held. Files stored before content addressing
+            # have no StoredFile row.
+            for name in orphans | (set(counts) - tracked):
+                super().delete(name)
+
+
+def shard_files(model, field_name, batch_size, storage=None):
+    # Moves the files of a model field still in the flat layout into sharded directories,
+    # one batch at a time, and yields the primary keys of each moved batch.
+    # Rows are switched with a compare-and-set so concurrent writes win, and rows already
+    # sharded are skipped, so an interrupted run simply resumes.
+    storage = storage or media_storage()
+    # Cached representations embed the file URL, so their validators must change too
+    touch = any(field.name == 'updated_at' for field in model._meta.concrete_fields)
+    pending = (
+        model._default_manager.exclude(**{field_name: ''})
+        .exclude(**{f'{field_name}__regex': SHARDED_NAME})
+        .order_by('pk')
+    )
+    last_pk = None
+    while True:
+        rows = pending if last_pk is None else pending.filter(pk__gt=last_pk)
+        rows = list(rows.values_list('pk', field_name)[:batch_size])
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+
+        moves = {}
+        for pk, name in rows:
+            try:
+                moves[pk] = (name, storage.shard(name))
+            except FileNotFoundError:
+                continue
+
+        moved, originals, copies = [], set(), []
+        with transaction.atomic():
+            for pk, (old, new) in moves.items():
+                values = {field_name: new}
+                if touch:
+                    values['updated_at'] = timezone.now()
+                if model._default_manager.filter(pk=pk, **{field_name: old}).update(**values):
+                    moved.append(pk)
+                    originals.add(old)
+                else:
+                    # The row changed or disappeared meanwhile: drop the copy
+                    copies.append(new)
+
+        # Originals still referenced by rows of a later batch are kept
+        still_used = set(
+            model._default_manager.filter(**{f'{field_name}__in': originals}).values_list(field_name, flat=True)
+        )
+        storage.delete_many(copies + list(originals - still_used))
+        yield moved
@@ -0,0 +1,188 @@
+from datetime import timedelta
+from unittest.mock import patch
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from clients.models import Client
+from contracts.models import Contract
+from properties.models import Property, PropertyImage
+from visits.models import Visit
+from common_tests.base import BaseUserTestCase
+
+
+class ConditionalGetTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # * Create a property, client, contract and visit for the agent
+        self.property = Property.objects.create(
+            title="Property 1",
+            description="Property 1 Description",
+            price=100000,
+            address="123 Property Street",
+            owner=self.agent_user,
+        )
+        self.client1 = Client.objects.create(
+            name="Client1",
+            email="client1@test.com",
+            phone="123456789",
+            agent=self.agent_user,
+        )
+        self.contract = Contract.objects.create(
+            property=self.property,
+            client=self.client1,
+            agent=self.agent_user,
+            type="rental",
+            price=1000,
+            start_date=timezone.now().date(),
+        )
+        self.visit = Visit.objects.create(
+            property=self.property,
+            client=self.client1,
+            agent=self.agent_user,
+            date=timezone.now() + timedelta(days=1),
+            status="scheduled",
+        )
+
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+        self.urls = {
+            "property": reverse("property-detail", args=[self.property.pk]),
+            "client": reverse("client-detail", args=[self.client1.pk]),
+            "contract": reverse("contract-detail", args=[self.contract.pk]),
+            "visit": reverse("visit-detail", args=[self.visit.pk]),
+        }
+
+    # ! Test that every detail endpoint returns 304 for a matching ETag
+    def test_if_none_match_returns_not_modified(self):
+        for name, url in self.urls.items():
+            with self.subTest(name):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                etag = response.headers["ETag"]
+                self.assertTrue(etag.startswith('"'))
+
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.headers["ETag"], etag)
+                self.assertEqual(response.content, b"")
+
+    # ! Test that the 304 is answered without serializing the object
+    def test_not_modified_skips_serialization(self):
+        etag = self.client.get(self.urls["contract"]).headers["ETag"]
+
+        with patch("contracts.views.ContractRetrieveUpdateDestroyView.get_serializer") as get_serializer:
+            response = self.client.get(self.urls["contract"], HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        get_serializer.assert_not_called()
+
+    # ! Test that the ETag changes when the object changes
+    def test_etag_changes_on_update(self):
+        etags = {name: self.client.get(url).headers["ETag"] for name, url in self.urls.items()}
+
+        self.property.title = "Updated"
+        self.property.save()
+        self.client1.phone = "987654321"
+        self.client1.save()
+        self.contract.price = 2000
+        self.contract.save()
+        self.visit.notes = "Bring keys"
+        self.visit.save()
+
+        for name, url in self.urls.items():
+            with self.subTest(name):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[name])
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response.headers["ETag"], etags[name])
+
+    # ! Test the version counter of models without updated_at
+    def test_version_counter(self):
+        self.assertEqual(self.client1.version, 1)
+        self.client1.save()
+        self.client1.save()
+        self.client1.refresh_from_db()
+        self.assertEqual(self.client1.version, 3)
+
+    # ! Test that saves from stale instances and bulk updates still get distinct versions
+    def test_version_counter_concurrent_saves(self):
+        first = Client.objects.get(pk=self.client1.pk)
+        second = Client.objects.get(pk=self.client1.pk)
+        first.name = "First"
+        first.save()
+        second.name = "Second"
+        second.save(update_fields=["name"])
+
+        self.assertEqual((first.version, second.version), (2, 3))
+        Visit.objects.filter(pk=self.visit.pk).update(status="completed")
+        self.visit.refresh_from_db()
+        self.assertEqual(self.visit.version, 2)
+
+    # ! Test If-Modified-Since on models with updated_at
+    def test_if_modified_since(self):
+        response = self.client.get(self.urls["property"])
+        last_modified = response.headers["Last-Modified"]
+        self.assertEqual(last_modified, http_date(int(self.property.updated_at.timestamp())))
+
+        response = self.client.get(self.urls["property"], HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        earlier = http_date(int(self.property.updated_at.timestamp()) - 60)
+        response = self.client.get(self.urls["property"], HTTP_IF_MODIFIED_SINCE=earlier)
+        self.assertEqual(response.status_code, 200)
+
+        # Models without updated_at only use the ETag
+        self.assertNotIn("Last-Modified", self.client.get(self.urls["client"]).headers)
+
+    # ! Test that permissions are checked before answering 304
+    def test_permissions_checked_before_not_modified(self):
+        etag = self.client.get(self.urls["client"]).headers["ETag"]
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+        response = self.client.get(self.urls["client"], HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 403)
+
+    # ! Test that changes to embedded related rows change the ETag
+    def test_etag_changes_with_related_rows(self):
+        etags = {name: self.client.get(url).headers["ETag"] for name, url in self.urls.items()}
+
+        self.property.title = "Renamed"
+        self.property.save()
+        response = self.client.get(self.urls["contract"], HTTP_IF_NONE_MATCH=etags["contract"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["property_summary"]["title"], "Renamed")
+
+        etag = response.headers["ETag"]
+        self.client1.name = "Renamed client"
+        self.client1.save()
+        response = self.client.get(self.urls["contract"], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        # The client has no modification date, so only the ETag validates the contract
+        self.assertNotIn("Last-Modified", response.headers)
+
+        etag = self.client.get(self.urls["property"]).headers["ETag"]
+        self.agent_user.first_name = "Renamed"
+        self.agent_user.save()
+        response = self.client.get(self.urls["property"], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["owner_first_name"], "Renamed")
+
+    # ! Test that gallery changes outside the property serializer change the property ETag
+    def test_etag_changes_with_images(self):
+        etag = self.client.get(self.urls["property"]).headers["ETag"]
+
+        with patch("properties.signals.schedule_renditions"), self.captureOnCommitCallbacks(execute=True):
+            image = PropertyImage.objects.create(property=self.property, image="property_images/added.jpg")
+        response = self.client.get(self.urls["property"], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["images"]), 1)
+
+        etag = response.headers["ETag"]
+        with patch("properties.signals.delete_files_on_commit"), self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        response = self.client.get(self.urls["property"], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["images"], [])
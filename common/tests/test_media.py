@@ -0,0 +1,39 @@
+import tempfile
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.test import TestCase
+from common.media import delete_files_on_commit, wait_for_file_deletions
+
+
+class MediaCleanupTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = FileSystemStorage(location=self.directory.name)
+        self.names = [self.storage.save(f"file_{i}.txt", ContentFile(b"data")) for i in range(5)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # ! Test that the background worker removes the files after commit
+    def test_files_removed_in_background_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_files_on_commit(self.storage, self.names[:3])
+            self.assertTrue(all(self.storage.exists(name) for name in self.names))
+        wait_for_file_deletions()
+
+        self.assertFalse(any(self.storage.exists(name) for name in self.names[:3]))
+        self.assertTrue(all(self.storage.exists(name) for name in self.names[3:]))
+
+    # ! Test that nothing is removed when the transaction is rolled back
+    def test_files_kept_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    delete_files_on_commit(self.storage, self.names)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertTrue(all(self.storage.exists(name) for name in self.names))
@@ -0,0 +1,64 @@
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import reverse
+from common.serving import parse_range, serve_public_media
+from properties.models import Property, PropertyImage
+from common_tests.base import BaseUserTestCase, make_image_file
+
+
+class ParseRangeTests(SimpleTestCase):
+    # ! Test the parsing of single byte ranges
+    def test_parse_range(self):
+        cases = [
+            (None, None),
+            ("bytes=0-99", (0, 99)),
+            ("bytes=100-", (100, 999)),
+            ("bytes=-100", (900, 999)),
+            ("bytes=900-5000", (900, 999)),
+            ("bytes=-5000", (0, 999)),
+            ("bytes=1000-", False),
+            ("bytes=50-10", False),
+            # Multiple or malformed ranges: the whole file is sent
+            ("bytes=0-1,5-6", None),
+            ("items=0-1", None),
+            ("bytes=-", None),
+        ]
+        for header, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 1000), expected)
+
+
+class ProtectedImageTests(BaseUserTestCase):
+    # ! Test that original images are served to authenticated users only
+    def test_image_file(self):
+        property = Property.objects.create(
+            title="Property", description="d", price=1, address="a", owner=self.agent_user
+        )
+        image = PropertyImage.objects.create(property=property, image=make_image_file("photo.jpg"))
+        url = reverse("property-image-file", args=[image.pk])
+
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+        response = self.client.get(url, HTTP_RANGE="bytes=0-1")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(b"".join(response.streaming_content), b"\xff\xd8")
+
+    # ! Test that the development media server never serves private directories
+    def test_private_media_not_served(self):
+        property = Property.objects.create(
+            title="Property", description="d", price=1, address="a", owner=self.agent_user
+        )
+        image = PropertyImage.objects.create(property=property, image=make_image_file("photo.jpg"))
+        request = RequestFactory().get("/media/")
+
+        response = serve_public_media(request, image.image.name)
+        self.assertEqual(response.status_code, 200)
+
+        for path in ("contracts/deed.pdf", "property_images/../contracts/deed.pdf", "/contracts/deed.pdf"):
+            with self.subTest(path=path):
+                with self.assertRaises(Http404):
+                    serve_public_media(request, path)
@@ -0,0 +1,101 @@
+import os
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from clients.models import Client
+from common.models import StoredFile
+from common.storage import is_sharded, media_storage
+from contracts.models import Contract
+from properties.models import Property, PropertyImage
+from common_tests.base import BaseUserTestCase
+
+
+@override_settings(MEDIA_CLEANUP_IN_BACKGROUND=False)
+class ShardMediaTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.storage = media_storage()
+
+        self.property = Property.objects.create(
+            title="Property", description="d", price=1, address="a", owner=self.agent_user
+        )
+        client = Client.objects.create(name="Client", email="client@test.com", phone="1", agent=self.agent_user)
+        self.contract = Contract.objects.create(
+            property=self.property,
+            client=client,
+            agent=self.agent_user,
+            type="rental",
+            price=1000,
+            start_date=timezone.now().date(),
+            document="",
+        )
+
+    # ! Helper function to write a file in the flat layout used before sharding
+    def legacy_file(self, name, content):
+        path = self.storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(content)
+        return name
+
+    # ! Helper function to run the command and return its output
+    def shard_media(self, **options):
+        out = StringIO()
+        call_command("shard_media", stdout=out, **options)
+        return out.getvalue()
+
+    # ! Test that flat files are moved into sharded directories and their rows rewritten
+    def test_files_moved(self):
+        images = [
+            PropertyImage.objects.create(
+                property=self.property, image=self.legacy_file(f"property_images/legacy_{i}.jpg", b"image %d" % i)
+            )
+            for i in range(3)
+        ]
+        Contract.objects.filter(pk=self.contract.pk).update(
+            document=self.legacy_file("contracts/legacy_deed.pdf", b"deed")
+        )
+        updated_at = Property.objects.get(pk=self.property.pk).updated_at
+
+        output = self.shard_media(batch_size=2)
+
+        self.assertIn("Moved 3 images and 1 contract documents.", output)
+        for i, image in enumerate(images):
+            image.refresh_from_db()
+            self.assertTrue(is_sharded(image.image.name))
+            with image.image.open("rb") as file:
+                self.assertEqual(file.read(), b"image %d" % i)
+            self.assertFalse(self.storage.exists(f"property_images/legacy_{i}.jpg"))
+        self.contract.refresh_from_db()
+        self.assertTrue(is_sharded(self.contract.document.name))
+        self.assertFalse(self.storage.exists("contracts/legacy_deed.pdf"))
+        self.assertEqual(StoredFile.objects.count(), 4)
+        self.assertGreater(Property.objects.get(pk=self.property.pk).updated_at, updated_at)
+
+        # A second run finds nothing left to move
+        self.assertIn("Moved 0 images and 0 contract documents.", self.shard_media())
+
+    # ! Test that a file shared by several rows is kept until every row has moved
+    def test_shared_file(self):
+        name = self.legacy_file("property_images/legacy_shared.jpg", b"shared")
+        first = PropertyImage.objects.create(property=self.property, image=name)
+        second = PropertyImage.objects.create(property=self.property, image=name)
+
+        self.shard_media(batch_size=1)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(StoredFile.objects.get(name=first.image.name).ref_count, 2)
+        self.assertFalse(self.storage.exists(name))
+
+    # ! Test that rows whose file is missing are left untouched
+    def test_missing_file_skipped(self):
+        image = PropertyImage.objects.create(property=self.property, image="property_images/legacy_missing.jpg")
+
+        self.shard_media()
+
+        image.refresh_from_db()
+        self.assertEqual(image.image.name, "property_images/legacy_missing.jpg")
+        self.assertFalse(StoredFile.objects.exists())
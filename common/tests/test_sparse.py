@@ -0,0 +1,152 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from clients.models import Client
+from contracts.models import Contract
+from interactions.models import Favorite
+from properties.models import Property, PropertyImage
+from common_tests.base import BaseUserTestCase, make_image_file
+
+
+class SparseFieldsetsTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+        # * Create properties with images, a client and contracts
+        self.properties = []
+        for i in range(3):
+            property = Property.objects.create(
+                title=f"Property {i}",
+                description="A long description " * 50,
+                price=100000 + i,
+                address=f"Street {i}",
+                owner=self.agent_user,
+            )
+            PropertyImage.objects.create(property=property, image=make_image_file(f"photo_{i}.jpg"))
+            self.properties.append(property)
+
+        self.client1 = Client.objects.create(
+            name="Client1", email="client1@test.com", phone="123456789", agent=self.agent_user
+        )
+        for property in self.properties:
+            Contract.objects.create(
+                property=property,
+                client=self.client1,
+                agent=self.agent_user,
+                type="sale",
+                price=1000,
+                start_date=timezone.now().date(),
+            )
+
+    # ! Helper function to authenticate as a user
+    def login(self, user):
+        jwt_token = self.get_jwt_token(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Test that ?fields= keeps only the requested fields
+    def test_fields_param(self):
+        self.login(self.viewer_user)
+
+        response = self.client.get(reverse("properties-list"), {"fields": "id,title,price"})
+
+        self.assertEqual(response.status_code, 200)
+        for item in response.data["results"]:
+            self.assertEqual(set(item), {"id", "title", "price"})
+
+    # ! Test that ?omit= drops the given fields
+    def test_omit_param(self):
+        self.login(self.viewer_user)
+
+        response = self.client.get(reverse("properties-list"), {"omit": "description_excerpt,cover_image"})
+
+        item = response.data["results"][0]
+        self.assertNotIn("description_excerpt", item)
+        self.assertNotIn("cover_image", item)
+        self.assertIn("title", item)
+
+    # ! Test that unknown fields are rejected
+    def test_unknown_field(self):
+        self.login(self.viewer_user)
+
+        response = self.client.get(reverse("properties-list"), {"fields": "id,password"})
+
+        self.assertEqual(response.status_code, 400)
+
+    # ! Test that lean requests skip the image prefetch, the owner join and unused columns
+    def test_lean_property_list_query(self):
+        self.login(self.viewer_user)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse("properties-list"), {"fields": "id,title,price"})
+
+        # JWT user lookup + properties
+        self.assertEqual(len(context.captured_queries), 2)
+        sql = context.captured_queries[-1]["sql"]
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn("accounts_customuser", sql)
+
+    # ! Test that the full representation still eager-loads its relations
+    def test_full_property_list_unchanged(self):
+        self.login(self.viewer_user)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("properties-list"))
+
+        self.assertIn("cover_image", response.data["results"][0])
+        self.assertIn("description_excerpt", response.data["results"][0])
+
+    # ! Test that contract lists only join the summaries when they are requested
+    def test_contract_summaries(self):
+        self.login(self.agent_user)
+        url = reverse("contract-list-create")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {"fields": "id,price,property"})
+        self.assertEqual(set(response.data[0]), {"id", "price", "property"})
+        self.assertEqual(len(context.captured_queries), 2)
+        self.assertNotIn("properties_property", context.captured_queries[-1]["sql"])
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {"fields": "id,property_summary"})
+        self.assertEqual(response.data[0]["property_summary"]["title"], "Property 0")
+        self.assertEqual(len(context.captured_queries), 2)
+        self.assertNotIn('"description"', context.captured_queries[-1]["sql"])
+
+    # ! Test that detail endpoints keep their validators when restricted
+    def test_detail_with_fields(self):
+        self.login(self.agent_user)
+        url = reverse("client-detail", args=[self.client1.pk])
+
+        # JWT user lookup + client + agent for the permission check
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {"fields": "id,name"})
+
+        self.assertEqual(response.data, {"id": self.client1.pk, "name": "Client1"})
+        self.assertIn("ETag", response.headers)
+
+    # ! Test that writes are not affected by the parameters
+    def test_writes_ignore_fields(self):
+        self.login(self.agent_user)
+
+        response = self.client.patch(
+            reverse("client-detail", args=[self.client1.pk]) + "?fields=id",
+            {"phone": "987654321"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("phone", response.data)
+
+    # ! Test that favorites keep loading the nested properties eagerly
+    def test_favorites_fields(self):
+        self.login(self.viewer_user)
+        for property in self.properties:
+            Favorite.objects.create(user=self.viewer_user, property=property)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("favorite-list"), {"fields": "property"})
+
+        self.assertEqual(set(response.data[0]), {"property"})
+        self.assertIn("images", response.data[0]["property"])
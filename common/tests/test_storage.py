@@ -0,0 +1,87 @@
+import os
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from common.models import StoredFile
+from common.storage import media_storage
+from common_tests.base import use_temporary_media_root
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        use_temporary_media_root(self)
+        self.storage = media_storage()
+
+    # ! Test that files are stored by hash in sharded directories
+    def test_file_stored_by_hash(self):
+        name = self.storage.save("contracts/deed.PDF", ContentFile(b"deed content"))
+
+        stored = StoredFile.objects.get()
+        self.assertEqual(name, f"contracts/{stored.sha256[:2]}/{stored.sha256[2:4]}/{stored.sha256}.pdf")
+        self.assertEqual(stored.ref_count, 1)
+        self.assertEqual(stored.size, 12)
+        with self.storage.open(name) as file:
+            self.assertEqual(file.read(), b"deed content")
+
+    # ! Test that identical uploads share one file and count references
+    def test_identical_files_deduplicated(self):
+        first = self.storage.save("property_images/a.jpg", SimpleUploadedFile("a.jpg", b"same bytes"))
+        second = self.storage.save("property_images/b.jpg", SimpleUploadedFile("b.jpg", b"same bytes"))
+        other = self.storage.save("property_images/c.jpg", SimpleUploadedFile("c.jpg", b"other bytes"))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(StoredFile.objects.get(name=first).ref_count, 2)
+        self.assertEqual(StoredFile.objects.count(), 2)
+
+    # ! Test that a file is only removed with its last reference
+    def test_file_removed_with_last_reference(self):
+        name = self.storage.save("property_images/a.jpg", ContentFile(b"same bytes"))
+        self.storage.save("property_images/b.jpg", ContentFile(b"same bytes"))
+
+        self.storage.delete(name)
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(StoredFile.objects.get(name=name).ref_count, 1)
+
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+
+    # ! Test releasing many references at once
+    def test_delete_many(self):
+        shared = self.storage.save("property_images/a.jpg", ContentFile(b"shared"))
+        self.storage.save("property_images/b.jpg", ContentFile(b"shared"))
+        self.storage.save("property_images/c.jpg", ContentFile(b"shared"))
+        single = self.storage.save("property_images/d.jpg", ContentFile(b"single"))
+
+        self.storage.delete_many([shared, shared, single])
+
+        self.assertTrue(self.storage.exists(shared))
+        self.assertEqual(StoredFile.objects.get(name=shared).ref_count, 1)
+        self.assertFalse(self.storage.exists(single))
+
+    # ! Test that files stored before content addressing are still deleted
+    def test_delete_untracked_file(self):
+        name = "property_images/legacy_test_file.jpg"
+        os.makedirs(os.path.dirname(self.storage.path(name)), exist_ok=True)
+        with open(self.storage.path(name), "wb") as file:
+            file.write(b"legacy")
+
+        self.storage.delete(name)
+
+        self.assertFalse(self.storage.exists(name))
+
+    # ! Test that saving content whose row was just released rewrites the file
+    def test_new_row_rewrites_file(self):
+        name = self.storage.save("property_images/a.jpg", ContentFile(b"photo"))
+        stored = StoredFile.objects.get(name=name)
+        # The row is gone but the unlink has not happened yet, and the copy is stale
+        stored.delete()
+        with open(self.storage.path(name), "wb") as file:
+            file.write(b"stale")
+
+        self.assertEqual(self.storage.save("property_images/b.jpg", ContentFile(b"photo")), name)
+
+        with self.storage.open(name) as file:
+            self.assertEqual(file.read(), b"photo")
+        self.assertEqual(StoredFile.objects.get(name=name).ref_count, 1)
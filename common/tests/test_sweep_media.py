@@ -0,0 +1,114 @@
+import os
+from datetime import timedelta
+from io import StringIO
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.utils import timezone
+from common.models import StoredFile
+from common.storage import media_storage
+from properties.models import Property, PropertyImage
+from properties.renditions import rendition_name
+from common_tests.base import BaseUserTestCase
+
+
+@override_settings(MEDIA_CLEANUP_IN_BACKGROUND=False)
+class SweepMediaTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.storage = media_storage()
+
+        self.property = Property.objects.create(
+            title="Property", description="d", price=1, address="a", owner=self.agent_user
+        )
+
+    # ! Helper function to store a file through the content-addressed storage
+    def stored_file(self, content):
+        return self.storage.save("property_images/photo.jpg", ContentFile(content))
+
+    # ! Helper function to write a file in the flat layout used before sharding
+    def legacy_file(self, name, content, age=timedelta(days=2)):
+        path = self.storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(content)
+        mtime = (timezone.now() - age).timestamp()
+        os.utime(path, (mtime, mtime))
+        return name
+
+    # ! Helper function to age every reference count past the grace period
+    def age_stored_files(self):
+        StoredFile.objects.update(updated_at=timezone.now() - timedelta(days=2))
+
+    # ! Helper function to run the command and return its output
+    def sweep_media(self, **options):
+        out = StringIO()
+        call_command("sweep_media", stdout=out, **options)
+        return out.getvalue()
+
+    # ! Test that a file whose deletion was lost is released
+    def test_leaked_file_released(self):
+        name = self.stored_file(b"leaked")
+        self.age_stored_files()
+
+        output = self.sweep_media()
+
+        self.assertIn("Released 1 stored files", output)
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+        self.assertFalse(self.storage.exists(name))
+
+    # ! Test that an inflated reference count is fixed and the file kept
+    def test_reference_count_fixed(self):
+        name = self.stored_file(b"shared")
+        self.stored_file(b"shared")
+        PropertyImage.objects.create(property=self.property, image=name)
+        self.age_stored_files()
+
+        output = self.sweep_media()
+
+        self.assertIn("Released 0 stored files", output)
+        self.assertEqual(StoredFile.objects.get(name=name).ref_count, 1)
+        self.assertTrue(self.storage.exists(name))
+
+    # ! Test that recently changed references are left alone
+    def test_recent_reference_kept(self):
+        name = self.stored_file(b"uploading")
+
+        self.sweep_media()
+
+        self.assertEqual(StoredFile.objects.get(name=name).ref_count, 1)
+        self.assertTrue(self.storage.exists(name))
+
+    # ! Test that only old, unreferenced files without a StoredFile row are removed
+    def test_untracked_files(self):
+        orphan = self.legacy_file("property_images/legacy_orphan.jpg", b"orphan")
+        used = self.legacy_file("property_images/legacy_used.jpg", b"used")
+        recent = self.legacy_file("property_images/legacy_recent.jpg", b"recent", age=timedelta(0))
+        PropertyImage.objects.create(property=self.property, image=used)
+
+        output = self.sweep_media(grace_hours=1)
+
+        self.assertIn("removed 1 untracked files", output)
+        self.assertFalse(self.storage.exists(orphan))
+        self.assertTrue(self.storage.exists(used))
+        self.assertTrue(self.storage.exists(recent))
+
+    # ! Test that renditions of deleted images are removed and the others kept
+    def test_orphaned_renditions(self):
+        image = PropertyImage.objects.create(property=self.property, image=self.stored_file(b"image"))
+        kept = default_storage.save(rendition_name(image.pk, 320, "webp"), ContentFile(b"kept"))
+        orphan = default_storage.save(rendition_name(image.pk + 1, 320, "webp"), ContentFile(b"orphan"))
+        self.age_stored_files()
+
+        output = self.sweep_media()
+
+        self.assertIn("and 1 orphaned renditions", output)
+        self.assertTrue(default_storage.exists(kept))
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(self.storage.exists(image.image.name))
+
+    # ! Test that a negative grace period is rejected
+    def test_negative_grace_rejected(self):
+        with self.assertRaises(CommandError):
+            self.sweep_media(grace_hours=-1)
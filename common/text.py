@@ -0,0 +1,11 @@
+from django.utils.text import Truncator
+
+# Length of the excerpts stored next to long text columns and returned by list endpoints
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(text):
+    # Collapses whitespace and cuts at a word boundary, ending with an ellipsis
+    if not text:
+        return ""
+    return Truncator(" ".join(text.split())).chars(EXCERPT_LENGTH)
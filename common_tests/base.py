@@ -1,12 +1,39 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import BytesIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
 from rest_framework.test import APIClient
 from accounts.models import CustomUser
+from properties.models import Property
 from rest_framework_simplejwt.tokens import RefreshToken
 
+# ! Helper function to build a real image upload
+def make_image_file(name="image.jpg", size=(64, 48), image_format="JPEG", color=(200, 80, 40)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, image_format)
+    content_type = Image.MIME[image_format]
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=content_type)
+
+
+# ! Helper function to give a test an empty media root, removed after the test
+def use_temporary_media_root(test):
+    media_root = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+    settings_override = override_settings(MEDIA_ROOT=media_root)
+    settings_override.enable()
+    test.addCleanup(settings_override.disable)
+    return media_root
+
+
 class BaseUserTestCase(TestCase):
     def setUp(self):
         super().setUp()
 
+        # * Uploads never touch the real media directory
+        use_temporary_media_root(self)
+
         # * Create viewer user
         self.viewer_user = CustomUser.objects.create_user(
             email="vieweruser@test.com",
@@ -41,3 +68,14 @@ class BaseUserTestCase(TestCase):
     def get_jwt_token(self, user):
         refresh = RefreshToken.for_user(user)
         return str(refresh.access_token)
+
+    # ! Helper function to create a property owned by the agent
+    def create_property(self, title="Property", **fields):
+        fields = {
+            "description": f"{title} description",
+            "price": 100000,
+            "address": "123 Property Street",
+            "owner": self.agent_user,
+            **fields,
+        }
+        return Property.objects.create(title=title, **fields)
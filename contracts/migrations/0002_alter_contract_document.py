@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:05
+
+import common.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contract',
+            name='document',
+            field=models.FileField(storage=common.storage.media_storage, upload_to='contracts/'),
+        ),
+    ]
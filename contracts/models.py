@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from common.storage import media_storage
 
 class Contract(models.Model):
     TYPE_CHOICES = [
@@ -19,7 +20,7 @@ class Contract(models.Model):
     price = models.DecimalField(max_digits=12, decimal_places=2)
     start_date = models.DateField()
     end_date = models.DateField(blank=True, null=True)
-    document = models.FileField(upload_to='contracts/')
+    document = models.FileField(upload_to='contracts/', storage=media_storage)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="draft")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
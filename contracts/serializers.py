@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 from .models import Contract
 from properties.models import Property
 from clients.models import Client
 from django.utils import timezone
+from common.sparse import SparseFieldsetsMixin
 
 class PropertySummarySerializer(serializers.ModelSerializer):
     class Meta:
@@ -14,10 +16,18 @@ class ClientSummarySerializer(serializers.ModelSerializer):
         model = Client
         fields = ['id', 'name', 'email']
 
-class ContractSerializer(serializers.ModelSerializer):
+class ContractDocumentField(serializers.FileField):
+    # Points to the permission-checked download endpoint, never to the media URL
+    def to_representation(self, value):
+        if not value:
+            return None
+        return reverse('contract-document', args=[value.instance.pk], request=self.context.get('request'))
+
+
+class ContractSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     property_summary = PropertySummarySerializer(source='property', read_only=True)
     client_summary = ClientSummarySerializer(source='client', read_only=True)
-    document = serializers.FileField(required=True)
+    document = ContractDocumentField(required=True)
 
     class Meta:
         model = Contract
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from common.media import delete_files_on_commit
+from .models import Contract
+
+
+@receiver(pre_save, sender=Contract)
+def remember_contract_document(sender, instance, raw=False, **kwargs):
+    # Document stored before this save, released by post_save if it was replaced
+    instance._document_before = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._document_before = sender.objects.filter(pk=instance.pk).values_list('document', flat=True).first()
+
+
+@receiver(post_save, sender=Contract)
+def release_replaced_document(sender, instance, **kwargs):
+    before = getattr(instance, '_document_before', None)
+    if before and before != instance.document.name:
+        delete_files_on_commit(instance.document.storage, [before])
+
+
+# Releases the reference to the document once the contract row is gone
+@receiver(post_delete, sender=Contract)
+def delete_contract_document(sender, instance, **kwargs):
+    delete_files_on_commit(instance.document.storage, [instance.document.name])
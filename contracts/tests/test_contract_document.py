@@ -0,0 +1,145 @@
+import os
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from accounts.models import CustomUser
+from clients.models import Client
+from common.models import StoredFile
+from contracts.models import Contract
+from properties.models import Property
+from common_tests.base import BaseUserTestCase
+
+DOCUMENT = b"%PDF-1.4 " + bytes(range(256)) * 40
+
+
+@override_settings(MEDIA_CLEANUP_IN_BACKGROUND=False)
+class ContractDocumentTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # Create Agent2 User
+        self.agent2_user = CustomUser.objects.create_user(
+            email="agent2@test.com",
+            password="agent2password123",
+            first_name="Agent2",
+            last_name="User",
+            role="agent",
+        )
+
+        client = Client.objects.create(name="Client1", email="client1@test.com", phone="1", agent=self.agent_user)
+        property = Property.objects.create(
+            title="Property 1", description="d", price=100000, address="a", owner=self.agent_user
+        )
+        self.contract = Contract.objects.create(
+            property=property,
+            client=client,
+            agent=self.agent_user,
+            type="sale",
+            price=1000,
+            start_date=timezone.now().date(),
+            document=SimpleUploadedFile("signed.pdf", DOCUMENT, content_type="application/pdf"),
+        )
+        self.url = reverse("contract-document", args=[self.contract.pk])
+
+    # ! Helper function to authenticate as a user
+    def login(self, user):
+        jwt_token = self.get_jwt_token(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Test that the agent of the contract downloads the document
+    def test_download_document(self):
+        self.login(self.agent_user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), DOCUMENT)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn(f'attachment; filename="contract-{self.contract.pk}.pdf"', response["Content-Disposition"])
+
+    # ! Test that an interrupted download is resumed with a range request
+    def test_resume_download(self):
+        self.login(self.agent_user)
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=1000-", HTTP_IF_RANGE=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), DOCUMENT[1000:])
+        self.assertEqual(response["Content-Range"], f"bytes 1000-{len(DOCUMENT) - 1}/{len(DOCUMENT)}")
+
+        # A changed file is sent whole
+        response = self.client.get(self.url, HTTP_RANGE="bytes=1000-", HTTP_IF_RANGE='"outdated"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(DOCUMENT)}-")
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+    # ! Test that other agents and viewers cannot download the document
+    def test_download_forbidden(self):
+        self.login(self.agent2_user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.login(self.viewer_user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.login(self.admin_user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    # ! Test that the transfer is handed to the web server when configured
+    def test_sendfile_backends(self):
+        self.login(self.agent_user)
+
+        with override_settings(MEDIA_SENDFILE_BACKEND="x-accel-redirect"):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/" + self.contract.document.name)
+        self.assertEqual(response.content, b"")
+
+        with override_settings(MEDIA_SENDFILE_BACKEND="x-sendfile"):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Sendfile"], self.contract.document.path)
+
+    # ! Test that replacing the document releases the previous file
+    def test_replaced_document_released(self):
+        self.login(self.agent_user)
+        old_name = self.contract.document.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("contract-detail", args=[self.contract.pk]),
+                {"document": SimpleUploadedFile("new.pdf", b"%PDF-1.4 new", content_type="application/pdf")},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.contract.refresh_from_db()
+        self.assertNotEqual(self.contract.document.name, old_name)
+        self.assertFalse(self.contract.document.storage.exists(old_name))
+        self.assertFalse(StoredFile.objects.filter(name=old_name).exists())
+        self.assertTrue(self.contract.document.storage.exists(self.contract.document.name))
+
+    # ! Test that the contract points to the protected download, not the media URL
+    def test_serializer_exposes_protected_url(self):
+        self.login(self.agent_user)
+
+        response = self.client.get(reverse("contract-detail", args=[self.contract.pk]))
+
+        self.assertEqual(response.data["document"], "http://testserver" + self.url)
+
+    # ! Test that legacy names are quoted in X-Accel-Redirect
+    def test_accel_redirect_quotes_name(self):
+        self.login(self.agent_user)
+        name = "contracts/legacy deed ñ.pdf"
+        path = self.contract.document.storage.path(name)
+        with open(path, "wb") as file:
+            file.write(DOCUMENT)
+        self.addCleanup(os.remove, path)
+        Contract.objects.filter(pk=self.contract.pk).update(document=name)
+
+        with override_settings(MEDIA_SENDFILE_BACKEND="x-accel-redirect"):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/contracts/legacy%20deed%20%C3%B1.pdf")
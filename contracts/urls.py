@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import ContractListCreateView, ContractRetrieveUpdateDestroyView
+from .views import ContractListCreateView, ContractRetrieveUpdateDestroyView, ContractDocumentView
 
 urlpatterns = [
     path('', ContractListCreateView.as_view(), name='contract-list-create'),
     path('<int:pk>/', ContractRetrieveUpdateDestroyView.as_view(), name='contract-detail'),
+    path('<int:pk>/document/', ContractDocumentView.as_view(), name='contract-document'),
 ]
\ No newline at end of file
@@ -4,8 +4,13 @@ from .models import Contract
 from .serializers import ContractSerializer
 from .permissions import IsAgentOrAdminContract
 from drf_spectacular.utils import extend_schema
+from common.conditional import ConditionalRetrieveMixin
+from common.sparse import SparseFieldsetsViewMixin
+from common.serving import serve_file
+from django.http import Http404
+import os
 @extend_schema(tags=["Contracts"])
-class ContractListCreateView(generics.ListCreateAPIView):
+class ContractListCreateView(SparseFieldsetsViewMixin, generics.ListCreateAPIView):
     serializer_class = ContractSerializer
     permission_classes = [IsAgentOrAdminContract]
 
@@ -13,17 +18,38 @@ class ContractListCreateView(generics.ListCreateAPIView):
         if getattr(self, 'swagger_fake_view', False):
             return Contract.objects.none()
         user = self.request.user
+        # The summaries of the property and client are joined, not fetched per row
+        contracts = Contract.objects.select_related('property', 'client')
         if user.role == 'admin':
-            return Contract.objects.all()
-        return Contract.objects.filter(agent=user)
+            return contracts
+        return contracts.filter(agent=user)
 
     def perform_create(self, serializer):
         serializer.save(agent=self.request.user)
 
 @extend_schema(tags=["Contracts"])
-class ContractRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class ContractRetrieveUpdateDestroyView(ConditionalRetrieveMixin, SparseFieldsetsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ContractSerializer
     permission_classes = [IsAgentOrAdminContract]
+    # Read by the object permission check
+    sparse_required_fields = ('agent', 'updated_at')
+    # The property and client summaries are part of the representation
+    conditional_related = ('property', 'client')
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Contract.objects.none()
+        user = self.request.user
+        # The summaries of the property and client are joined, not fetched per row
+        contracts = Contract.objects.select_related('property', 'client')
+        if user.role == 'admin':
+            return contracts
+        return contracts.filter(agent=user)
+
+@extend_schema(tags=["Contracts"])
+class ContractDocumentView(generics.GenericAPIView):
+    # Downloads the contract document after the same ownership check as the detail view
+    permission_classes = [IsAgentOrAdminContract]
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -32,3 +58,16 @@ class ContractRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         if user.role == 'admin':
             return Contract.objects.all()
         return Contract.objects.filter(agent=user)
+
+    def get(self, request, pk):
+        contract = self.get_object()
+        if not contract.document:
+            raise Http404
+        extension = os.path.splitext(contract.document.name)[1]
+        try:
+            return serve_file(
+                request, contract.document, filename=f"contract-{contract.pk}{extension}", as_attachment=True
+            )
+        except FileNotFoundError:
+            raise Http404
+
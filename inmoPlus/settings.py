@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'contracts',
     'dashboard',
     'interactions',
+    'common',
 ]
 
 MIDDLEWARE = [
@@ -123,6 +124,75 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # Property images and contract documents are deduplicated by content
+    'media': {
+        'BACKEND': 'common.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Uploads are streamed to temporary files in chunks and moved into MEDIA_ROOT,
+# never buffered in memory
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Protected media downloads: '' streams from Django (with Range support), 'x-accel-redirect'
+# hands the transfer to nginx (internal location serving MEDIA_ROOT at
+# MEDIA_SENDFILE_INTERNAL_URL) and 'x-sendfile' to Apache / mod_xsendfile
+MEDIA_SENDFILE_BACKEND = config('MEDIA_SENDFILE_BACKEND', default='')
+MEDIA_SENDFILE_INTERNAL_URL = config('MEDIA_SENDFILE_INTERNAL_URL', default='/protected-media/')
+# Directories of MEDIA_ROOT only reachable through permission-checked endpoints; the web
+# server must not expose them under MEDIA_URL either
+MEDIA_PRIVATE_DIRECTORIES = ['contracts/']
+
+# Property image uploads
+PROPERTY_IMAGE_MAX_UPLOAD_SIZE = config('PROPERTY_IMAGE_MAX_UPLOAD_SIZE', default=15 * 1024 * 1024, cast=int)
+PROPERTY_IMAGE_MAX_PIXELS = config('PROPERTY_IMAGE_MAX_PIXELS', default=50_000_000, cast=int)
+PROPERTY_IMAGE_ALLOWED_FORMATS = ['JPEG', 'PNG', 'WEBP', 'GIF']
+PROPERTY_IMAGE_VERIFY_WORKERS = config('PROPERTY_IMAGE_VERIFY_WORKERS', default=4, cast=int)
+
+# Deleted media files are unlinked after commit by a background worker in batches
+MEDIA_CLEANUP_IN_BACKGROUND = config('MEDIA_CLEANUP_IN_BACKGROUND', default=True, cast=bool)
+MEDIA_CLEANUP_BATCH_SIZE = config('MEDIA_CLEANUP_BATCH_SIZE', default=100, cast=int)
+
+# Worker threads generating property image thumbnails
+PROPERTY_IMAGE_RENDITION_WORKERS = config('PROPERTY_IMAGE_RENDITION_WORKERS', default=2, cast=int)
+
+# On-the-fly resized images: disk cache evicting the least recently used files above the cap
+PROPERTY_IMAGE_RESIZE_CACHE_DIR = config('PROPERTY_IMAGE_RESIZE_CACHE_DIR', default=str(BASE_DIR / 'var' / 'resized'))
+PROPERTY_IMAGE_RESIZE_CACHE_MAX_BYTES = config(
+    'PROPERTY_IMAGE_RESIZE_CACHE_MAX_BYTES', default=512 * 1024 * 1024, cast=int
+)
+PROPERTY_IMAGE_RESIZE_MAX_DIMENSION = config('PROPERTY_IMAGE_RESIZE_MAX_DIMENSION', default=2560, cast=int)
+# Allowed values of w and h, so the number of renditions per image stays bounded
+PROPERTY_IMAGE_RESIZE_SIZES = [160, 320, 480, 640, 960, 1280, 1920, 2560]
+
+# Lower bounds of the price histogram buckets; run rebuild_property_facets after changing them
+PROPERTY_PRICE_BUCKETS = [0, 50_000, 100_000, 200_000, 300_000, 500_000, 1_000_000]
+
+# Seconds before the in-memory similar-properties matrix is rebuilt from the database,
+# picking up changes made by other processes
+PROPERTY_SIMILAR_INDEX_TTL = config('PROPERTY_SIMILAR_INDEX_TTL', default=300, cast=int)
+PROPERTY_SIMILAR_MAX_LIMIT = 50
+
+# Maximum number of changes returned by one call of the property change feed
+PROPERTY_CHANGES_PAGE_SIZE = config('PROPERTY_CHANGES_PAGE_SIZE', default=500, cast=int)
+
+# Maximum number of ids of one batch retrieve / batch update request
+PROPERTY_BATCH_RETRIEVE_MAX_IDS = config('PROPERTY_BATCH_RETRIEVE_MAX_IDS', default=100, cast=int)
+PROPERTY_BATCH_UPDATE_MAX_IDS = config('PROPERTY_BATCH_UPDATE_MAX_IDS', default=1000, cast=int)
+
+# Bulk property import: rows per transaction and number of row errors reported
+PROPERTY_IMPORT_BATCH_SIZE = config('PROPERTY_IMPORT_BATCH_SIZE', default=500, cast=int)
+PROPERTY_IMPORT_MAX_ERRORS = config('PROPERTY_IMPORT_MAX_ERRORS', default=1000, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -143,6 +213,22 @@ REST_FRAMEWORK = {
 
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='inmoplus'),
+    },
+}
+
+# Response cache of the property list; with several worker processes point the alias
+# to a shared backend (e.g. FileBasedCache) so invalidations reach every process
+PROPERTY_LIST_CACHE_ALIAS = 'default'
+PROPERTY_LIST_CACHE_TIMEOUT = config('PROPERTY_LIST_CACHE_TIMEOUT', default=300, cast=int)
+
+# Cursor pagination of the property catalogue
+PROPERTIES_PAGE_SIZE = config('PROPERTIES_PAGE_SIZE', default=20, cast=int)
+PROPERTIES_MAX_PAGE_SIZE = config('PROPERTIES_MAX_PAGE_SIZE', default=100, cast=int)
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'InmoPlus API',
     'DESCRIPTION': 'Documentation for the InmoPlus API',
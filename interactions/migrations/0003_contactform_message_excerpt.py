@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:31
+
+from django.db import migrations, models
+from common.text import make_excerpt
+
+
+def backfill_excerpts(apps, schema_editor):
+    ContactForm = apps.get_model('interactions', 'ContactForm')
+    rows = []
+    for row in ContactForm.objects.only('pk', 'message').iterator(chunk_size=1000):
+        row.message_excerpt = make_excerpt(row.message)
+        rows.append(row)
+        if len(rows) == 1000:
+            ContactForm.objects.bulk_update(rows, ['message_excerpt'])
+            rows = []
+    ContactForm.objects.bulk_update(rows, ['message_excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interactions', '0002_contactform'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactform',
+            name='message_excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from properties.models import Property
+from common.text import EXCERPT_LENGTH, make_excerpt
 
 class Favorite(models.Model):
     user = models.ForeignKey(
@@ -26,8 +27,14 @@ class ContactForm(models.Model):
     email = models.EmailField()
     phone = models.CharField(max_length=50, blank=True, null=True)
     message = models.TextField()
+    # Precomputed so list queries can defer the full message
+    message_excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, default="", editable=False)
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='contact_forms')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        self.message_excerpt = make_excerpt(self.message)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Contact from {self.name} about {self.property.title}"
\ No newline at end of file
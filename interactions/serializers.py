@@ -2,15 +2,16 @@ from rest_framework import serializers
 from .models import Favorite, ContactForm
 from properties.models import Property
 from properties.serializers import PropertySerializer
+from common.sparse import SparseFieldsetsMixin
 
-class FavoriteSerializer(serializers.ModelSerializer):
+class FavoriteSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     property = PropertySerializer(read_only=True)
 
     class Meta:
         model = Favorite
         fields = ['id', 'property', 'created_at']
 
-class ContactFormSerializer(serializers.ModelSerializer):
+class ContactFormSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     property_id = serializers.IntegerField(write_only=True)
 
     class Meta:
@@ -27,3 +28,9 @@ class ContactFormSerializer(serializers.ModelSerializer):
         property_id = validated_data.pop('property_id')
         property_instance = Property.objects.get(id=property_id)
         return ContactForm.objects.create(property=property_instance, **validated_data)
+
+
+class ContactFormListSerializer(ContactFormSerializer):
+    # Lists return the stored excerpt instead of the full message
+    class Meta(ContactFormSerializer.Meta):
+        fields = ['id', 'name', 'email', 'phone', 'message_excerpt', 'created_at']
@@ -1,3 +1,5 @@
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from rest_framework import status
 from django.urls import reverse
 from accounts.models import CustomUser
@@ -106,4 +108,19 @@ class ContactFormListDetailTests(BaseUserTestCase):
 
         url = reverse("contact-form-detail", args=[9999])  # Non-existent ID
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    # ! Test that the list returns an excerpt of the message without loading it
+    def test_contact_forms_list_returns_message_excerpt(self):
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("contact-form-list"))
+
+        self.assertNotIn("message", response.data[0])
+        self.assertEqual(response.data[0]["message_excerpt"], "Interested in this property.")
+        self.assertNotIn('."message"', context.captured_queries[-1]["sql"])
+
+        response = self.client.get(reverse("contact-form-detail", args=[self.contact_form.id]))
+        self.assertEqual(response.data["message"], "Interested in this property.")
@@ -3,18 +3,26 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from .models import Favorite, ContactForm
-from .serializers import FavoriteSerializer, ContactFormSerializer
+from .serializers import FavoriteSerializer, ContactFormListSerializer, ContactFormSerializer
 from properties.models import Property
 from drf_spectacular.utils import extend_schema
 from .permissions import IsViewer, IsAdminOrAgent
+from common.sparse import SparseFieldsetsViewMixin, sparse_queryset, wants_sparse_fields
 
 @extend_schema(tags=["Favorites"])
 class FavoriteViewSet(viewsets.ViewSet):
     permission_classes = [IsViewer]
 
     def list(self, request):
-        favorites = Favorite.objects.filter(user=request.user)
-        serializer = FavoriteSerializer(favorites, many=True)
+        favorites = (
+            Favorite.objects.filter(user=request.user)
+            .select_related('property__owner')
+            .prefetch_related('property__images')
+        )
+        context = {'request': request}
+        if wants_sparse_fields(request):
+            favorites = sparse_queryset(favorites, FavoriteSerializer(context=context))
+        serializer = FavoriteSerializer(favorites, many=True, context=context)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
@@ -39,20 +47,21 @@ class ContactFormCreateView(generics.CreateAPIView):
     permission_classes = [IsViewer]
 
 @extend_schema(tags=["Contact Forms"])
-class ContactFormListView(generics.ListAPIView):
-    serializer_class = ContactFormSerializer
+class ContactFormListView(SparseFieldsetsViewMixin, generics.ListAPIView):
+    serializer_class = ContactFormListSerializer
     permission_classes = [IsAdminOrAgent]
 
     def get_queryset(self):
+        # The message is only read by the detail endpoint
         user = self.request.user
         if user.role == 'admin':
-            return ContactForm.objects.all()
+            return ContactForm.objects.defer('message')
         elif user.role == 'agent':
-            return ContactForm.objects.filter(property__owner=user)
+            return ContactForm.objects.filter(property__owner=user).defer('message')
         return ContactForm.objects.none()
 
 @extend_schema(tags=["Contact Forms"])
-class ContactFormDetailView(generics.RetrieveAPIView):
+class ContactFormDetailView(SparseFieldsetsViewMixin, generics.RetrieveAPIView):
     serializer_class = ContactFormSerializer
     permission_classes = [IsAuthenticated]
 
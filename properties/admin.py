@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Property, PropertyImage
+from .search import search_queryset
 
 @admin.register(Property)
 class PropertyAdmin(admin.ModelAdmin):
@@ -7,6 +8,12 @@ class PropertyAdmin(admin.ModelAdmin):
     list_filter = ("status", "created_at")
     search_fields = ("title", "address")
 
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index instead of LIKE scans
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        return search_queryset(queryset, search_term, rank=False), False
+
 @admin.register(PropertyImage)
 class PropertyImageAdmin(admin.ModelAdmin):
     list_display = ("property", "uploaded_at")
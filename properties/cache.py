@@ -0,0 +1,72 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Cached property list pages. Every key embeds a generation number that is bumped on
+# any Property / PropertyImage change, so stale pages are never read again and simply expire.
+GENERATION_KEY = 'properties:list:generation'
+HITS_KEY = 'properties:list:hits'
+MISSES_KEY = 'properties:list:misses'
+
+
+def get_cache():
+    return caches[settings.PROPERTY_LIST_CACHE_ALIAS]
+
+
+def _incr(key):
+    cache = get_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Missing key: start the counter
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key)
+
+
+def get_generation():
+    generation = get_cache().get(GENERATION_KEY)
+    if generation is None:
+        get_cache().add(GENERATION_KEY, 0, timeout=None)
+        generation = get_cache().get(GENERATION_KEY, 0)
+    return generation
+
+
+def invalidate():
+    # Bumped now for this connection's own reads, and again on commit so no page
+    # cached from pre-commit data by another request survives
+    _incr(GENERATION_KEY)
+    transaction.on_commit(lambda: _incr(GENERATION_KEY))
+
+
+def cache_key(request):
+    # Filters and cursor (query string), host (absolute links) and role
+    params = sorted(request.query_params.lists())
+    role = getattr(request.user, 'role', 'anonymous')
+    source = f'{request.get_host()}|{request.path}|{role}|{params}'
+    digest = hashlib.sha1(source.encode()).hexdigest()
+    return f'properties:list:{get_generation()}:{digest}'
+
+
+def get_page(key):
+    data = get_cache().get(key)
+    _incr(MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+def set_page(key, data):
+    get_cache().set(key, data, settings.PROPERTY_LIST_CACHE_TIMEOUT)
+
+
+def get_stats():
+    cache = get_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else None,
+        'generation': get_generation(),
+    }
@@ -0,0 +1,64 @@
+import threading
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import cache as list_cache
+from .models import Property, PropertyChange
+
+_local = threading.local()
+
+
+def record_changes(property_ids, deleted=False):
+    # Moves the properties to the end of the change feed
+    property_ids = sorted(set(property_ids))
+    if not property_ids:
+        return
+    with transaction.atomic():
+        PropertyChange.objects.filter(property_id__in=property_ids).delete()
+        PropertyChange.objects.bulk_create(
+            [PropertyChange(property_id=property_id, deleted=deleted) for property_id in property_ids]
+        )
+
+
+def record_changes_on_commit(property_ids):
+    # Changes of rows embedded in the property payload (images). Collects the ids touched
+    # inside the current atomic block and records them once when it commits, so deleting
+    # 30 images writes the feed and bumps updated_at (the ETag) once and not 30 times
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        touch_properties(property_ids)
+        return
+    block = connection.atomic_blocks[-1]
+    pending = getattr(_local, 'pending', None)
+    if pending is None or pending[0] is not block:
+        pending = _local.pending = (block, set())
+        transaction.on_commit(partial(flush_pending, pending))
+    pending[1].update(property_ids)
+
+
+def flush_pending(pending):
+    if getattr(_local, 'pending', None) is pending:
+        _local.pending = None
+    touch_properties(pending[1])
+
+
+def touch_properties(property_ids):
+    property_ids = set(property_ids)
+    Property.objects.filter(pk__in=property_ids).update(updated_at=timezone.now())
+    record_changes(property_ids)
+    list_cache.invalidate()
+
+
+def get_changes(since, limit):
+    # One range scan over the primary key; rows past the limit are left for the next call
+    changes = list(
+        PropertyChange.objects.filter(pk__gt=since).order_by('pk').values_list('pk', 'property_id', 'deleted')[:limit + 1]
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    token = changes[-1][0] if changes else since
+    changed = [property_id for _, property_id, deleted in changes if not deleted]
+    deleted = [property_id for _, property_id, deleted in changes if deleted]
+    return token, has_more, changed, deleted
@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.db.models import Avg, Count, Max, Min, Q
+from django.db.models.functions import Substr
+from rest_framework.exceptions import ValidationError
+
+from . import cache as list_cache
+from .geo import GEOHASH_PRECISION, count_geohash_cells, geohash_cells, prefix_q, split_antimeridian
+from .models import Property
+
+MAX_ZOOM = 20
+# Cluster cells are geohash cells; results are computed and cached per tile, the
+# geohash cell one level coarser, so a tile holds 32 cells and a cell never spans tiles
+MAX_TILES = 128
+
+
+def cluster_precision(zoom):
+    # Between 4 and 8 cells across a 256px map tile at the given zoom level
+    return min(max((2 * (zoom + 3)) // 5, 1), GEOHASH_PRECISION)
+
+
+def tile_key(generation, precision, tile):
+    return f'properties:clusters:{generation}:{precision}:{tile}'
+
+
+def compute_clusters(tiles, precision):
+    # One GROUP BY over the geohash prefix for all the tiles missing from the cache
+    query = Q()
+    for tile in tiles:
+        query |= prefix_q(tile)
+    rows = (
+        Property.objects.filter(query, geohash__gt='')
+        .annotate(cell=Substr('geohash', 1, precision))
+        .values('cell')
+        .annotate(
+            count=Count('id'),
+            center_lat=Avg('latitude'),
+            center_lng=Avg('longitude'),
+            min_price=Min('price'),
+            max_price=Max('price'),
+        )
+        .order_by('cell')
+    )
+
+    clusters = {tile: [] for tile in tiles}
+    for row in rows:
+        clusters[row['cell'][:precision - 1]].append({
+            'geohash': row['cell'],
+            'count': row['count'],
+            'latitude': round(row['center_lat'], 6),
+            'longitude': round(row['center_lng'], 6),
+            'min_price': row['min_price'],
+            'max_price': row['max_price'],
+        })
+    return clusters
+
+
+def get_clusters(min_lat, min_lng, max_lat, max_lng, zoom):
+    # Clusters of every tile touching the box. Tiles are cached under the list cache
+    # generation, so any property change invalidates them as well.
+    precision = cluster_precision(zoom)
+    boxes = split_antimeridian(min_lat, min_lng, max_lat, max_lng)
+    if sum(count_geohash_cells(*box, precision - 1) for box in boxes) > MAX_TILES:
+        raise ValidationError({'zoom': "Zoom level too high for the size of the bounding box."})
+    tiles = sorted({tile for box in boxes for tile in geohash_cells(*box, precision - 1)})
+
+    cache = list_cache.get_cache()
+    generation = list_cache.get_generation()
+    keys = {tile: tile_key(generation, precision, tile) for tile in tiles}
+    cached = cache.get_many(list(keys.values()))
+    missing = [tile for tile in tiles if keys[tile] not in cached]
+    if missing:
+        computed = compute_clusters(missing, precision)
+        cache.set_many(
+            {keys[tile]: computed[tile] for tile in missing}, settings.PROPERTY_LIST_CACHE_TIMEOUT
+        )
+        cached.update({keys[tile]: computed[tile] for tile in missing})
+
+    clusters = [cluster for tile in tiles for cluster in cached[keys[tile]]]
+    return {'zoom': zoom, 'precision': precision, 'tiles': len(tiles), 'clusters': clusters}
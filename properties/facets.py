@@ -0,0 +1,96 @@
+from bisect import bisect_right
+from collections import Counter
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import Property, PropertyFacetCount
+
+STATUS_FACET = 'status'
+PRICE_FACET = 'price'
+
+
+def price_bucket(price):
+    # Lower bound of the bucket holding the price
+    bounds = settings.PROPERTY_PRICE_BUCKETS
+    return bounds[max(bisect_right(bounds, Decimal(price)) - 1, 0)]
+
+
+def facet_keys(status, price):
+    return [(STATUS_FACET, status), (PRICE_FACET, str(price_bucket(price)))]
+
+
+def apply_deltas(deltas):
+    # deltas: Counter of (facet, value) -> change in count
+    for (facet, value), delta in deltas.items():
+        if not delta:
+            continue
+        updated = PropertyFacetCount.objects.filter(facet=facet, value=value).update(count=F('count') + delta)
+        if not updated:
+            PropertyFacetCount.objects.get_or_create(facet=facet, value=value)
+            PropertyFacetCount.objects.filter(facet=facet, value=value).update(count=F('count') + delta)
+
+
+def deltas_for(rows, sign=1):
+    # rows: iterable of (status, price)
+    deltas = Counter()
+    for status, price in rows:
+        for key in facet_keys(status, price):
+            deltas[key] += sign
+    return deltas
+
+
+def price_ranges():
+    bounds = settings.PROPERTY_PRICE_BUCKETS
+    return [(low, bounds[i + 1] if i + 1 < len(bounds) else None) for i, low in enumerate(bounds)]
+
+
+def format_facets(status_counts, price_counts):
+    return {
+        'total': sum(status_counts.values()),
+        'status': {value: status_counts.get(value, 0) for value, _ in Property.STATUS_CHOICES},
+        'price': [
+            {'min': low, 'max': high, 'count': price_counts.get(str(low), 0)}
+            for low, high in price_ranges()
+        ],
+    }
+
+
+def count_facets(queryset):
+    # Status and price bucket counts of the queryset in a single aggregate query
+    aggregates = {
+        f'status:{value}': Count('pk', filter=Q(status=value)) for value, _ in Property.STATUS_CHOICES
+    }
+    for low, high in price_ranges():
+        condition = Q(price__gte=low) if high is None else Q(price__gte=low, price__lt=high)
+        aggregates[f'price:{low}'] = Count('pk', filter=condition)
+    counts = queryset.order_by().aggregate(**aggregates)
+
+    status_counts, price_counts = {}, {}
+    for key, count in counts.items():
+        facet, value = key.split(':', 1)
+        (status_counts if facet == STATUS_FACET else price_counts)[value] = count
+    return status_counts, price_counts
+
+
+def get_facets(queryset=None):
+    # Unfiltered facets come from the summary table, filtered ones are aggregated
+    if queryset is not None:
+        return format_facets(*count_facets(queryset))
+    status_counts, price_counts = {}, {}
+    for facet, value, count in PropertyFacetCount.objects.values_list('facet', 'value', 'count'):
+        (status_counts if facet == STATUS_FACET else price_counts)[value] = count
+    return format_facets(status_counts, price_counts)
+
+
+def rebuild_facets(property_model=Property, facet_model=PropertyFacetCount):
+    # Recomputes the summary table from scratch (also used by the data migration)
+    status_counts, price_counts = count_facets(property_model.objects.all())
+    rows = [facet_model(facet=STATUS_FACET, value=value, count=count) for value, count in status_counts.items()]
+    rows += [facet_model(facet=PRICE_FACET, value=value, count=count) for value, count in price_counts.items()]
+    with transaction.atomic():
+        facet_model.objects.all().delete()
+        facet_model.objects.bulk_create(rows)
+    return sum(status_counts.values())
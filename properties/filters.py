@@ -0,0 +1,69 @@
+import django_filters
+from rest_framework.exceptions import ValidationError
+from .geo import bbox_q, distance_km_expression, radius_bbox
+from .models import Property
+from .search import search_queryset
+
+MAX_RADIUS_KM = 1000
+
+
+def parse_floats(value, count, name):
+    try:
+        numbers = [float(part) for part in value.split(',')]
+    except ValueError:
+        raise ValidationError({name: "Expected comma separated numbers."})
+    if len(numbers) != count:
+        raise ValidationError({name: f"Expected {count} comma separated numbers."})
+    return numbers
+
+
+def validate_point(latitude, longitude, name):
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise ValidationError({name: "Coordinates out of range."})
+
+
+class PropertyFilter(django_filters.FilterSet):
+    # ?q=free text, ranked by relevance
+    q = django_filters.CharFilter(method='filter_search')
+    # ?bbox=min_lat,min_lng,max_lat,max_lng
+    bbox = django_filters.CharFilter(method='filter_bbox')
+    # ?near=lat,lng&radius_km=5
+    near = django_filters.CharFilter(method='filter_near')
+    radius_km = django_filters.NumberFilter(method='filter_radius_km')
+
+    class Meta:
+        model = Property
+        fields = ['status']
+
+    def filter_search(self, queryset, name, value):
+        return search_queryset(queryset, value)
+
+    def filter_bbox(self, queryset, name, value):
+        min_lat, min_lng, max_lat, max_lng = parse_floats(value, 4, name)
+        validate_point(min_lat, min_lng, name)
+        validate_point(max_lat, max_lng, name)
+        if min_lat > max_lat:
+            raise ValidationError({name: "min_lat must not be greater than max_lat."})
+        return queryset.filter(bbox_q(min_lat, min_lng, max_lat, max_lng))
+
+    def filter_near(self, queryset, name, value):
+        latitude, longitude = parse_floats(value, 2, name)
+        validate_point(latitude, longitude, name)
+
+        radius_km = self.form.cleaned_data.get('radius_km')
+        if radius_km is None:
+            raise ValidationError({'radius_km': "This parameter is required together with near."})
+        if not 0 < radius_km <= MAX_RADIUS_KM:
+            raise ValidationError({'radius_km': f"Must be greater than 0 and at most {MAX_RADIUS_KM}."})
+        radius_km = float(radius_km)
+
+        # The geohash cover narrows the candidates, the distance check is exact
+        return (
+            queryset.filter(bbox_q(*radius_bbox(latitude, longitude, radius_km)))
+            .annotate(distance_km=distance_km_expression(latitude, longitude))
+            .filter(distance_km__lte=radius_km)
+        )
+
+    def filter_radius_km(self, queryset, name, value):
+        # Consumed by filter_near
+        return queryset
@@ -0,0 +1,164 @@
+import math
+
+from django.db.models import ExpressionWrapper, F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+# Geohash base32 alphabet; '{' sorts right after 'z' and closes prefix ranges
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PREFIX_END = "{"
+GEOHASH_PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+# Maximum number of geohash cells used to cover a search area
+MAX_COVER_CELLS = 32
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(geohash) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits = bits << 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+def _cell_size(precision):
+    # Returns the (lat, lng) size in degrees of a geohash cell of the given precision
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def _cells_for_box(min_lat, min_lng, max_lat, max_lng, precision):
+    lat_size, lng_size = _cell_size(precision)
+    lat_start = math.floor((min_lat + 90.0) / lat_size)
+    lat_end = math.floor((min(max_lat, 90.0 - 1e-12) + 90.0) / lat_size)
+    lng_start = math.floor((min_lng + 180.0) / lng_size)
+    lng_end = math.floor((min(max_lng, 180.0 - 1e-12) + 180.0) / lng_size)
+    return lat_start, lat_end, lng_start, lng_end
+
+
+def count_geohash_cells(min_lat, min_lng, max_lat, max_lng, precision):
+    if precision == 0:
+        return 1
+    lat_start, lat_end, lng_start, lng_end = _cells_for_box(min_lat, min_lng, max_lat, max_lng, precision)
+    return (lat_end - lat_start + 1) * (lng_end - lng_start + 1)
+
+
+def geohash_cells(min_lat, min_lng, max_lat, max_lng, precision):
+    # Returns the prefixes of every geohash cell of the given precision touching the box
+    if precision == 0:
+        return [""]
+    lat_start, lat_end, lng_start, lng_end = _cells_for_box(min_lat, min_lng, max_lat, max_lng, precision)
+    lat_size, lng_size = _cell_size(precision)
+    prefixes = []
+    for i in range(lat_start, lat_end + 1):
+        for j in range(lng_start, lng_end + 1):
+            # Encode the center of each cell to obtain its prefix
+            latitude = -90.0 + (i + 0.5) * lat_size
+            longitude = -180.0 + (j + 0.5) * lng_size
+            prefixes.append(encode_geohash(latitude, longitude, precision))
+    return sorted(set(prefixes))
+
+
+def geohash_cover(min_lat, min_lng, max_lat, max_lng, max_cells=MAX_COVER_CELLS):
+    # Returns the geohash prefixes whose cells cover the box, using the finest
+    # precision that stays within max_cells
+    chosen = None
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        if count_geohash_cells(min_lat, min_lng, max_lat, max_lng, precision) > max_cells:
+            break
+        chosen = precision
+
+    if chosen is None:
+        # The box is larger than the coarsest cover allows: every cell matches
+        return [""]
+    return geohash_cells(min_lat, min_lng, max_lat, max_lng, chosen)
+
+
+def prefix_q(prefix):
+    # Index range scan over the rows whose geohash starts with the prefix
+    if prefix:
+        return Q(geohash__gte=prefix, geohash__lt=prefix + PREFIX_END)
+    return Q(latitude__isnull=False)
+
+
+def split_antimeridian(min_lat, min_lng, max_lat, max_lng):
+    # A box with min_lng > max_lng crosses the antimeridian and is split in two
+    if min_lng <= max_lng:
+        return [(min_lat, min_lng, max_lat, max_lng)]
+    return [(min_lat, min_lng, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lng)]
+
+
+def bbox_q(min_lat, min_lng, max_lat, max_lng):
+    # Index range scans over geohash prefixes, then an exact coordinate check
+    query = Q()
+    for box in split_antimeridian(min_lat, min_lng, max_lat, max_lng):
+        cells = Q()
+        for prefix in geohash_cover(*box):
+            cells |= prefix_q(prefix)
+        query |= cells & Q(
+            latitude__range=(box[0], box[2]),
+            longitude__range=(box[1], box[3]),
+        )
+    return query
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    # Bounding box that contains the circle around the point
+    lat_delta = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat < 1e-6 or latitude + lat_delta >= 90.0 or latitude - lat_delta <= -90.0:
+        return max(latitude - lat_delta, -90.0), -180.0, min(latitude + lat_delta, 90.0), 180.0
+
+    lng_delta = radius_km / (KM_PER_DEGREE * cos_lat)
+    if lng_delta >= 180.0:
+        min_lng, max_lng = -180.0, 180.0
+    else:
+        min_lng = longitude - lng_delta
+        max_lng = longitude + lng_delta
+        if min_lng < -180.0:
+            min_lng += 360.0
+        if max_lng > 180.0:
+            max_lng -= 360.0
+    return latitude - lat_delta, min_lng, latitude + lat_delta, max_lng
+
+
+def distance_km_expression(latitude, longitude):
+    # Haversine distance in kilometres from the point to each row
+    delta_lat = Radians(F("latitude") - Value(latitude))
+    delta_lng = Radians(F("longitude") - Value(longitude))
+    a = Power(Sin(delta_lat / 2), 2) + Value(math.cos(math.radians(latitude))) * Cos(
+        Radians(F("latitude"))
+    ) * Power(Sin(delta_lng / 2), 2)
+    return ExpressionWrapper(
+        Value(2 * EARTH_RADIUS_KM) * ASin(Least(Sqrt(a), Value(1.0))), output_field=FloatField()
+    )
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from . import cache as list_cache
+from .changes import record_changes
+from .facets import apply_deltas, deltas_for
+from .models import Property
+from .search import index_properties
+from .similar import schedule_refresh
+from .serializers import PropertySerializer
+
+FORMATS = ('csv', 'ndjson')
+# Columns read from every row; anything else is ignored
+IMPORT_FIELDS = ('title', 'description', 'price', 'status', 'address', 'latitude', 'longitude')
+
+
+def detect_format(name, content_type=''):
+    name = (name or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type:
+        return 'ndjson'
+    if name.endswith('.csv') or 'csv' in content_type:
+        return 'csv'
+    return None
+
+
+def iter_csv(text):
+    reader = csv.DictReader(text)
+    for row in reader:
+        # Empty cells are treated as missing so nullable columns can be left blank
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in ('', None)}, None
+
+
+def iter_ndjson(text):
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None, {'non_field_errors': ["Invalid JSON."]}
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, {'non_field_errors': ["Expected a JSON object."]}
+            continue
+        yield line_number, row, None
+
+
+def iter_rows(stream, file_format):
+    # Yields (line, row, error) one row at a time from a binary stream
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='' if file_format == 'csv' else None)
+    try:
+        yield from (iter_csv(text) if file_format == 'csv' else iter_ndjson(text))
+    except UnicodeDecodeError:
+        yield None, None, {'non_field_errors': ["The file is not valid UTF-8."]}
+    finally:
+        # Leave the underlying file open for its owner
+        text.detach()
+
+
+def import_properties(stream, file_format, owner, batch_size=None):
+    # Validates rows with the PropertySerializer rules and inserts the valid ones with
+    # bulk_create, one transaction per batch. Only the current batch is held in memory.
+    batch_size = batch_size or settings.PROPERTY_IMPORT_BATCH_SIZE
+    max_errors = settings.PROPERTY_IMPORT_MAX_ERRORS
+    report = {'created': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+    validator = PropertySerializer()
+    batch = []
+
+    def add_error(line, errors):
+        report['failed'] += 1
+        if len(report['errors']) < max_errors:
+            report['errors'].append({'line': line, 'errors': errors})
+        else:
+            report['errors_truncated'] = True
+
+    for line, row, error in iter_rows(stream, file_format):
+        if error is None:
+            try:
+                validated = validator.run_validation({key: row[key] for key in IMPORT_FIELDS if key in row})
+            except serializers.ValidationError as exc:
+                error = exc.detail
+        if error is not None:
+            add_error(line, error)
+            continue
+
+        property = Property(owner=owner, **validated)
+        # bulk_create bypasses save()
+        property.update_geohash()
+        property.update_excerpt()
+        batch.append(property)
+        if len(batch) >= batch_size:
+            report['created'] += insert_batch(batch)
+            batch = []
+
+    if batch:
+        report['created'] += insert_batch(batch)
+    if report['created']:
+        list_cache.invalidate()
+    return report
+
+
+def insert_batch(properties):
+    # post_save does not fire for bulk inserts: index and count the rows explicitly
+    with transaction.atomic():
+        created = Property.objects.bulk_create(properties)
+        index_properties(created)
+        apply_deltas(deltas_for((property.status, property.price) for property in created))
+        schedule_refresh(property.pk for property in created)
+        record_changes(property.pk for property in created)
+    return len(created)
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from PIL import Image, UnidentifiedImageError
+from rest_framework import serializers
+from .metadata import extract_metadata
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PROPERTY_IMAGE_VERIFY_WORKERS,
+            thread_name_prefix='image-verify',
+        )
+    return _executor
+
+
+def verify_image(upload):
+    # Returns an error message, or None if the upload is a safe image.
+    # Only the header is decoded before the pixel limit is checked. Pillow's own
+    # DecompressionBombWarning is not escalated: warning filters are process-wide and
+    # not thread-safe, and the explicit limit below covers it.
+    try:
+        upload.seek(0)
+        with Image.open(upload) as image:
+            if image.format not in settings.PROPERTY_IMAGE_ALLOWED_FORMATS:
+                return f"{upload.name}: unsupported image format."
+            width, height = image.size
+            if width * height > settings.PROPERTY_IMAGE_MAX_PIXELS:
+                return f"{upload.name}: image dimensions are too large."
+            image.verify()
+    except Image.DecompressionBombError:
+        return f"{upload.name}: image dimensions are too large."
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+        return f"{upload.name}: file is not a valid image."
+    finally:
+        upload.seek(0)
+    return None
+
+
+def ingest_image(upload):
+    # Returns (error, metadata); the metadata is only extracted from valid images
+    error = verify_image(upload)
+    if error:
+        return error, None
+    try:
+        return None, extract_metadata(upload, upload.size)
+    except (OSError, SyntaxError, ValueError):
+        return f"{upload.name}: file is not a valid image.", None
+
+
+def verify_images(uploads):
+    # Cheap checks first, then the Pillow checks and the metadata extraction run in
+    # parallel in the worker pool. Returns the metadata of each upload.
+    errors = []
+    for upload in uploads:
+        if not upload.content_type or not upload.content_type.startswith('image/'):
+            errors.append(f"{upload.name}: only image files are allowed.")
+        elif upload.size > settings.PROPERTY_IMAGE_MAX_UPLOAD_SIZE:
+            errors.append(f"{upload.name}: file is too large.")
+    results = []
+    if not errors and uploads:
+        results = list(get_executor().map(ingest_image, uploads))
+        errors = [error for error, _ in results if error]
+    if errors:
+        raise serializers.ValidationError({'images': errors})
+    return [metadata for _, metadata in results]
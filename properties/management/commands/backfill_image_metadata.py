@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from properties.metadata import backfill_images
+from properties.models import PropertyImage
+
+
+class Command(BaseCommand):
+    help = "Extract dimensions, size, perceptual hash and placeholder of property images in parallel"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Also process images that already have metadata")
+        parser.add_argument('--workers', type=int, default=settings.PROPERTY_IMAGE_VERIFY_WORKERS)
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        images = PropertyImage.objects.order_by('pk')
+        if not options['all']:
+            images = images.filter(width__isnull=True)
+        ids = list(images.values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            updated = sum(executor.map(backfill_images, batches))
+
+        self.stdout.write(self.style.SUCCESS(f"Extracted metadata of {updated} of {len(ids)} images."))
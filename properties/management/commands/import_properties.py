@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from properties.imports import FORMATS, detect_format, import_properties
+
+
+class Command(BaseCommand):
+    help = "Import properties in bulk from a CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--owner', required=True, help="Email of the user owning the imported properties")
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension")
+        parser.add_argument('--batch-size', type=int)
+
+    def handle(self, *args, **options):
+        try:
+            owner = get_user_model().objects.get(email=options['owner'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['owner']} does not exist.")
+
+        file_format = options['format'] or detect_format(options['path'])
+        if file_format is None:
+            raise CommandError("Cannot detect the file format, use --format.")
+
+        with open(options['path'], 'rb') as stream:
+            report = import_properties(stream, file_format, owner, batch_size=options['batch_size'])
+
+        for error in report['errors']:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        if report['errors_truncated']:
+            self.stderr.write("Further errors were not reported.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} properties, {report['failed']} rows failed."
+        ))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from properties.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = "Recompute the property facet summary table (status counts and price buckets)"
+
+    def handle(self, *args, **options):
+        count = rebuild_facets()
+        self.stdout.write(self.style.SUCCESS(f"Counted {count} properties."))
@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from properties.models import PropertyImage
+from properties.renditions import render_images
+
+
+class Command(BaseCommand):
+    help = "Generate the thumbnail renditions of property images in parallel"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Regenerate images that already have renditions")
+        parser.add_argument('--workers', type=int, default=settings.PROPERTY_IMAGE_RENDITION_WORKERS)
+        parser.add_argument('--batch-size', type=int, default=50)
+
+    def handle(self, *args, **options):
+        images = PropertyImage.objects.order_by('pk')
+        if not options['all']:
+            images = images.filter(has_renditions=False)
+        ids = list(images.values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            rendered = sum(executor.map(render_images, batches))
+
+        self.stdout.write(self.style.SUCCESS(f"Generated renditions for {rendered} of {len(ids)} images."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from properties.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of properties in bulk"
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write(self.style.WARNING("Full-text search index requires SQLite FTS5, nothing to do."))
+            return
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} properties."))
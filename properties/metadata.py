@@ -0,0 +1,132 @@
+import base64
+import logging
+from io import BytesIO
+
+from django.db import close_old_connections
+from django.utils import timezone
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Difference hash: 8x8 comparisons of a 9x8 grayscale thumbnail, as 16 hex digits
+HASH_SIZE = 8
+# Longest side of the blurred placeholder embedded in API responses
+PLACEHOLDER_SIZE = 16
+# Longest side of the copy the hash and the placeholder are computed from
+SAMPLE_SIZE = PLACEHOLDER_SIZE * 4
+METADATA_FIELDS = ['width', 'height', 'file_size', 'phash', 'placeholder']
+# EXIF orientation -> transposition displaying the image upright
+ORIENTATION_TAG = 0x0112
+ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def difference_hash(image):
+    pixels = list(image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS).getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        for column in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + column]
+            right = pixels[row * (HASH_SIZE + 1) + column + 1]
+            value = (value << 1) | (left > right)
+    return f'{value:0{HASH_SIZE * HASH_SIZE // 4}x}'
+
+
+def placeholder(image):
+    thumbnail = image.convert('RGB')
+    thumbnail.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.LANCZOS)
+    buffer = BytesIO()
+    thumbnail.save(buffer, 'WEBP', quality=40)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def reduce(image, factor):
+    if image.mode in ('LA', 'RGBA'):
+        # Pillow premultiplies alpha into a full-size copy first: reduce the colour bands
+        # one at a time instead, the alpha is dropped by the RGB conversion anyway
+        bands = image.getbands()[:-1]
+        return Image.merge(image.mode[:-1], [image.getchannel(band).reduce(factor) for band in bands])
+    if image.mode not in ('1', 'P', 'PA'):
+        try:
+            return image.reduce(factor)
+        except ValueError:
+            pass
+    # Palette indices cannot be averaged, and 16-bit modes have no box reduction
+    size = (max(image.width // factor, 1), max(image.height // factor, 1))
+    return image.resize(size, Image.Resampling.NEAREST)
+
+
+def sample(image):
+    # An RGB copy of at most SAMPLE_SIZE on its longest side. JPEGs are decoded at a
+    # reduced scale. Other formats (PNG, WebP, GIF) can only be decoded at full size:
+    # that frame (width x height x bands bytes, at most ~200 MB at the pixel limit) is
+    # reduced by an integer factor right away, before any conversion or transposition,
+    # and released by the caller. Besides it, at most one full-size band is allocated;
+    # every later step works on the small copy.
+    image.draft('RGB', (SAMPLE_SIZE, SAMPLE_SIZE))
+    image.load()
+    factor = max(image.size) // (SAMPLE_SIZE * 2)
+    reduced = reduce(image, factor) if factor > 1 else image
+    copy = reduced.convert('RGB')
+    copy.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE), Image.Resampling.LANCZOS)
+    return copy
+
+
+def extract_metadata(file, file_size):
+    # Dimensions as displayed (EXIF orientation applied), byte size, perceptual hash and
+    # a tiny placeholder, both computed from a bounded sample of the image
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = image.size
+        orientation = image.getexif().get(ORIENTATION_TAG)
+        if orientation in ROTATED_ORIENTATIONS:
+            width, height = height, width
+        oriented = sample(image)
+    if orientation in ORIENTATION_TRANSPOSE:
+        oriented = oriented.transpose(ORIENTATION_TRANSPOSE[orientation])
+    file.seek(0)
+    return {
+        'width': width,
+        'height': height,
+        'file_size': file_size,
+        'phash': difference_hash(oriented),
+        'placeholder': placeholder(oriented),
+    }
+
+
+def backfill_images(image_ids):
+    # Worker entry point: extracts the metadata of stored images and returns how many succeeded
+    from . import cache as list_cache
+    from .changes import record_changes
+    from .models import Property, PropertyImage
+
+    updated = []
+    try:
+        for image in PropertyImage.objects.filter(pk__in=image_ids):
+            try:
+                with image.image.open('rb') as file:
+                    metadata = extract_metadata(file, image.image.size)
+            except Exception:
+                logger.exception("Could not extract the metadata of property image %s", image.pk)
+                continue
+            for field, value in metadata.items():
+                setattr(image, field, value)
+            updated.append(image)
+        if updated:
+            PropertyImage.objects.bulk_update(updated, METADATA_FIELDS)
+            # The listing payloads changed: refresh their validators
+            property_ids = {image.property_id for image in updated}
+            Property.objects.filter(pk__in=property_ids).update(updated_at=timezone.now())
+            record_changes(property_ids)
+            list_cache.invalidate()
+    finally:
+        close_old_connections()
+    return len(updated)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0006_property_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='propertyimage',
+            name='has_renditions',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:05
+
+import common.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0007_propertyimage_has_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='propertyimage',
+            name='image',
+            field=models.ImageField(storage=common.storage.media_storage, upload_to='property_images/', verbose_name='Imagen'),
+        ),
+    ]
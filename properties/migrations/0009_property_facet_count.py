@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:16
+
+from django.db import migrations, models
+
+from properties.facets import rebuild_facets
+
+
+def backfill_facets(apps, schema_editor):
+    rebuild_facets(apps.get_model('properties', 'Property'), apps.get_model('properties', 'PropertyFacetCount'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0008_alter_propertyimage_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=20)),
+                ('value', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('facet', 'value'), name='property_facet_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_facets, migrations.RunPython.noop),
+    ]
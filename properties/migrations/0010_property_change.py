@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+def backfill_changes(apps, schema_editor):
+    # Existing properties start in the feed so a first sync from token 0 returns everything
+    Property = apps.get_model('properties', 'Property')
+    PropertyChange = apps.get_model('properties', 'PropertyChange')
+    ids = Property.objects.order_by('pk').values_list('pk', flat=True)
+    PropertyChange.objects.bulk_create((PropertyChange(property_id=pk) for pk in ids.iterator()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0009_property_facet_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('property_id', models.BigIntegerField(unique=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_changes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0011_propertyimage_metadata'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='propertyimage',
+            options={'ordering': ['position', 'id']},
+        ),
+        migrations.AddField(
+            model_name='propertyimage',
+            name='position',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Posición'),
+        ),
+        migrations.AddIndex(
+            model_name='propertyimage',
+            index=models.Index(fields=['property', 'position', 'id'], name='property_image_position_idx'),
+        ),
+    ]
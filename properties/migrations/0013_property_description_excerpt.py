@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:31
+
+from django.db import migrations, models
+from common.text import make_excerpt
+
+
+def backfill_excerpts(apps, schema_editor):
+    Property = apps.get_model('properties', 'Property')
+    rows = []
+    for row in Property.objects.only('pk', 'description').iterator(chunk_size=1000):
+        row.description_excerpt = make_excerpt(row.description)
+        rows.append(row)
+        if len(rows) == 1000:
+            Property.objects.bulk_update(rows, ['description_excerpt'])
+            rows = []
+    Property.objects.bulk_update(rows, ['description_excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0012_propertyimage_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='description_excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
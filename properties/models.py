@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.db import models
-import os
+from common.storage import media_storage
+from common.text import EXCERPT_LENGTH, make_excerpt
+from .geo import encode_geohash
 class Property(models.Model):
 
     #Choices for property status
@@ -13,6 +15,8 @@ class Property(models.Model):
 
     title = models.CharField(max_length=255, verbose_name="Título")
     description = models.TextField(verbose_name="Descripción")
+    # Precomputed so list queries can defer the full description
+    description_excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, default="", editable=False)
     price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Precio")
     status = models.CharField(
         max_length=20, choices=STATUS_CHOICES, default="available", verbose_name="Estado"
@@ -20,6 +24,8 @@ class Property(models.Model):
     address = models.CharField(max_length=255, verbose_name="Dirección")
     latitude = models.FloatField(null=True, blank=True, verbose_name="Latitud")
     longitude = models.FloatField(null=True, blank=True, verbose_name="Longitud")
+    # Precomputed spatial key for the bbox / radius filters
+    geohash = models.CharField(max_length=12, blank=True, default="", editable=False, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Última actualización")
     
@@ -31,10 +37,25 @@ class Property(models.Model):
         verbose_name="Propietario"
     )
 
-    def delete(self, *args, **kwargs):
-        for image in self.images.all():
-            image.delete()
-        super().delete(*args, **kwargs)
+    class Meta:
+        indexes = [
+            # Backs the (created_at, id) keyset used by the list pagination
+            models.Index(fields=['created_at', 'id'], name='property_created_id_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.update_geohash()
+        self.update_excerpt()
+        super().save(*args, **kwargs)
+
+    def update_excerpt(self):
+        self.description_excerpt = make_excerpt(self.description)
+
+    def update_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ""
+        else:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
 
     def __str__(self):
         return self.title
@@ -48,18 +69,57 @@ class PropertyImage(models.Model):
     )
     image = models.ImageField(
         upload_to="property_images/",
+        storage=media_storage,
         verbose_name="Imagen"
     )
     uploaded_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Fecha de subida"
     )
+    # Gallery order; the first image is the cover shown in listings
+    position = models.PositiveIntegerField(default=0, editable=False, verbose_name="Posición")
+    # Set by the rendition workers once every thumbnail has been written
+    has_renditions = models.BooleanField(default=False, editable=False)
+    # Extracted at upload time so clients can lay out galleries before loading the files
+    width = models.PositiveIntegerField(null=True, editable=False)
+    height = models.PositiveIntegerField(null=True, editable=False)
+    file_size = models.PositiveBigIntegerField(null=True, editable=False)
+    phash = models.CharField(max_length=16, blank=True, default="", editable=False)
+    placeholder = models.TextField(blank=True, default="", editable=False)
+
+    class Meta:
+        ordering = ['position', 'id']
+        indexes = [
+            # Backs the per-property window query that picks the covers of a page
+            models.Index(fields=['property', 'position', 'id'], name='property_image_position_idx'),
+        ]
 
     def __str__(self):
         return f"Imagen de {self.property.title}"
 
-    def delete(self, *args, **kwargs):
-        if self.image and self.image.path and os.path.isfile(self.image.path):
-            os.remove(self.image.path)
-        super().delete(*args, **kwargs)
 
+class PropertyFacetCount(models.Model):
+    # Status and price bucket counts of the whole catalogue, maintained incrementally
+    # on every write so the unfiltered facets are read without scanning Property
+    facet = models.CharField(max_length=20)
+    value = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'], name='property_facet_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.facet}={self.value}: {self.count}"
+
+
+class PropertyChange(models.Model):
+    # Change feed: one row per property, re-inserted on every change so its id (the sync
+    # token) always grows. Deleted properties stay as tombstones.
+    property_id = models.BigIntegerField(unique=True)
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.property_id} ({'deleted' if self.deleted else 'changed'})"
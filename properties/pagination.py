@@ -0,0 +1,136 @@
+import json
+import math
+from base64 import b64decode, b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PropertyCursorPagination(CursorPagination):
+    # Keyset pagination over (created_at, id): the cursor holds both values of the last
+    # row, so every page is an indexed range scan, even across rows sharing created_at
+    # (bulk imports, equal ranks). No OFFSET over previous pages and no COUNT(*).
+    ordering = ('-created_at', '-id')
+    page_size = settings.PROPERTIES_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.PROPERTIES_MAX_PAGE_SIZE
+
+    # Orderings selectable with ?sort=, each keyed on an annotation added by the filters
+    sort_query_param = 'sort'
+    sort_orderings = {
+        'distance': ('distance_km', 'id'),
+        'relevance': ('search_rank', 'id'),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        # Text searches are sorted by relevance unless another sort is requested
+        sort = request.query_params.get(self.sort_query_param)
+        if sort is None and 'search_rank' in queryset.query.annotations:
+            sort = 'relevance'
+        ordering = self.sort_orderings.get(sort)
+        if ordering and ordering[0] in queryset.query.annotations:
+            return ordering
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        position, reverse = self.decode_keyset(request)
+
+        # Previous pages are read backwards from the cursor and flipped afterwards
+        ordering = [self.flip(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after_q(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        # A cursor always designates an existing row on its other side
+        self.has_next = position is not None if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_keyset(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_keyset(self.page[0], reverse=True)
+
+    def get_html_context(self):
+        return {'previous_url': self.get_previous_link(), 'next_url': self.get_next_link()}
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def after_q(ordering, position):
+        # Rows strictly after the position: (a > x) OR (a = x AND id > y), per direction
+        (first, tie), (value, pk) = ordering, position
+        first_op = 'lt' if first.startswith('-') else 'gt'
+        tie_op = 'lt' if tie.startswith('-') else 'gt'
+        first = first.lstrip('-')
+        return Q(**{f'{first}__{first_op}': value}) | Q(
+            **{first: value, f'{tie.lstrip("-")}__{tie_op}': pk}
+        )
+
+    def encode_keyset(self, instance, reverse):
+        first, tie = (field.lstrip('-') for field in self.ordering)
+        value = getattr(instance, first)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = {'o': first, 'p': [value, getattr(instance, tie)], 'r': int(reverse)}
+        encoded = b64encode(json.dumps(payload).encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_keyset(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            payload = json.loads(b64decode(encoded.encode('ascii'), validate=True))
+            value, pk = payload['p']
+            reverse = payload['r']
+            # A cursor only applies to the ordering it was issued for
+            if payload['o'] != self.ordering[0].lstrip('-'):
+                raise ValueError
+            # Edited cursors must not reach the ORM: bools are ints to Python
+            if type(pk) is not int or type(reverse) is not int or reverse not in (0, 1):
+                raise ValueError
+            value = self.parse_keyset_value(payload['o'], value)
+        except (TypeError, ValueError, KeyError, OverflowError):
+            raise NotFound(self.invalid_cursor_message)
+        return (value, pk), bool(reverse)
+
+    @staticmethod
+    def parse_keyset_value(field, value):
+        if field == 'created_at':
+            parsed = parse_datetime(value) if isinstance(value, str) else None
+            if parsed is None or timezone.is_naive(parsed):
+                raise ValueError
+            return parsed
+        # distance_km and search_rank
+        if type(value) not in (int, float) or not math.isfinite(value):
+            raise ValueError
+        return float(value)
@@ -20,3 +20,9 @@ class IsAgentOrAdmin(BasePermission):
     def has_permission(self, request, view):
         user = request.user
         return user.is_authenticated and getattr(user, 'role', None) in ['agent', 'admin']
+
+
+class IsAdmin(BasePermission):
+    def has_permission(self, request, view):
+        user = request.user
+        return user.is_authenticated and getattr(user, 'role', None) == 'admin'
@@ -0,0 +1,129 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+from . import cache as list_cache
+from .changes import record_changes
+
+logger = logging.getLogger(__name__)
+
+# Longest side in pixels of each rendition
+RENDITION_SIZES = {
+    'small': 320,
+    'medium': 800,
+    'large': 1600,
+}
+# Extension -> (Pillow format, save options)
+RENDITION_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+RENDITIONS_DIR = 'property_images/renditions'
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PROPERTY_IMAGE_RENDITION_WORKERS,
+            thread_name_prefix='renditions',
+        )
+    return _executor
+
+
+def rendition_name(image_id, size, extension):
+    return posixpath.join(RENDITIONS_DIR, str(image_id), f'{size}.{extension}')
+
+
+def rendition_names(image_id):
+    return [
+        rendition_name(image_id, size, extension)
+        for size in RENDITION_SIZES
+        for extension in RENDITION_FORMATS
+    ]
+
+
+def rendition_urls(image, request=None):
+    # {size: {extension: url}} or None while the renditions are not generated yet
+    if not image.has_renditions:
+        return None
+    urls = {}
+    for size in RENDITION_SIZES:
+        urls[size] = {}
+        for extension in RENDITION_FORMATS:
+            url = default_storage.url(rendition_name(image.pk, size, extension))
+            urls[size][extension] = request.build_absolute_uri(url) if request else url
+    return urls
+
+
+def prepare_source(source):
+    # Applies the EXIF orientation and normalizes the mode before resizing
+    source = ImageOps.exif_transpose(source)
+    if source.mode not in ('RGB', 'RGBA'):
+        source = source.convert('RGBA' if 'transparency' in source.info else 'RGB')
+    return source
+
+
+def render(source, size, image_format, options):
+    # Fits the image inside size = (width, height), never upscaling
+    image = source.copy()
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def generate_renditions(image):
+    # Writes every size/format of the image and marks it as rendered
+    with image.image.open('rb') as file:
+        with Image.open(file) as source:
+            source = prepare_source(source)
+            for size, max_size in RENDITION_SIZES.items():
+                for extension, (image_format, options) in RENDITION_FORMATS.items():
+                    name = rendition_name(image.pk, size, extension)
+                    content = render(source, (max_size, max_size), image_format, options)
+                    if default_storage.exists(name):
+                        default_storage.delete(name)
+                    default_storage.save(name, ContentFile(content))
+
+    type(image).objects.filter(pk=image.pk).update(has_renditions=True)
+    image.has_renditions = True
+    # The listing payload changed: refresh its validators
+    type(image.property).objects.filter(pk=image.property_id).update(updated_at=timezone.now())
+    record_changes([image.property_id])
+    list_cache.invalidate()
+
+
+def render_images(image_ids):
+    # Worker entry point: renders the given images and returns how many succeeded
+    from .models import PropertyImage
+
+    rendered = 0
+    try:
+        for image in PropertyImage.objects.filter(pk__in=image_ids):
+            try:
+                generate_renditions(image)
+                rendered += 1
+            except Exception:
+                logger.exception("Could not generate renditions for property image %s", image.pk)
+    finally:
+        close_old_connections()
+    return rendered
+
+
+def schedule_renditions(image_ids):
+    # Renditions are generated by the worker pool once the upload is committed
+    image_ids = list(image_ids)
+    if image_ids:
+        transaction.on_commit(lambda: get_executor().submit(render_images, image_ids))
@@ -0,0 +1,134 @@
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import Future
+
+from django.conf import settings
+from PIL import Image
+
+from .renditions import RENDITION_FORMATS, prepare_source, render
+
+# fmt parameter -> (Pillow format, save options, content type)
+RESIZE_FORMATS = {
+    'webp': (*RENDITION_FORMATS['webp'], 'image/webp'),
+    'jpg': (*RENDITION_FORMATS['jpg'], 'image/jpeg'),
+    'png': ('PNG', {'optimize': True}, 'image/png'),
+}
+# Fraction of the cap kept after an eviction, so evictions do not run on every write
+EVICTION_TARGET = 0.9
+
+_lock = threading.Lock()
+# Cache path -> Future of the resize in progress, shared by concurrent requests
+_in_flight = {}
+# Cache directory -> estimated size in bytes, measured on first use
+_cache_bytes = {}
+
+
+def cache_path(image, width, height, fmt):
+    # Stored files never change under a name (content-addressed), so the name is a stable key
+    key = hashlib.sha1(f'{image.image.name}|{width}|{height}|{fmt}'.encode()).hexdigest()
+    return os.path.join(settings.PROPERTY_IMAGE_RESIZE_CACHE_DIR, key[:2], f'{key}.{fmt}')
+
+
+def get_resized(image, width, height, fmt):
+    # Returns the path of the resized file, resizing it on the first request only
+    path = cache_path(image, width, height, fmt)
+    try:
+        # Touch the file: the modification time is the LRU order
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+
+    with _lock:
+        future = _in_flight.get(path)
+        owner = future is None
+        if owner:
+            future = _in_flight[path] = Future()
+    if not owner:
+        return future.result()
+
+    try:
+        size = write_resized(image, width, height, fmt, path)
+        future.set_result(path)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    finally:
+        with _lock:
+            del _in_flight[path]
+    account(size)
+    return path
+
+
+def open_resized(image, width, height, fmt):
+    # Opened here and not by the caller: an eviction in another thread or process may
+    # remove the file right after the resize. Once open, it stays readable until closed.
+    for _ in range(2):
+        path = get_resized(image, width, height, fmt)
+        try:
+            return open(path, 'rb')
+        except FileNotFoundError:
+            # Evicted meanwhile: resized again on the next attempt
+            continue
+    raise FileNotFoundError(path)
+
+
+def write_resized(image, width, height, fmt, path):
+    image_format, options, _ = RESIZE_FORMATS[fmt]
+    box = (width or settings.PROPERTY_IMAGE_RESIZE_MAX_DIMENSION, height or settings.PROPERTY_IMAGE_RESIZE_MAX_DIMENSION)
+    with image.image.open('rb') as file:
+        with Image.open(file) as source:
+            # JPEGs are decoded directly at a reduced scale when possible
+            source.draft('RGB', box)
+            content = render(prepare_source(source), box, image_format, options)
+
+    # Written to a temporary file and renamed, so readers never see partial files
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(descriptor, 'wb') as file:
+        file.write(content)
+    os.replace(temporary, path)
+    return len(content)
+
+
+def scan_cache():
+    # (modification time, size, path) of every cached file
+    entries = []
+    for directory, _, names in os.walk(settings.PROPERTY_IMAGE_RESIZE_CACHE_DIR):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+
+def account(size):
+    directory = settings.PROPERTY_IMAGE_RESIZE_CACHE_DIR
+    with _lock:
+        if directory not in _cache_bytes:
+            _cache_bytes[directory] = sum(entry[1] for entry in scan_cache())
+        else:
+            _cache_bytes[directory] += size
+        if _cache_bytes[directory] > settings.PROPERTY_IMAGE_RESIZE_CACHE_MAX_BYTES:
+            _cache_bytes[directory] = evict()
+
+
+def evict():
+    # Removes the least recently used files down to the target and returns the new total
+    entries = sorted(scan_cache())
+    total = sum(entry[1] for entry in entries)
+    target = settings.PROPERTY_IMAGE_RESIZE_CACHE_MAX_BYTES * EVICTION_TARGET
+    for _, size, path in entries:
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+    return total
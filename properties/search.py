@@ -0,0 +1,87 @@
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+from . import cache as list_cache
+
+# SQLite FTS5 index over the searchable text of Property, keyed by the property id
+FTS_TABLE = 'properties_property_fts'
+FTS_COLUMNS = ('title', 'description', 'address')
+# bm25 column weights: title, description, address
+FTS_RANK = 'bm25(10.0, 1.0, 4.0)'
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text):
+    # Every term is quoted (no FTS5 operators from user input) and matched as a prefix
+    tokens = TOKEN_RE.findall(text)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_queryset(queryset, text, rank=True):
+    match = build_match_query(text)
+    if not match:
+        return queryset
+
+    if not fts_available():
+        query = Q()
+        for token in TOKEN_RE.findall(text):
+            query &= Q(title__icontains=token) | Q(description__icontains=token) | Q(address__icontains=token)
+        return queryset.filter(query)
+
+    # The index is joined once: MATCH drives the scan and each row carries its rank,
+    # so neither the filter nor the ordering re-runs the full-text query per row
+    table = queryset.model._meta.db_table
+    queryset = queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = "{table}"."id"', f'{FTS_TABLE} MATCH %s'],
+        params=[match],
+    )
+    if rank:
+        # Lower bm25 ranks are better matches
+        queryset = queryset.annotate(search_rank=RawSQL(f'{FTS_TABLE}.rank', (), output_field=FloatField()))
+    return queryset
+
+
+def index_properties(properties):
+    if not fts_available() or not properties:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(p.pk,) for p in properties]
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, address) VALUES (%s, %s, %s, %s)',
+            [(p.pk, p.title, p.description, p.address) for p in properties],
+        )
+
+
+def unindex_properties(ids):
+    if not fts_available() or not ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in ids])
+
+
+def rebuild_index():
+    # Repopulates the whole index with set-based statements and returns the number of rows
+    if not fts_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, address) '
+            f'SELECT id, title, description, address FROM properties_property'
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        count = cursor.fetchone()[0]
+    # Search results may have changed
+    list_cache.invalidate()
+    return count
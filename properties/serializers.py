@@ -1,30 +1,56 @@
+from django.conf import settings
 from rest_framework import serializers
+from django.db.models import Max
 from .models import Property, PropertyImage
+from .renditions import rendition_urls, schedule_renditions
+from .ingest import verify_images
+from common.sparse import SparseFieldsetsMixin
 from django.core.exceptions import PermissionDenied, ValidationError
-import os
+from django.db import transaction
 
 
 class PropertyImageSerializer(serializers.ModelSerializer):
+    renditions = serializers.SerializerMethodField()
+
     class Meta:
         model = PropertyImage
-        fields = ['id', 'property', 'image']
+        fields = [
+            'id', 'property', 'image', 'renditions', 'position',
+            'width', 'height', 'file_size', 'phash', 'placeholder'
+        ]
+
+    def get_renditions(self, obj):
+        return rendition_urls(obj, self.context.get('request'))
 
 
-class PropertySerializer(serializers.ModelSerializer):
+class CoverImageSerializer(PropertyImageSerializer):
+    # Reads the cover from the one-image list prefetched into cover_images
+    def get_attribute(self, instance):
+        images = super().get_attribute(instance)
+        return images[0] if images else None
+
+
+class PropertySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     images = PropertyImageSerializer(many=True, required=False)
     delete_images = serializers.ListField(
         child=serializers.IntegerField(), write_only=True, required=False
     )
+    # Image ids in their new gallery order; the first one becomes the cover
+    image_order = serializers.ListField(
+        child=serializers.IntegerField(), write_only=True, required=False
+    )
     # Read only fields
     owner_first_name = serializers.CharField(source='owner.first_name', read_only=True)
     owner_last_name = serializers.CharField(source='owner.last_name', read_only=True)
+    # Only present when the list is filtered with ?near=
+    distance_km = serializers.FloatField(read_only=True)
 
     class Meta:
         model = Property
         fields = [
             'id', 'title', 'description', 'price', 'status', 'address',
             'latitude', 'longitude', 'created_at', 'updated_at', 'images', 'delete_images',
-            'owner_first_name', 'owner_last_name'
+            'image_order', 'owner_first_name', 'owner_last_name', 'distance_km'
         ]
 
     # Create method to handle the creation of Property and its images
@@ -32,14 +58,12 @@ class PropertySerializer(serializers.ModelSerializer):
         images_data = self.context['request'].FILES.getlist('images')
 
         # Validate all images before creating the property
-        for image_data in images_data:
-            if not image_data.content_type.startswith('image/'):
-                raise serializers.ValidationError("Only image files are allowed.")
+        metadata = verify_images(images_data)
 
         # Create the property only if all images are valid
+        validated_data.pop('image_order', None)
         property_instance = Property.objects.create(**validated_data)
-        for image_data in images_data:
-            PropertyImage.objects.create(property=property_instance, image=image_data)
+        self.add_images(property_instance, images_data, metadata)
         return property_instance
 
     # Update method to handle the update of Property and its images
@@ -48,29 +72,92 @@ class PropertySerializer(serializers.ModelSerializer):
         images_data = self.context['request'].FILES.getlist('images')
 
         # Validate all new images before updating the property
-        for image_data in images_data:
-            if not image_data.content_type.startswith('image/'):
-                raise serializers.ValidationError("Only image files are allowed.")
-
-        # Delete images if specified
-        delete_images = validated_data.pop('delete_images', [])
-        for image_id in delete_images:
-            try:
-                image_instance = PropertyImage.objects.get(id=image_id, property=instance)
-                # Delete the image file from the filesystem
-                if image_instance.image and os.path.isfile(image_instance.image.path):
-                    os.remove(image_instance.image.path)
-                # Delete the image instance from the database
-                image_instance.delete()
-            except PropertyImage.DoesNotExist:
-                raise PermissionDenied("No tienes permiso para eliminar esta imagen.")
-
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
-        # Add new images
-        for image_data in images_data:
-            PropertyImage.objects.create(property=instance, image=image_data)
-
-        return instance
\ No newline at end of file
+        metadata = verify_images(images_data)
+
+        # Every image to delete must belong to this property, checked before any change
+        delete_images = set(validated_data.pop('delete_images', []))
+        images = PropertyImage.objects.filter(property=instance, id__in=delete_images)
+        if delete_images and len(images.values_list('id', flat=True)) != len(delete_images):
+            raise PermissionDenied("No tienes permiso para eliminar esta imagen.")
+
+        image_order = validated_data.pop('image_order', None)
+
+        with transaction.atomic():
+            # One DELETE for the batch; the files are unlinked after commit (post_delete)
+            if delete_images:
+                images.delete()
+
+            if image_order is not None:
+                self.reorder_images(instance, image_order)
+
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+
+            # Add new images
+            self.add_images(instance, images_data, metadata)
+
+        return instance
+
+    # Listed images move to the front in the given order, the rest keep their relative order
+    def reorder_images(self, property_instance, image_order):
+        images = {image.pk: image for image in PropertyImage.objects.filter(property=property_instance)}
+        if len(set(image_order)) != len(image_order) or not set(image_order) <= images.keys():
+            raise serializers.ValidationError({'image_order': "Unknown or repeated image ids."})
+
+        rest = sorted(images.keys() - set(image_order), key=lambda pk: (images[pk].position, pk))
+        changed = []
+        for position, pk in enumerate(image_order + rest):
+            if images[pk].position != position:
+                images[pk].position = position
+                changed.append(images[pk])
+        PropertyImage.objects.bulk_update(changed, ['position'])
+
+    # Insert all the image rows at once; the files are moved into storage as they are inserted
+    def add_images(self, property_instance, images_data, metadata):
+        if not images_data:
+            return
+        # New images are appended to the gallery
+        last = PropertyImage.objects.filter(property=property_instance).aggregate(last=Max('position'))['last']
+        start = 0 if last is None else last + 1
+        images = PropertyImage.objects.bulk_create([
+            PropertyImage(property=property_instance, image=image_data, position=start + i, **image_metadata)
+            for i, (image_data, image_metadata) in enumerate(zip(images_data, metadata))
+        ])
+        schedule_renditions(image.pk for image in images)
+
+
+class PropertyListSerializer(PropertySerializer):
+    # Listing cards show one photo and a short text: the cover replaces the gallery and
+    # the stored excerpt replaces the description
+    cover_image = CoverImageSerializer(source='cover_images', read_only=True)
+
+    class Meta(PropertySerializer.Meta):
+        fields = [
+            name for name in PropertySerializer.Meta.fields if name not in ('images', 'description')
+        ] + ['description_excerpt', 'cover_image']
+
+
+class PropertyIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), min_length=1)
+
+    def get_max_ids(self):
+        return settings.PROPERTY_BATCH_RETRIEVE_MAX_IDS
+
+    def validate_ids(self, value):
+        if len(value) > self.get_max_ids():
+            raise serializers.ValidationError(f"At most {self.get_max_ids()} ids are allowed.")
+        return value
+
+
+class PropertyBatchUpdateSerializer(PropertyIdsSerializer):
+    status = serializers.ChoiceField(choices=Property.STATUS_CHOICES, required=False)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+
+    def get_max_ids(self):
+        return settings.PROPERTY_BATCH_UPDATE_MAX_IDS
+
+    def validate(self, attrs):
+        if 'status' not in attrs and 'price' not in attrs:
+            raise serializers.ValidationError("Provide a status and/or a price to update.")
+        return attrs
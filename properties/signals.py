@@ -0,0 +1,130 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from common.media import delete_files_on_commit
+from .models import Property, PropertyImage
+from . import cache as list_cache
+from .facets import apply_deltas, deltas_for
+from .changes import record_changes, record_changes_on_commit
+from .renditions import rendition_names, schedule_renditions
+from .search import FTS_COLUMNS, index_properties, unindex_properties
+from . import similar
+
+
+@receiver(post_save, sender=Property)
+def index_property(sender, instance, update_fields=None, **kwargs):
+    # Skip saves that do not touch the indexed text
+    if update_fields is not None and not set(update_fields) & set(FTS_COLUMNS):
+        return
+    index_properties([instance])
+
+
+@receiver(post_delete, sender=Property)
+def unindex_property(sender, instance, **kwargs):
+    unindex_properties([instance.pk])
+
+
+FACET_FIELDS = {'status', 'price'}
+
+
+@receiver(pre_save, sender=Property)
+def remember_property_facets(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Facet values stored before this save, so post_save only moves the changed counts
+    instance._facets_before = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & FACET_FIELDS:
+        return
+    instance._facets_before = sender.objects.filter(pk=instance.pk).values_list('status', 'price').first()
+
+
+@receiver(post_save, sender=Property)
+def update_property_facets(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & FACET_FIELDS:
+        return
+    deltas = deltas_for([(instance.status, instance.price)])
+    before = getattr(instance, '_facets_before', None)
+    if before is not None:
+        deltas.subtract(deltas_for([before]))
+    apply_deltas(deltas)
+
+
+@receiver(post_delete, sender=Property)
+def remove_property_facets(sender, instance, **kwargs):
+    apply_deltas(deltas_for([(instance.status, instance.price)], sign=-1))
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def refresh_similarity_index(sender, instance, **kwargs):
+    similar.schedule_refresh([instance.pk])
+
+
+@receiver(post_save, sender=Property)
+def record_property_change(sender, instance, **kwargs):
+    record_changes([instance.pk])
+
+
+@receiver(post_delete, sender=Property)
+def record_property_deletion(sender, instance, **kwargs):
+    record_changes([instance.pk], deleted=True)
+
+
+# Images are part of the property payload. Their changes are batched per transaction;
+# a property deleted meanwhile is reported as deleted when the feed is read.
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def record_property_image_change(sender, instance, **kwargs):
+    record_changes_on_commit([instance.property_id])
+
+
+@receiver(post_save, sender=PropertyImage)
+def render_property_image(sender, instance, created, **kwargs):
+    if created:
+        schedule_renditions([instance.pk])
+
+
+# Covers instance deletes, queryset deletes and cascades from Property: rows go in one
+# set-based DELETE and the files are unlinked after commit by the cleanup worker
+@receiver(post_delete, sender=PropertyImage)
+def delete_property_image_files(sender, instance, **kwargs):
+    delete_files_on_commit(instance.image.storage, [instance.image.name])
+    delete_files_on_commit(default_storage, rendition_names(instance.pk))
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def invalidate_property_list_cache(sender, **kwargs):
+    list_cache.invalidate()
+
+
+OWNER_FIELDS = ('first_name', 'last_name')
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def remember_owner_name(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._owner_name_before = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    # e.g. last_login updates
+    if update_fields is not None and not set(update_fields) & set(OWNER_FIELDS):
+        return
+    instance._owner_name_before = sender.objects.filter(pk=instance.pk).values_list(*OWNER_FIELDS).first()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def touch_owned_properties(sender, instance, **kwargs):
+    # Owner names are part of the property payload: a rename changes the validators of
+    # their properties, the change feed and the cached list pages
+    before = getattr(instance, '_owner_name_before', None)
+    if before is None or before == tuple(getattr(instance, field) for field in OWNER_FIELDS):
+        return
+    property_ids = list(Property.objects.filter(owner=instance).values_list('pk', flat=True))
+    if property_ids:
+        Property.objects.filter(pk__in=property_ids).update(updated_at=timezone.now())
+        record_changes(property_ids)
+        list_cache.invalidate()
@@ -0,0 +1,147 @@
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .geo import EARTH_RADIUS_KM
+from .models import Property
+
+# Score weights and the scales at which a similarity halves
+PRICE_WEIGHT = 0.45
+DISTANCE_WEIGHT = 0.35
+STATUS_WEIGHT = 0.20
+# log-ratio of prices (0.25 ~ 28% more or less expensive)
+PRICE_SCALE = 0.25
+DISTANCE_SCALE_KM = 5.0
+
+STATUS_CODES = {value: code for code, (value, _) in enumerate(Property.STATUS_CHOICES)}
+FIELDS = ('id', 'price', 'latitude', 'longitude', 'status')
+ARRAYS = ('ids', 'log_price', 'lat', 'lng', 'status', 'active')
+
+
+class SimilarityIndex:
+    # In-memory feature matrix of every property (one row each), kept in NumPy arrays
+    # so a query scores the whole catalogue with a handful of vector operations.
+    # Rows are updated in place on change and deleted rows are masked until compaction.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.built_at = None
+        self._allocate(0)
+
+    def _allocate(self, capacity):
+        self.size = 0
+        self.positions = {}
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.log_price = np.full(capacity, np.nan)
+        self.lat = np.full(capacity, np.nan)
+        self.lng = np.full(capacity, np.nan)
+        self.status = np.full(capacity, -1, dtype=np.int8)
+        self.active = np.zeros(capacity, dtype=bool)
+
+    def _grow(self):
+        # Doubles the capacity so appends are amortized O(1)
+        capacity = max(2 * len(self.ids), 16)
+        for name in ARRAYS:
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            setattr(self, name, grown)
+
+    def invalidate(self):
+        # The next query rebuilds the whole matrix
+        self.built_at = None
+
+    def is_stale(self):
+        return self.built_at is None or time.monotonic() - self.built_at > settings.PROPERTY_SIMILAR_INDEX_TTL
+
+    def build(self):
+        rows = list(Property.objects.order_by('pk').values_list(*FIELDS))
+        with self.lock:
+            self._allocate(len(rows))
+            for row in rows:
+                self._set_row(row)
+            self.built_at = time.monotonic()
+
+    def _set_row(self, row):
+        pk, price, latitude, longitude, status = row
+        position = self.positions.get(pk)
+        if position is None:
+            if self.size == len(self.ids):
+                self._grow()
+            position = self.size
+            self.size += 1
+            self.positions[pk] = position
+        self.ids[position] = pk
+        self.log_price[position] = np.log(float(price)) if price and price > 0 else np.nan
+        self.lat[position] = np.nan if latitude is None else latitude
+        self.lng[position] = np.nan if longitude is None else longitude
+        self.status[position] = STATUS_CODES.get(status, -1)
+        self.active[position] = True
+
+    def refresh(self, ids):
+        # Reloads the given rows; ids that no longer exist are masked out
+        if self.built_at is None:
+            return
+        ids = set(ids)
+        rows = list(Property.objects.filter(pk__in=ids).values_list(*FIELDS))
+        with self.lock:
+            for row in rows:
+                self._set_row(row)
+            for pk in ids.difference(row[0] for row in rows):
+                position = self.positions.pop(pk, None)
+                if position is not None:
+                    self.active[position] = False
+            if len(self.positions) < self.size // 2:
+                self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self.active[:self.size])
+        for name in ARRAYS:
+            setattr(self, name, getattr(self, name)[keep].copy())
+        self.size = len(keep)
+        self.positions = {int(pk): position for position, pk in enumerate(self.ids)}
+
+    def similar(self, pk, limit):
+        # Returns [(id, score)] of the best matches, best first; None if pk is unknown
+        if self.is_stale():
+            self.build()
+        with self.lock:
+            position = self.positions.get(pk)
+            if position is None:
+                return None
+            n = self.size
+            log_price = self.log_price[:n]
+            lat, lng = self.lat[:n], self.lng[:n]
+
+            price_score = np.exp2(-np.abs(log_price - log_price[position]) / PRICE_SCALE)
+            score = PRICE_WEIGHT * np.nan_to_num(price_score)
+            score += STATUS_WEIGHT * (self.status[:n] == self.status[position])
+            if not np.isnan(lat[position]):
+                # Haversine distance to every row; rows without coordinates score 0
+                lat1, lng1 = np.radians(lat[position]), np.radians(lng[position])
+                lat2, lng2 = np.radians(lat), np.radians(lng)
+                a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+                distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(np.sqrt(a), 1.0))
+                score += DISTANCE_WEIGHT * np.nan_to_num(np.exp2(-distance / DISTANCE_SCALE_KM))
+
+            score[~self.active[:n]] = -np.inf
+            score[position] = -np.inf
+            candidates = min(limit, int(self.active[:n].sum()) - 1)
+            if candidates <= 0:
+                return []
+            # Partial selection of the top k, then sort only those
+            top = np.argpartition(-score, candidates - 1)[:candidates]
+            top = top[np.argsort(-score[top], kind='stable')]
+            return [(int(self.ids[i]), round(float(score[i]), 4)) for i in top]
+
+
+index = SimilarityIndex()
+
+
+def schedule_refresh(ids):
+    ids = list(ids)
+    if ids:
+        transaction.on_commit(lambda: index.refresh(ids))
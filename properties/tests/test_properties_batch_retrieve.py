@@ -0,0 +1,70 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from properties.models import Property, PropertyImage
+from common_tests.base import BaseUserTestCase
+
+
+class PropertyBatchRetrieveTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("property-batch")
+
+        # * Create properties with images
+        self.properties = []
+        for i in range(4):
+            property = Property.objects.create(
+                title=f"Property {i}", description="d", price=100000 + i, address="a", owner=self.agent_user
+            )
+            for j in range(2):
+                PropertyImage.objects.create(
+                    property=property,
+                    image=SimpleUploadedFile(f"image_{i}_{j}.jpg", b"image_data", content_type="image/jpeg"),
+                )
+            self.properties.append(property)
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Test that properties are returned in the requested order with not-found markers
+    def test_batch_get(self):
+        ids = [self.properties[2].pk, 99999, self.properties[0].pk]
+
+        # JWT user lookup + properties (owner joined) + images prefetch
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"ids": ",".join(map(str, ids))})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data], ids)
+        self.assertEqual(response.data[0]["title"], "Property 2")
+        self.assertEqual(len(response.data[0]["images"]), 2)
+        self.assertEqual(response.data[1], {"id": 99999, "not_found": True})
+
+    # ! Test the POST variant for long id lists
+    def test_batch_post(self):
+        ids = [p.pk for p in reversed(self.properties)]
+
+        response = self.client.post(self.url, {"ids": ids}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["title"] for item in response.data], [f"Property {i}" for i in range(3, -1, -1)])
+
+    # ! Test that sparse fieldsets apply to the batch
+    def test_batch_fields(self):
+        response = self.client.get(self.url, {"ids": self.properties[0].pk, "fields": "id,title"})
+
+        self.assertEqual(response.data, [{"id": self.properties[0].pk, "title": "Property 0"}])
+
+    # ! Test the id limits and invalid ids
+    @override_settings(PROPERTY_BATCH_RETRIEVE_MAX_IDS=2)
+    def test_batch_invalid(self):
+        for params in ({"ids": "1,2,3"}, {"ids": "1,x"}, {"ids": ""}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    # ! Test that viewers can read but not update in batch
+    def test_batch_update_still_restricted(self):
+        response = self.client.patch(self.url, {"ids": [self.properties[0].pk], "status": "sold"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
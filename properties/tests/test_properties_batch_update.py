@@ -0,0 +1,90 @@
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import status
+from properties.models import Property
+from common_tests.base import BaseUserTestCase
+
+
+class PropertyBatchUpdateTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("property-batch")
+
+        # * Properties of the agent and of the admin
+        self.agent_properties = [self.create_property(f"Agent {i}", owner=self.agent_user) for i in range(3)]
+        self.admin_property = self.create_property("Admin", owner=self.admin_user)
+
+    # ! Helper function to authenticate as a user
+    def login(self, user):
+        jwt_token = self.get_jwt_token(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Test that an agent updates the status of their properties with a single UPDATE
+    def test_batch_update_status(self):
+        self.login(self.agent_user)
+        ids = [p.id for p in self.agent_properties]
+        before = Property.objects.get(id=ids[0]).updated_at
+
+        # JWT user lookup + scoped select + UPDATE + two facet counters
+        # + change feed delete / insert (+ savepoints)
+        with self.assertNumQueries(11):
+            response = self.client.patch(self.url, {"ids": ids, "status": "sold"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], ids)
+        self.assertEqual(response.data["not_found"], [])
+        self.assertEqual(Property.objects.filter(status="sold").count(), 3)
+        self.assertGreater(Property.objects.get(id=ids[0]).updated_at, before)
+
+    # ! Test that properties of other owners are left untouched
+    def test_batch_update_scoped_to_owner(self):
+        self.login(self.agent_user)
+        ids = [self.agent_properties[0].id, self.admin_property.id, 9999]
+
+        response = self.client.patch(self.url, {"ids": ids, "price": "90000.50"}, format="json")
+
+        self.assertEqual(response.data["updated"], [self.agent_properties[0].id])
+        self.assertEqual(response.data["not_found"], [self.admin_property.id, 9999])
+        self.admin_property.refresh_from_db()
+        self.assertEqual(self.admin_property.price, Decimal("100000"))
+        self.agent_properties[0].refresh_from_db()
+        self.assertEqual(self.agent_properties[0].price, Decimal("90000.50"))
+
+    # ! Test that admins can update any property
+    def test_batch_update_admin(self):
+        self.login(self.admin_user)
+        ids = [p.id for p in self.agent_properties] + [self.admin_property.id]
+
+        response = self.client.patch(self.url, {"ids": ids, "status": "reserved", "price": 1}, format="json")
+
+        self.assertEqual(len(response.data["updated"]), 4)
+        self.assertEqual(Property.objects.filter(status="reserved", price=1).count(), 4)
+
+    # ! Test that invalid payloads are rejected
+    def test_batch_update_invalid(self):
+        self.login(self.agent_user)
+        ids = [self.agent_properties[0].id]
+
+        for payload in ({"ids": ids}, {"ids": [], "status": "sold"}, {"ids": ids, "status": "lost"}):
+            response = self.client.patch(self.url, payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # ! Test that viewers cannot batch update
+    def test_batch_update_forbidden_for_viewer(self):
+        self.login(self.viewer_user)
+
+        response = self.client.patch(self.url, {"ids": [self.admin_property.id], "status": "sold"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    # ! Test that the cached list reflects the batch update
+    def test_batch_update_invalidates_list_cache(self):
+        self.login(self.agent_user)
+        self.client.get(reverse("properties-list"))
+
+        self.client.patch(self.url, {"ids": [self.agent_properties[0].id], "status": "sold"}, format="json")
+        response = self.client.get(reverse("properties-list"))
+
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+        statuses = {item["id"]: item["status"] for item in response.data["results"]}
+        self.assertEqual(statuses[self.agent_properties[0].id], "sold")
@@ -0,0 +1,99 @@
+from django.urls import reverse
+from django.test import override_settings
+from properties.models import PropertyImage
+from common_tests.base import BaseUserTestCase, make_image_file
+
+
+@override_settings(MEDIA_CLEANUP_IN_BACKGROUND=False)
+class PropertyChangesTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("property-changes")
+
+        # * Create properties, one with an image
+        self.first = self.create_property("First")
+        self.second = self.create_property("Second")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image = PropertyImage.objects.create(property=self.first, image=make_image_file("photo.jpg"))
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Helper function to read the feed
+    def sync(self, token=None, **params):
+        if token is not None:
+            params["since"] = token
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    # ! Test that a first sync returns every property with its images
+    def test_initial_sync(self):
+        data = self.sync()
+
+        self.assertEqual([item["title"] for item in data["changed"]], ["Second", "First"])
+        self.assertEqual(len(data["changed"][1]["images"]), 1)
+        self.assertEqual(data["deleted"], [])
+        self.assertFalse(data["has_more"])
+
+    # ! Test that an unchanged catalogue costs a single range scan
+    def test_unchanged_sync(self):
+        token = self.sync()["token"]
+
+        # JWT user lookup + change log range scan
+        with self.assertNumQueries(2):
+            data = self.sync(token)
+
+        self.assertEqual(data, {"token": token, "has_more": False, "changed": [], "deleted": []})
+
+    # ! Test that updates, image changes and deletes are returned since the token
+    def test_delta_sync(self):
+        token = self.sync()["token"]
+
+        self.second.title = "Second updated"
+        self.second.save()
+        third = self.create_property("Third")
+        data = self.sync(token)
+        self.assertEqual([item["title"] for item in data["changed"]], ["Second updated", "Third"])
+
+        token = data["token"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.delete()
+        data = self.sync(token)
+        self.assertEqual([item["id"] for item in data["changed"]], [self.first.pk])
+        self.assertEqual(data["changed"][0]["images"], [])
+
+        token = data["token"]
+        third_id = third.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            third.delete()
+        data = self.sync(token)
+        self.assertEqual(data["changed"], [])
+        self.assertEqual(data["deleted"], [third_id])
+
+    # ! Test that the feed is paginated with the returned token
+    def test_paging(self):
+        data = self.sync(limit=1)
+        self.assertTrue(data["has_more"])
+        self.assertEqual(len(data["changed"]), 1)
+
+        data = self.sync(data["token"], limit=1)
+        self.assertFalse(data["has_more"])
+        self.assertEqual(len(data["changed"]), 1)
+
+    # ! Test that bulk updates are part of the feed
+    def test_batch_update_in_feed(self):
+        token = self.sync()["token"]
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+        self.client.patch(reverse("property-batch"), {"ids": [self.first.pk], "status": "sold"}, format="json")
+        data = self.sync(token)
+
+        self.assertEqual([item["status"] for item in data["changed"]], ["sold"])
+
+    # ! Test that invalid tokens are rejected
+    def test_invalid_token(self):
+        response = self.client.get(self.url, {"since": "abc"})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,80 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.urls import reverse
+from properties.clusters import cluster_precision
+from common_tests.base import BaseUserTestCase
+
+SPAIN_BBOX = "36.0,-9.5,43.8,3.4"
+
+
+class PropertiesClusterTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.url = reverse("property-clusters")
+
+        # * Create properties in Madrid, in Barcelona and without coordinates
+        self.create_property("Puerta del Sol", latitude=40.4168, longitude=-3.7038, price=100000)
+        self.create_property("Retiro", latitude=40.4153, longitude=-3.6845, price=250000)
+        self.create_property("Barcelona", latitude=41.3874, longitude=2.1686, price=300000)
+        self.create_property("No coordinates", latitude=None, longitude=None, price=50000)
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Test that nearby properties are grouped at low zoom levels
+    def test_clusters_low_zoom(self):
+        response = self.client.get(self.url, {"bbox": SPAIN_BBOX, "zoom": 5})
+
+        self.assertEqual(response.status_code, 200)
+        clusters = response.data["clusters"]
+        self.assertEqual([cluster["count"] for cluster in clusters], [2, 1])
+        madrid = clusters[0]
+        self.assertAlmostEqual(madrid["latitude"], 40.41605, places=4)
+        self.assertAlmostEqual(madrid["longitude"], -3.69415, places=4)
+        self.assertEqual(Decimal(madrid["min_price"]), 100000)
+        self.assertEqual(Decimal(madrid["max_price"]), 250000)
+
+    # ! Test that properties are split at high zoom levels
+    def test_clusters_high_zoom(self):
+        response = self.client.get(self.url, {"bbox": "40.40,-3.72,40.43,-3.67", "zoom": 16})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["precision"], cluster_precision(16))
+        self.assertEqual([cluster["count"] for cluster in response.data["clusters"]], [1, 1])
+
+    # ! Test that tiles are served from the cache until a property changes
+    def test_clusters_cached_per_tile(self):
+        self.client.get(self.url, {"bbox": SPAIN_BBOX, "zoom": 5})
+
+        # Only the JWT user lookup
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {"bbox": SPAIN_BBOX, "zoom": 5})
+
+        self.create_property("Atocha", latitude=40.4065, longitude=-3.6895, price=120000)
+        response = self.client.get(self.url, {"bbox": SPAIN_BBOX, "zoom": 5})
+
+        self.assertEqual([cluster["count"] for cluster in response.data["clusters"]], [3, 1])
+
+    # ! Test that a bounding box crossing the antimeridian is supported
+    def test_clusters_antimeridian(self):
+        self.create_property("Fiji", latitude=-17.7, longitude=178.0, price=1000)
+        self.create_property("Samoa", latitude=-13.8, longitude=-172.0, price=2000)
+
+        response = self.client.get(self.url, {"bbox": "-25,170,-10,-165", "zoom": 3})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(cluster["count"] for cluster in response.data["clusters"]), 2)
+
+    # ! Test that invalid parameters are rejected
+    def test_clusters_invalid_params(self):
+        for params in (
+            {"zoom": 5},
+            {"bbox": SPAIN_BBOX},
+            {"bbox": SPAIN_BBOX, "zoom": 25},
+            {"bbox": "1,2,3", "zoom": 5},
+            # Too many tiles for the box
+            {"bbox": SPAIN_BBOX, "zoom": 18},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
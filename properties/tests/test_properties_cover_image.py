@@ -0,0 +1,101 @@
+from django.test import override_settings
+from django.urls import reverse
+from properties.models import PropertyImage
+from common_tests.base import BaseUserTestCase, make_image_file
+
+
+@override_settings(MEDIA_CLEANUP_IN_BACKGROUND=False)
+class PropertyCoverImageTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # * Create a property with three images
+        self.property = self.create_property("Property 1")
+        self.images = [
+            PropertyImage.objects.create(
+                property=self.property, position=i, image=make_image_file(f"photo_{i}.jpg", color=(i * 80, 0, 0))
+            )
+            for i in range(3)
+        ]
+
+    # ! Helper function to authenticate as a user
+    def login(self, user):
+        jwt_token = self.get_jwt_token(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Test that the list returns only the cover while the detail returns the gallery
+    def test_list_returns_cover_only(self):
+        self.login(self.viewer_user)
+        empty = self.create_property("Property 2")
+
+        response = self.client.get(reverse("properties-list"))
+
+        results = {item["id"]: item for item in response.data["results"]}
+        self.assertNotIn("images", results[self.property.pk])
+        self.assertEqual(results[self.property.pk]["cover_image"]["id"], self.images[0].pk)
+        self.assertIsNone(results[empty.pk]["cover_image"])
+
+        response = self.client.get(reverse("property-detail", args=[self.property.pk]))
+        self.assertEqual([image["id"] for image in response.data["images"]], [image.pk for image in self.images])
+
+    # ! Test that the covers of a page are fetched with a single query
+    def test_list_cover_query_budget(self):
+        self.login(self.viewer_user)
+        for i in range(10):
+            property = self.create_property(f"Extra {i}")
+            for j in range(3):
+                PropertyImage.objects.create(
+                    property=property, position=2 - j, image=make_image_file(f"extra_{i}_{j}.jpg", color=(0, i, j))
+                )
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("properties-list"))
+
+        for item in response.data["results"]:
+            self.assertEqual(item["cover_image"]["position"], 0)
+
+        # Sparse fieldsets keep the cover prefetch
+        response = self.client.get(reverse("properties-list"), {"fields": "id,cover_image"})
+        self.assertEqual(set(response.data["results"][0]), {"id", "cover_image"})
+
+    # ! Test that reordering the gallery changes the cover
+    def test_reorder_images(self):
+        self.login(self.agent_user)
+
+        response = self.client.patch(
+            reverse("property-update", args=[self.property.pk]), {"image_order": [self.images[2].pk]}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        expected = [self.images[2].pk, self.images[0].pk, self.images[1].pk]
+        self.assertEqual(list(self.property.images.values_list("id", flat=True)), expected)
+        response = self.client.get(reverse("properties-list"))
+        self.assertEqual(response.data["results"][0]["cover_image"]["id"], self.images[2].pk)
+
+    # ! Test that unknown or repeated ids reject the reordering
+    def test_reorder_invalid_ids(self):
+        self.login(self.agent_user)
+        other = self.create_property("Property 2")
+        foreign = PropertyImage.objects.create(property=other, image=make_image_file("foreign.jpg", color=(0, 0, 255)))
+        url = reverse("property-update", args=[self.property.pk])
+
+        for image_order in ([foreign.pk], [self.images[1].pk, self.images[1].pk]):
+            response = self.client.patch(url, {"title": "Changed", "image_order": image_order})
+            self.assertEqual(response.status_code, 400)
+
+        self.property.refresh_from_db()
+        self.assertEqual(self.property.title, "Property 1")
+        self.assertEqual(list(self.property.images.values_list("position", flat=True)), [0, 1, 2])
+
+    # ! Test that uploaded images are appended to the gallery
+    def test_new_images_appended(self):
+        self.login(self.agent_user)
+
+        response = self.client.patch(
+            reverse("property-update", args=[self.property.pk]),
+            {"images": [make_image_file("new_0.jpg", color=(1, 2, 3)), make_image_file("new_1.jpg", color=(4, 5, 6))]},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.property.images.values_list("position", flat=True)), [0, 1, 2, 3, 4])
@@ -2,7 +2,7 @@ from rest_framework import status
 from properties.models import Property
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
-from common_tests.base import BaseUserTestCase
+from common_tests.base import BaseUserTestCase, make_image_file
 class PropertiesCreateTests(BaseUserTestCase):
     def setUp(self):
         super().setUp()
@@ -13,7 +13,7 @@ class PropertiesCreateTests(BaseUserTestCase):
         self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
 
         # Creating a dummy image
-        image = SimpleUploadedFile("image.jpg", b"image_data", content_type="image/jpeg")
+        image = make_image_file("image.jpg")
         
         url = reverse("property-create")
         data = {
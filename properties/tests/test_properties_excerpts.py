@@ -0,0 +1,59 @@
+from io import BytesIO
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from common.text import EXCERPT_LENGTH, make_excerpt
+from properties.imports import import_properties
+from properties.models import Property
+from common_tests.base import BaseUserTestCase
+
+
+class PropertyExcerptTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Test how excerpts are cut
+    def test_make_excerpt(self):
+        self.assertEqual(make_excerpt(None), "")
+        self.assertEqual(make_excerpt("  Short\n\ttext  "), "Short text")
+        excerpt = make_excerpt("word " * 100)
+        self.assertEqual(len(excerpt), EXCERPT_LENGTH)
+        self.assertTrue(excerpt.endswith("…"))
+
+    # ! Test that the list returns the excerpt without loading the description
+    def test_list_defers_description(self):
+        property = Property.objects.create(
+            title="Property", description="A long description " * 50, price=1, address="a", owner=self.agent_user
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("properties-list"))
+
+        item = response.data["results"][0]
+        self.assertNotIn("description", item)
+        self.assertEqual(item["description_excerpt"], property.description_excerpt)
+        self.assertTrue(item["description_excerpt"].startswith("A long description"))
+        self.assertNotIn('."description"', context.captured_queries[1]["sql"])
+
+        response = self.client.get(reverse("property-detail", args=[property.pk]))
+        self.assertEqual(response.data["description"], property.description)
+
+    # ! Test that the excerpt follows updates and bulk imports
+    def test_excerpt_kept_up_to_date(self):
+        property = Property.objects.create(
+            title="Property", description="Old", price=1, address="a", owner=self.agent_user
+        )
+        property.description = "New description"
+        property.save()
+        property.refresh_from_db()
+        self.assertEqual(property.description_excerpt, "New description")
+
+        import_properties(
+            BytesIO(b'{"title": "Imported", "description": "Imported description", "price": 1, "address": "a"}\n'),
+            "ndjson",
+            self.agent_user,
+        )
+        self.assertEqual(Property.objects.get(title="Imported").description_excerpt, "Imported description")
@@ -0,0 +1,87 @@
+from io import StringIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from properties.facets import count_facets, format_facets, get_facets
+from properties.models import Property, PropertyFacetCount
+from common_tests.base import BaseUserTestCase
+
+
+class PropertyFacetsTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("property-facets")
+
+        # * Create properties in several statuses and price ranges
+        self.cheap = self.create_property("Cheap flat", price=40000, status="available")
+        self.mid = self.create_property("Mid house", price=150000, status="available")
+        self.villa = self.create_property("Sea villa", price=1500000, status="sold")
+
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Helper function to compare the summary table with a full recount
+    def assertSummaryConsistent(self):
+        self.assertEqual(get_facets(), format_facets(*count_facets(Property.objects.all())))
+
+    # ! Test that unfiltered facets are read from the summary table
+    def test_global_facets(self):
+        # JWT user lookup + summary table
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total"], 3)
+        self.assertEqual(response.data["status"]["available"], 2)
+        self.assertEqual(response.data["status"]["sold"], 1)
+        buckets = {bucket["min"]: bucket["count"] for bucket in response.data["price"]}
+        self.assertEqual(buckets[0], 1)
+        self.assertEqual(buckets[100_000], 1)
+        self.assertEqual(buckets[1_000_000], 1)
+        self.assertIsNone(response.data["price"][-1]["max"])
+
+    # ! Test that the summary follows updates and deletes
+    def test_summary_maintained(self):
+        self.mid.status = "reserved"
+        self.mid.price = 250000
+        self.mid.save()
+        self.cheap.delete()
+        # update_fields that do not touch the facets
+        self.villa.title = "Villa"
+        self.villa.save(update_fields=["title"])
+
+        self.assertSummaryConsistent()
+        self.assertEqual(get_facets()["status"]["reserved"], 1)
+        self.assertEqual(get_facets()["total"], 2)
+
+    # ! Test that filtered facets follow the list filters
+    def test_filtered_facets(self):
+        response = self.client.get(self.url, {"status": "available"})
+        self.assertEqual(response.data["total"], 2)
+        self.assertEqual(response.data["status"]["sold"], 0)
+
+        response = self.client.get(self.url, {"q": "villa"})
+        self.assertEqual(response.data["total"], 1)
+        self.assertEqual(response.data["status"]["sold"], 1)
+
+    # ! Test that the bulk import and the batch update keep the summary in sync
+    def test_bulk_paths_maintain_summary(self):
+        content = "title,description,price,address\nA,d,60000,a\nB,d,70000,a\n"
+        upload = SimpleUploadedFile("listings.csv", content.encode())
+        self.client.post(reverse("property-import"), {"file": upload})
+        self.assertSummaryConsistent()
+
+        ids = list(Property.objects.values_list("pk", flat=True))
+        self.client.patch(reverse("property-batch"), {"ids": ids, "price": 120000, "status": "rented"}, format="json")
+        self.assertSummaryConsistent()
+        self.assertEqual(get_facets()["status"]["rented"], 5)
+
+    # ! Test that the summary table can be rebuilt
+    def test_rebuild_command(self):
+        PropertyFacetCount.objects.update(count=0)
+        stdout = StringIO()
+
+        call_command("rebuild_property_facets", stdout=stdout)
+
+        self.assertIn("Counted 3 properties.", stdout.getvalue())
+        self.assertSummaryConsistent()
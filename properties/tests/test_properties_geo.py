@@ -0,0 +1,108 @@
+from django.urls import reverse
+from properties.geo import encode_geohash, geohash_cover
+from common_tests.base import BaseUserTestCase
+
+
+class PropertiesGeoTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # * Create properties around Madrid, in Barcelona and without coordinates
+        self.sol = self.create_property("Puerta del Sol", latitude=40.4168, longitude=-3.7038)
+        self.retiro = self.create_property("Retiro", latitude=40.4153, longitude=-3.6845)
+        self.barajas = self.create_property("Barajas", latitude=40.4839, longitude=-3.5680)
+        self.barcelona = self.create_property("Barcelona", latitude=41.3874, longitude=2.1686)
+        self.no_coords = self.create_property("No coordinates", latitude=None, longitude=None)
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Helper function to get the ids of the returned properties
+    def get_ids(self, params):
+        response = self.client.get(reverse("properties-list"), params)
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.data["results"]]
+
+    # ! Test the geohash encoding and that it is stored on save
+    def test_geohash_is_computed_on_save(self):
+        self.assertEqual(encode_geohash(42.6, -5.6, 5), "ezs42")
+        self.assertEqual(self.sol.geohash, encode_geohash(40.4168, -3.7038))
+        self.assertEqual(self.no_coords.geohash, "")
+
+        self.sol.latitude = 41.3874
+        self.sol.longitude = 2.1686
+        self.sol.save()
+        self.assertEqual(self.sol.geohash, self.barcelona.geohash)
+
+    # ! Test that the geohash cover contains the geohash of a point inside the box
+    def test_geohash_cover_contains_point(self):
+        prefixes = geohash_cover(40.3, -3.8, 40.5, -3.5)
+
+        self.assertLessEqual(len(prefixes), 32)
+        self.assertTrue(any(self.sol.geohash.startswith(prefix) for prefix in prefixes))
+        self.assertTrue(any(self.barajas.geohash.startswith(prefix) for prefix in prefixes))
+
+    # ! Test the bounding box filter
+    def test_bbox_filter(self):
+        ids = self.get_ids({"bbox": "40.40,-3.72,40.42,-3.68"})
+
+        self.assertCountEqual(ids, [self.sol.id, self.retiro.id])
+
+    # ! Test a bounding box crossing the antimeridian
+    def test_bbox_filter_antimeridian(self):
+        fiji = self.create_property("Fiji", latitude=-17.7, longitude=179.9)
+        samoa = self.create_property("Samoa", latitude=-13.8, longitude=-171.7)
+
+        ids = self.get_ids({"bbox": "-20,170,-10,-170"})
+
+        self.assertCountEqual(ids, [fiji.id, samoa.id])
+
+    # ! Test the radius filter
+    def test_near_filter(self):
+        ids = self.get_ids({"near": "40.4168,-3.7038", "radius_km": 5})
+        self.assertCountEqual(ids, [self.sol.id, self.retiro.id])
+
+        ids = self.get_ids({"near": "40.4168,-3.7038", "radius_km": 20})
+        self.assertCountEqual(ids, [self.sol.id, self.retiro.id, self.barajas.id])
+
+    # ! Test sorting by distance and the returned distance
+    def test_near_sorted_by_distance(self):
+        response = self.client.get(
+            reverse("properties-list"),
+            {"near": "40.4839,-3.5680", "radius_km": 1000, "sort": "distance"},
+        )
+        results = response.data["results"]
+
+        self.assertEqual([item["id"] for item in results], [self.barajas.id, self.retiro.id, self.sol.id, self.barcelona.id])
+        self.assertEqual(results[0]["distance_km"], 0)
+        self.assertAlmostEqual(results[3]["distance_km"], 492.1, delta=0.5)
+
+    # ! Test that the distance cursor walks every result in order
+    def test_near_sorted_by_distance_paginated(self):
+        url = reverse("properties-list")
+        response = self.client.get(
+            url, {"near": "40.4839,-3.5680", "radius_km": 1000, "sort": "distance", "page_size": 2}
+        )
+        ids = [item["id"] for item in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        ids += [item["id"] for item in response.data["results"]]
+
+        self.assertEqual(ids, [self.barajas.id, self.retiro.id, self.sol.id, self.barcelona.id])
+        self.assertIsNone(response.data["next"])
+
+    # ! Test that the distance is not returned without a near filter
+    def test_distance_absent_without_near(self):
+        response = self.client.get(reverse("properties-list"))
+
+        self.assertNotIn("distance_km", response.data["results"][0])
+
+    # ! Test invalid geo parameters
+    def test_invalid_geo_parameters(self):
+        url = reverse("properties-list")
+
+        self.assertEqual(self.client.get(url, {"bbox": "1,2,3"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"bbox": "a,b,c,d"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"bbox": "50,0,40,1"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"near": "40,-3"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"near": "100,-3", "radius_km": 5}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"near": "40,-3", "radius_km": -1}).status_code, 400)
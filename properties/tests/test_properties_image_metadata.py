@@ -0,0 +1,122 @@
+from io import BytesIO, StringIO
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from properties.metadata import SAMPLE_SIZE, extract_metadata
+from properties.models import Property, PropertyImage
+from common_tests.base import BaseUserTestCase, make_image_file
+
+
+# ! Helper function to build a JPEG with a gradient and an optional EXIF orientation
+def make_gradient(size=(120, 80), orientation=None):
+    # Dark to bright from left to right
+    image = Image.linear_gradient("L").rotate(90).resize(size).convert("RGB")
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_CLEANUP_IN_BACKGROUND=False)
+class PropertyImageMetadataTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Test that the metadata is stored at upload time and exposed by the API
+    def test_metadata_on_upload(self):
+        upload = make_image_file("photo.jpg", size=(64, 48))
+        data = {
+            "title": "New Property",
+            "description": "New Property Description",
+            "price": 150000,
+            "address": "123 New Street",
+            "images": [upload],
+        }
+
+        response = self.client.post(reverse("property-create"), data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        image = PropertyImage.objects.get()
+        self.assertEqual((image.width, image.height), (64, 48))
+        self.assertEqual(image.file_size, upload.size)
+        self.assertRegex(image.phash, r"^[0-9a-f]{16}$")
+        self.assertTrue(image.placeholder.startswith("data:image/webp;base64,"))
+        self.assertLess(len(image.placeholder), 1000)
+
+        response = self.client.get(reverse("property-detail", args=[image.property_id]))
+        payload = response.data["images"][0]
+        self.assertEqual((payload["width"], payload["height"]), (64, 48))
+        self.assertEqual(payload["placeholder"], image.placeholder)
+
+    # ! Test that the EXIF orientation is applied to the dimensions
+    def test_metadata_exif_orientation(self):
+        metadata = extract_metadata(BytesIO(make_gradient((120, 80), orientation=6)), 0)
+
+        self.assertEqual((metadata["width"], metadata["height"]), (80, 120))
+
+    # ! Test that the perceptual hash survives resizing and re-encoding
+    def test_perceptual_hash(self):
+        original = extract_metadata(BytesIO(make_gradient((400, 300))), 0)["phash"]
+        resized = extract_metadata(BytesIO(make_gradient((200, 150))), 0)["phash"]
+        flipped = extract_metadata(BytesIO(make_gradient((400, 300), orientation=3)), 0)["phash"]
+
+        def distance(a, b):
+            return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+        self.assertLessEqual(distance(original, resized), 4)
+        self.assertGreater(distance(original, flipped), 16)
+
+    # ! Test that large non-JPEG images are reduced before any full-size copy is made
+    def test_metadata_bounded_for_png(self):
+        gradient = Image.open(BytesIO(make_gradient((3000, 2000))))
+        buffer = BytesIO()
+        gradient.convert("RGBA").save(buffer, "PNG")
+        sizes = []
+        convert = Image.Image.convert
+
+        def record_convert(image, *args, **kwargs):
+            sizes.append(image.size)
+            return convert(image, *args, **kwargs)
+
+        with patch.object(Image.Image, "convert", autospec=True, side_effect=record_convert), \
+                patch.object(Image.Image, "transpose", autospec=True, side_effect=Image.Image.transpose) as transpose:
+            metadata = extract_metadata(buffer, 0)
+
+        self.assertEqual((metadata["width"], metadata["height"]), (3000, 2000))
+        self.assertTrue(sizes)
+        self.assertLessEqual(max(max(size) for size in sizes), SAMPLE_SIZE * 4)
+        transpose.assert_not_called()
+        jpeg = extract_metadata(BytesIO(make_gradient((3000, 2000))), 0)
+        self.assertEqual(metadata["phash"], jpeg["phash"])
+
+    # ! Test the parallel backfill command
+    def test_backfill_command(self):
+        property = Property.objects.create(
+            title="Property", description="d", price=1, address="a", owner=self.agent_user
+        )
+        image = PropertyImage.objects.create(
+            property=property,
+            image=SimpleUploadedFile("legacy.jpg", make_gradient(), content_type="image/jpeg"),
+        )
+        self.assertIsNone(image.width)
+        updated_at = Property.objects.get(pk=property.pk).updated_at
+        out = StringIO()
+
+        with patch("properties.management.commands.backfill_image_metadata.ThreadPoolExecutor") as executor:
+            executor.return_value.__enter__.return_value.map = map
+            call_command("backfill_image_metadata", stdout=out)
+
+        self.assertIn("Extracted metadata of 1 of 1 images", out.getvalue())
+        image.refresh_from_db()
+        self.assertEqual((image.width, image.height), (120, 80))
+        self.assertEqual(image.file_size, image.image.size)
+        self.assertGreater(Property.objects.get(pk=property.pk).updated_at, updated_at)
@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import BytesIO
+from unittest.mock import patch
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from properties import resize
+from properties.models import Property, PropertyImage
+from common_tests.base import BaseUserTestCase, make_image_file
+
+
+@override_settings(MEDIA_CLEANUP_IN_BACKGROUND=False)
+class PropertyImageResizeTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        # * Each test gets an empty rendition cache
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        settings_override = override_settings(PROPERTY_IMAGE_RESIZE_CACHE_DIR=cache_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        property = Property.objects.create(
+            title="Property", description="d", price=1, address="a", owner=self.agent_user
+        )
+        self.image = PropertyImage.objects.create(
+            property=property, image=make_image_file("photo.jpg", size=(640, 480), color=(10, 120, 200))
+        )
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Helper function to request a resized image
+    def get(self, pk=None, **params):
+        return self.client.get(reverse("property-image-resize", args=[pk or self.image.pk]), params)
+
+    # ! Test that the image is resized, cached and served with immutable headers
+    def test_resize(self):
+        with patch("properties.resize.write_resized", wraps=resize.write_resized) as write_resized:
+            response = self.get(w=320, fmt="jpg")
+            again = self.get(w=320, fmt="jpg")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", response["Cache-Control"])
+        with Image.open(BytesIO(b"".join(response.streaming_content))) as image:
+            self.assertEqual(image.size, (320, 240))
+        self.assertEqual(again.status_code, 200)
+        write_resized.assert_called_once()
+
+    # ! Test that the image fits the box and is never upscaled
+    def test_resize_box(self):
+        response = self.get(w=320, h=160)
+        with Image.open(BytesIO(b"".join(response.streaming_content))) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (213, 160))
+
+        response = self.get(w=1920)
+        with Image.open(BytesIO(b"".join(response.streaming_content))) as image:
+            self.assertEqual(image.size, (640, 480))
+
+    # ! Test that concurrent requests for the same rendition resize once
+    def test_concurrent_requests_coalesced(self):
+        original = resize.write_resized
+        calls = []
+
+        def slow_write(*args):
+            calls.append(args)
+            time.sleep(0.2)
+            return original(*args)
+
+        results = []
+        with patch("properties.resize.write_resized", side_effect=slow_write):
+            threads = [
+                threading.Thread(target=lambda: results.append(resize.get_resized(self.image, 100, None, "webp")))
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(results)), 1)
+        self.assertTrue(os.path.exists(results[0]))
+
+    # ! Test that the least recently used renditions are evicted above the cap
+    def test_lru_eviction(self):
+        first = resize.get_resized(self.image, 200, None, "png")
+        size = os.path.getsize(first)
+        os.utime(first, (time.time() - 100, time.time() - 100))
+        second = resize.get_resized(self.image, 201, None, "png")
+        os.utime(second, (time.time() - 50, time.time() - 50))
+        # Served again: becomes the most recently used
+        resize.get_resized(self.image, 200, None, "png")
+
+        with override_settings(PROPERTY_IMAGE_RESIZE_CACHE_MAX_BYTES=int(size * 2.5)):
+            third = resize.get_resized(self.image, 202, None, "png")
+
+        self.assertTrue(os.path.exists(first))
+        self.assertFalse(os.path.exists(second))
+        self.assertTrue(os.path.exists(third))
+
+    # ! Test that a file evicted between the resize and the read is resized again
+    def test_evicted_before_read(self):
+        get_resized = resize.get_resized
+
+        def evicted_once(*args):
+            path = get_resized(*args)
+            if evicted_once.calls == 0:
+                os.remove(path)
+            evicted_once.calls += 1
+            return path
+
+        evicted_once.calls = 0
+        with patch("properties.resize.get_resized", side_effect=evicted_once):
+            response = self.get(w=320)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(evicted_once.calls, 2)
+        with Image.open(BytesIO(b"".join(response.streaming_content))) as image:
+            self.assertEqual(image.size, (320, 240))
+
+    # ! Test that invalid requests are rejected
+    def test_invalid_requests(self):
+        self.assertEqual(self.get().status_code, 400)
+        self.assertEqual(self.get(w=0).status_code, 400)
+        self.assertEqual(self.get(w=100000).status_code, 400)
+        # Only the configured breakpoints can be requested
+        self.assertEqual(self.get(w=321).status_code, 400)
+        self.assertEqual(self.get(w=320, fmt="bmp").status_code, 400)
+        self.assertEqual(self.get(pk=99999, w=320).status_code, 404)
+
+    # ! Test that anonymous users cannot request resized images
+    def test_authentication_required(self):
+        self.client.credentials()
+        self.assertEqual(self.get(w=320).status_code, 401)
@@ -0,0 +1,126 @@
+import json
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from properties.models import Property
+from properties.search import search_queryset
+from common_tests.base import BaseUserTestCase
+
+CSV_HEADER = "title,description,price,status,address,latitude,longitude\n"
+
+
+class PropertyImportTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("property-import")
+
+    # ! Helper function to authenticate as a user
+    def login(self, user):
+        jwt_token = self.get_jwt_token(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Helper function to upload an import file
+    def upload(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode(), content_type="application/octet-stream")
+        return self.client.post(self.url, {"file": upload, **data})
+
+    # ! Test that a CSV file is imported and owned by the uploader
+    def test_import_csv(self):
+        self.login(self.agent_user)
+        content = CSV_HEADER + "".join(
+            f"House {i},Nice house,{100000 + i},available,Street {i},40.4,-3.7\n" for i in range(5)
+        )
+
+        response = self.upload("listings.csv", content)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 5)
+        self.assertEqual(response.data["failed"], 0)
+        self.assertEqual(Property.objects.filter(owner=self.agent_user).count(), 5)
+        # save() is bypassed: geohash and search index are filled by the import
+        property = Property.objects.get(title="House 3")
+        self.assertTrue(property.geohash.startswith("ezjm"))
+        self.assertEqual(search_queryset(Property.objects.all(), "nice house").count(), 5)
+
+    # ! Test that NDJSON rows are imported and invalid rows reported per line
+    def test_import_ndjson_with_errors(self):
+        self.login(self.agent_user)
+        lines = [
+            json.dumps({"title": "Flat", "description": "Flat", "price": "90000", "address": "Main 1"}),
+            "",
+            "{not json",
+            json.dumps({"title": "No price", "description": "x", "address": "Main 2"}),
+            json.dumps(["not", "an", "object"]),
+            json.dumps({"title": "Bad status", "description": "x", "price": 1, "address": "a", "status": "lost"}),
+        ]
+
+        response = self.upload("listings.ndjson", "\n".join(lines))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["failed"], 4)
+        errors = {error["line"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(set(errors), {3, 4, 5, 6})
+        self.assertIn("price", errors[4])
+        self.assertIn("status", errors[6])
+
+    # ! Test that rows are inserted in batches of the configured size
+    def test_import_batches(self):
+        self.login(self.admin_user)
+        content = CSV_HEADER + "".join(f"House {i},d,{i + 1},,Street {i},,\n" for i in range(7))
+
+        with override_settings(PROPERTY_IMPORT_BATCH_SIZE=3), \
+                patch("properties.imports.Property.objects.bulk_create", wraps=Property.objects.bulk_create) as bulk_create:
+            response = self.upload("listings.csv", content)
+
+        self.assertEqual(response.data["created"], 7)
+        self.assertEqual([len(call.args[0]) for call in bulk_create.call_args_list], [3, 3, 1])
+        self.assertEqual(Property.objects.filter(status="available", geohash="").count(), 7)
+
+    # ! Test that the error report is capped
+    def test_import_error_report_capped(self):
+        self.login(self.agent_user)
+        content = CSV_HEADER + "".join(f"House {i},d,not-a-price,,a,,\n" for i in range(5))
+
+        with override_settings(PROPERTY_IMPORT_MAX_ERRORS=2):
+            response = self.upload("listings.csv", content)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["failed"], 5)
+        self.assertEqual(len(response.data["errors"]), 2)
+        self.assertTrue(response.data["errors_truncated"])
+
+    # ! Test that an unknown format is rejected
+    def test_import_unknown_format(self):
+        self.login(self.agent_user)
+
+        response = self.upload("listings.xlsx", "data")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.upload("listings.txt", CSV_HEADER + "House,d,1,,a,,\n", format="csv")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    # ! Test that viewers cannot import properties
+    def test_import_forbidden_for_viewer(self):
+        self.login(self.viewer_user)
+
+        response = self.upload("listings.csv", CSV_HEADER)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    # ! Test that the management command imports a file
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8") as file:
+            file.write(CSV_HEADER + "House,d,1,,a,,\nBroken,d,,,a,,\n")
+            file.flush()
+            stdout, stderr = StringIO(), StringIO()
+            call_command("import_properties", file.name, owner=self.agent_user.email, stdout=stdout, stderr=stderr)
+
+        self.assertIn("Imported 1 properties, 1 rows failed.", stdout.getvalue())
+        self.assertIn("Line 3", stderr.getvalue())
+        self.assertEqual(Property.objects.get().owner, self.agent_user)
@@ -0,0 +1,115 @@
+import warnings
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from properties.models import Property, PropertyImage
+from common_tests.base import BaseUserTestCase, make_image_file
+
+
+class PropertyImageIngestTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Helper function to post a new property with the given images
+    def post_property(self, images):
+        data = {
+            "title": "New Property",
+            "description": "New Property Description",
+            "price": 150000,
+            "address": "123 New Street",
+            "images": images,
+        }
+        return self.client.post(reverse("property-create"), data)
+
+    # ! Test that many images are stored with a single insert
+    def test_images_inserted_in_bulk(self):
+        images = [make_image_file(f"photo_{i}.png", image_format="PNG") for i in range(20)]
+
+        with patch("properties.serializers.PropertyImage.objects.bulk_create", wraps=PropertyImage.objects.bulk_create) as bulk_create:
+            response = self.post_property(images)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        bulk_create.assert_called_once()
+        property = Property.objects.get()
+        self.assertEqual(property.images.count(), 20)
+        for image in property.images.all():
+            self.assertTrue(image.image.storage.exists(image.image.name))
+
+    # ! Test that a file with an image content type but invalid data is rejected
+    def test_fake_image_rejected(self):
+        fake = SimpleUploadedFile("fake.jpg", b"not really a jpeg", content_type="image/jpeg")
+
+        response = self.post_property([make_image_file("ok.jpg"), fake])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fake.jpg", response.data["images"][0])
+        self.assertEqual(Property.objects.count(), 0)
+        self.assertEqual(PropertyImage.objects.count(), 0)
+
+    # ! Test that truncated images are rejected
+    def test_truncated_image_rejected(self):
+        image = make_image_file("truncated.png", size=(200, 200), image_format="PNG")
+        truncated = SimpleUploadedFile("truncated.png", image.read()[:-40], content_type="image/png")
+
+        response = self.post_property([truncated])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # ! Test that oversize files are rejected before being decoded
+    @override_settings(PROPERTY_IMAGE_MAX_UPLOAD_SIZE=100)
+    def test_oversize_file_rejected(self):
+        with patch("properties.ingest.verify_image") as verify_image:
+            response = self.post_property([make_image_file("big.jpg", size=(300, 300))])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("too large", response.data["images"][0])
+        verify_image.assert_not_called()
+
+    # ! Test that images with too many pixels are rejected
+    @override_settings(PROPERTY_IMAGE_MAX_PIXELS=100 * 100)
+    def test_decompression_bomb_rejected(self):
+        response = self.post_property([make_image_file("bomb.png", size=(1000, 1000), image_format="PNG")])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("dimensions", response.data["images"][0])
+
+    # ! Test that verifying images in parallel leaves the global warning filters alone
+    def test_warning_filters_untouched(self):
+        filters = list(warnings.filters)
+
+        response = self.post_property([make_image_file(f"photo_{i}.jpg", color=(i, 0, 0)) for i in range(4)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(warnings.filters, filters)
+
+    # ! Test that unsupported formats are rejected
+    def test_unsupported_format_rejected(self):
+        response = self.post_property([make_image_file("photo.bmp", image_format="BMP")])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # ! Test that invalid images also block updates
+    def test_update_with_invalid_image(self):
+        property = Property.objects.create(
+            title="Property 1",
+            description="Property 1 Description",
+            price=100000,
+            address="123 Property Street",
+            owner=self.agent_user,
+        )
+        fake = SimpleUploadedFile("fake.png", b"not a png", content_type="image/png")
+
+        response = self.client.patch(
+            reverse("property-update", args=[property.pk]),
+            {"title": "Updated", "images": [fake]},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        property.refresh_from_db()
+        self.assertEqual(property.title, "Property 1")
@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.urls import reverse
+from properties.models import PropertyImage
+from common_tests.base import BaseUserTestCase, make_image_file
+
+
+class PropertyListCacheTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+        # * Create two properties
+        self.property = self.create_property("Property 1", status="available")
+        self.create_property("Property 2", status="sold")
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+        self.url = reverse("properties-list")
+
+    # ! Test that a repeated request is served from the cache without touching the properties
+    def test_repeated_request_hits_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+
+        # Only the JWT user lookup remains
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(second.json(), first.json())
+
+    # ! Test that filters, cursors and roles are cached separately
+    def test_cache_keyed_by_filter_cursor_and_role(self):
+        self.client.get(self.url)
+
+        response = self.client.get(self.url, {"status": "sold"})
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+        self.assertEqual([item["title"] for item in response.data["results"]], ["Property 2"])
+
+        page = self.client.get(self.url, {"page_size": 1})
+        response = self.client.get(page.data["next"])
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+        self.assertEqual(self.client.get(self.url).headers["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(self.url).headers["X-Cache"], "HIT")
+
+    # ! Test that saving or deleting a property invalidates the cache
+    def test_property_changes_invalidate(self):
+        self.client.get(self.url)
+
+        self.property.title = "Renamed"
+        self.property.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+        self.assertIn("Renamed", [item["title"] for item in response.data["results"]])
+
+        self.property.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 1)
+
+    # ! Test that adding or deleting an image invalidates the cache
+    def test_image_changes_invalidate(self):
+        self.client.get(self.url)
+
+        image = PropertyImage.objects.create(property=self.property, image=make_image_file())
+        self.assertEqual(self.client.get(self.url).headers["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(self.url).headers["X-Cache"], "HIT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        self.assertEqual(self.client.get(self.url).headers["X-Cache"], "MISS")
+
+    # ! Test the hit/miss counters
+    def test_cache_stats(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        stats_url = reverse("property-list-cache-stats")
+        self.assertEqual(self.client.get(stats_url).status_code, 403)
+
+        jwt_token = self.get_jwt_token(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+        response = self.client.get(stats_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["hits"], 2)
+        self.assertEqual(response.data["misses"], 1)
+        self.assertEqual(response.data["hit_ratio"], 0.6667)
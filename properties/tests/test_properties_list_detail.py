@@ -43,8 +43,8 @@ class PropertiesListTests(TestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIsInstance(response.data, list)
-        self.assertGreater(len(response.data), 0)
+        self.assertIsInstance(response.data["results"], list)
+        self.assertGreater(len(response.data["results"]), 0)
 
     # ! Test for unauthenticated user (no token)
     def test_unauthenticated_user_access_properties_list(self):
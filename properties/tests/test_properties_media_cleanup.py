@@ -0,0 +1,141 @@
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from properties.models import Property, PropertyImage
+from common_tests.base import BaseUserTestCase, make_image_file
+
+
+# The content-addressed storage needs the test database, which the worker thread cannot see
+@override_settings(MEDIA_CLEANUP_IN_BACKGROUND=False)
+class PropertyMediaCleanupTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # * Create a property with three images
+        self.property = self.create_property("Property 1")
+        self.images = [
+            PropertyImage.objects.create(property=self.property, image=make_image_file(f"photo_{i}.jpg", color=(i * 80, 0, 0)))
+            for i in range(3)
+        ]
+
+    # ! Helper function to check whether the file of an image exists
+    def file_exists(self, image):
+        return image.image.storage.exists(image.image.name)
+
+    # ! Test that files are only removed after the transaction commits
+    def test_files_removed_after_commit(self):
+        image = self.images[0]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+            self.assertTrue(self.file_exists(image))
+
+        self.assertFalse(self.file_exists(image))
+        self.assertTrue(self.file_exists(self.images[1]))
+
+    # ! Test that files are kept when the transaction is rolled back
+    def test_files_kept_on_rollback(self):
+        image = self.images[0]
+        image_id = image.pk
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    image.delete()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertTrue(PropertyImage.objects.filter(pk=image_id).exists())
+        self.assertTrue(self.file_exists(image))
+
+    # ! Test that deleting a property removes its images with set-based deletes
+    def test_property_delete_is_set_based(self):
+        for i in range(10):
+            PropertyImage.objects.create(property=self.property, image=make_image_file(f"extra_{i}.jpg"))
+        small = self.create_property("Property 2")
+        PropertyImage.objects.create(property=small, image=make_image_file("single.jpg"))
+
+        with self.captureOnCommitCallbacks():
+            with CaptureQueriesContext(connection) as context:
+                small.delete()
+        small_queries = len(context.captured_queries)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(small_queries):
+                self.property.delete()
+
+        self.assertEqual(PropertyImage.objects.count(), 0)
+        for image in self.images:
+            self.assertFalse(self.file_exists(image))
+
+    # ! Test that queryset deletes do not leak files
+    def test_queryset_delete_removes_files(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            PropertyImage.objects.filter(pk__in=[self.images[0].pk, self.images[1].pk]).delete()
+
+        self.assertFalse(self.file_exists(self.images[0]))
+        self.assertFalse(self.file_exists(self.images[1]))
+        self.assertTrue(self.file_exists(self.images[2]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Property.objects.all().delete()
+
+        self.assertFalse(self.file_exists(self.images[2]))
+
+    # ! Test that the delete endpoint removes the files
+    def test_delete_endpoint_removes_files(self):
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse("property-delete", args=[self.property.pk]))
+
+        self.assertEqual(response.status_code, 204)
+        for image in self.images:
+            self.assertFalse(self.file_exists(image))
+
+    # ! Test that removing images on update costs the same queries for one or many images
+    def test_update_delete_images_is_set_based(self):
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+        extra = [
+            PropertyImage.objects.create(property=self.property, image=make_image_file(f"extra_{i}.jpg", color=(0, i * 20, 0)))
+            for i in range(10)
+        ]
+        url = reverse("property-update", args=[self.property.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.patch(url, {"delete_images": [self.images[0].pk]})
+        self.assertEqual(response.status_code, 200)
+        single_queries = len(context.captured_queries)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(single_queries):
+                self.client.patch(url, {"delete_images": [image.pk for image in self.images[1:] + extra]})
+
+        self.assertEqual(self.property.images.count(), 0)
+        for image in self.images + extra:
+            self.assertFalse(self.file_exists(image))
+
+    # ! Test that a foreign image id rejects the whole batch before any change
+    def test_update_delete_images_foreign_id(self):
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+        other = self.create_property("Property 2")
+        foreign = PropertyImage.objects.create(property=other, image=make_image_file("foreign.jpg", color=(0, 0, 255)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("property-update", args=[self.property.pk]),
+                {"title": "Changed", "delete_images": [self.images[0].pk, foreign.pk]},
+            )
+
+        self.assertEqual(response.status_code, 403)
+        self.property.refresh_from_db()
+        self.assertEqual(self.property.title, "Property 1")
+        self.assertEqual(PropertyImage.objects.count(), 4)
+        self.assertTrue(self.file_exists(self.images[0]))
@@ -0,0 +1,177 @@
+import json
+from base64 import b64encode
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.urls import reverse
+from properties.models import Property
+from properties.pagination import PropertyCursorPagination
+from unittest.mock import patch
+from common_tests.base import BaseUserTestCase
+
+
+class PropertiesPaginationTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # * Create 25 properties for the agent
+        self.properties = [
+            Property.objects.create(
+                title=f"Property {i}",
+                description=f"Description {i}",
+                price=100000 + i,
+                address=f"Street {i}",
+                owner=self.agent_user,
+                status="sold" if i % 5 == 0 else "available",
+            )
+            for i in range(25)
+        ]
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Test that the first page is limited to the requested page size
+    def test_first_page_uses_page_size(self):
+        url = reverse("properties-list")
+
+        response = self.client.get(url, {"page_size": 10})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertIsNotNone(response.data["next"])
+        self.assertIsNone(response.data["previous"])
+
+    # ! Test that following the cursors walks every property once, newest first
+    def test_cursor_walks_all_properties(self):
+        url = reverse("properties-list")
+        seen = []
+
+        response = self.client.get(url, {"page_size": 10})
+        while True:
+            seen.extend(item["id"] for item in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        expected = [p.id for p in sorted(self.properties, key=lambda p: (p.created_at, p.id), reverse=True)]
+        self.assertEqual(seen, expected)
+
+    # ! Test that the page size is capped by the maximum page size
+    def test_page_size_is_capped(self):
+        url = reverse("properties-list")
+
+        with patch.object(PropertyCursorPagination, "max_page_size", 5):
+            response = self.client.get(url, {"page_size": 50})
+
+        self.assertEqual(len(response.data["results"]), 5)
+
+    # ! Test that filters keep working together with the cursor
+    def test_cursor_with_status_filter(self):
+        url = reverse("properties-list")
+
+        response = self.client.get(url, {"status": "sold", "page_size": 3})
+        ids = [item["id"] for item in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        ids += [item["id"] for item in response.data["results"]]
+
+        self.assertEqual(len(ids), 5)
+        self.assertTrue(all(Property.objects.get(id=i).status == "sold" for i in ids))
+
+    # ! Test that no page runs a COUNT(*) or an OFFSET scan
+    def test_no_count_or_offset_queries(self):
+        url = reverse("properties-list")
+
+        response = self.client.get(url, {"page_size": 10})
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(response.data["next"])
+
+        for query in context.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"].upper())
+            self.assertNotIn("OFFSET", query["sql"].upper())
+
+    # ! Test that an invalid cursor is rejected
+    def test_invalid_cursor(self):
+        url = reverse("properties-list")
+
+        response = self.client.get(url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 404)
+
+    # ! Test that edited cursors are rejected instead of reaching the database
+    def test_tampered_cursor(self):
+        url = reverse("properties-list")
+        payloads = [
+            {"o": "created_at", "p": ["garbage", 1], "r": 0},
+            {"o": "created_at", "p": [{}, 1], "r": 0},
+            {"o": "created_at", "p": [1e308, 1], "r": 0},
+            {"o": "created_at", "p": [None, 1], "r": 0},
+            {"o": "created_at", "p": ["2020-01-01", 1], "r": 0},
+            {"o": "created_at", "p": ["2020-01-01T00:00:00+00:00", True], "r": 0},
+            {"o": "created_at", "p": ["2020-01-01T00:00:00+00:00", 1], "r": "yes"},
+            {"o": "created_at", "p": ["2020-01-01T00:00:00+00:00"], "r": 0},
+            ["created_at"],
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                cursor = b64encode(json.dumps(payload).encode()).decode("ascii")
+
+                response = self.client.get(url, {"cursor": cursor})
+
+                self.assertEqual(response.status_code, 404)
+
+    # ! Test that an edited distance cursor is rejected
+    def test_tampered_distance_cursor(self):
+        url = reverse("properties-list")
+        for value in ["1.5", None, True]:
+            with self.subTest(value=value):
+                cursor = b64encode(json.dumps({"o": "distance_km", "p": [value, 1], "r": 0}).encode()).decode("ascii")
+
+                response = self.client.get(url, {"cursor": cursor, "sort": "distance", "near": "0,0", "radius_km": 10})
+
+                self.assertEqual(response.status_code, 404)
+
+    # ! Helper function to follow the given link of every page
+    def walk(self, response, link):
+        seen = []
+        while True:
+            seen.extend(item["id"] for item in response.data["results"])
+            if not response.data[link]:
+                return seen
+            response = self.client.get(response.data[link])
+
+    # ! Test that rows sharing created_at are paged by (created_at, id) without OFFSET
+    def test_cursor_with_tied_created_at(self):
+        Property.objects.update(created_at=timezone.now())
+        url = reverse("properties-list")
+        expected = sorted((p.id for p in self.properties), reverse=True)
+
+        first = self.client.get(url, {"page_size": 4})
+        with CaptureQueriesContext(connection) as context:
+            second = self.client.get(first.data["next"])
+        for query in context.captured_queries:
+            self.assertNotIn("OFFSET", query["sql"].upper())
+
+        self.assertEqual(self.walk(first, "next"), expected)
+
+        # Walking back from the last page returns the pages in reverse order
+        response = first
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+        pages = []
+        while True:
+            pages.append([item["id"] for item in response.data["results"]])
+            if not response.data["previous"]:
+                break
+            response = self.client.get(response.data["previous"])
+        self.assertEqual([pk for page in reversed(pages) for pk in page], expected)
+        self.assertEqual(pages[-1], expected[:4])
+        self.assertEqual([item["id"] for item in second.data["results"]], expected[4:8])
+
+    # ! Test that a cursor issued for another ordering is rejected
+    def test_cursor_from_other_ordering(self):
+        url = reverse("properties-list")
+        response = self.client.get(url, {"page_size": 5})
+
+        response = self.client.get(response.data["next"].replace("?", "?sort=distance&near=0,0&radius_km=10&"))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,73 @@
+from properties.models import Property, PropertyImage
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from common_tests.base import BaseUserTestCase
+
+# Query budgets per endpoint: JWT user lookup + properties (owner joined) + covers or images prefetch
+PROPERTY_LIST_QUERY_BUDGET = 3
+PROPERTY_DETAIL_QUERY_BUDGET = 3
+
+
+class PropertiesQueryBudgetTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Helper function to create properties with images
+    def create_properties(self, count, images_per_property=2):
+        properties = []
+        for i in range(count):
+            property = Property.objects.create(
+                title=f"Property {i}",
+                description=f"Description {i}",
+                price=100000 + i,
+                address=f"Street {i}",
+                owner=self.agent_user,
+            )
+            for j in range(images_per_property):
+                PropertyImage.objects.create(
+                    property=property,
+                    image=SimpleUploadedFile(f"image_{i}_{j}.jpg", b"image_data", content_type="image/jpeg"),
+                )
+            properties.append(property)
+        return properties
+
+    # ! Test that the list endpoint stays within its query budget
+    def test_properties_list_query_budget(self):
+        self.create_properties(10)
+
+        url = reverse("properties-list")
+
+        with self.assertNumQueries(PROPERTY_LIST_QUERY_BUDGET):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+
+    # ! Test that the number of queries does not grow with the number of properties
+    def test_properties_list_queries_constant(self):
+        self.create_properties(1)
+        url = reverse("properties-list")
+
+        with self.assertNumQueries(PROPERTY_LIST_QUERY_BUDGET):
+            self.client.get(url)
+
+        self.create_properties(15, images_per_property=3)
+
+        with self.assertNumQueries(PROPERTY_LIST_QUERY_BUDGET):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+
+    # ! Test that the detail endpoint stays within its query budget
+    def test_property_detail_query_budget(self):
+        property = self.create_properties(1, images_per_property=5)[0]
+
+        url = reverse("property-detail", args=[property.id])
+
+        with self.assertNumQueries(PROPERTY_DETAIL_QUERY_BUDGET):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["images"]), 5)
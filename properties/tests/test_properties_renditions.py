@@ -0,0 +1,107 @@
+from io import StringIO
+from unittest.mock import patch
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from properties.models import Property, PropertyImage
+from properties.renditions import RENDITION_SIZES, generate_renditions, rendition_name, rendition_names
+from common_tests.base import BaseUserTestCase, make_image_file
+
+
+class PropertyImageRenditionsTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # * Create a property with a large landscape image
+        self.property = Property.objects.create(
+            title="Property 1",
+            description="Property 1 Description",
+            price=100000,
+            address="123 Property Street",
+            owner=self.agent_user,
+        )
+        self.image = PropertyImage.objects.create(
+            property=self.property,
+            image=make_image_file("photo.jpg", size=(2000, 1000)),
+        )
+
+    def tearDown(self):
+        for name in rendition_names(self.image.pk):
+            default_storage.delete(name)
+        super().tearDown()
+
+    # ! Test that every size and format is generated
+    def test_generate_renditions(self):
+        generate_renditions(self.image)
+
+        self.image.refresh_from_db()
+        self.assertTrue(self.image.has_renditions)
+        for size, max_size in RENDITION_SIZES.items():
+            with default_storage.open(rendition_name(self.image.pk, size, "webp")) as file:
+                webp = Image.open(file)
+                self.assertEqual(webp.format, "WEBP")
+                self.assertEqual(webp.size, (max_size, max_size // 2))
+            with default_storage.open(rendition_name(self.image.pk, size, "jpg")) as file:
+                self.assertEqual(Image.open(file).format, "JPEG")
+
+    # ! Test that small images are not upscaled
+    def test_renditions_do_not_upscale(self):
+        small = PropertyImage.objects.create(property=self.property, image=make_image_file("small.png", size=(100, 80), image_format="PNG"))
+
+        generate_renditions(small)
+
+        with default_storage.open(rendition_name(small.pk, "large", "jpg")) as file:
+            self.assertEqual(Image.open(file).size, (100, 80))
+        for name in rendition_names(small.pk):
+            default_storage.delete(name)
+
+    # ! Test that the serializer exposes the rendition urls once generated
+    def test_serializer_exposes_renditions(self):
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+        url = reverse("property-detail", args=[self.property.pk])
+
+        response = self.client.get(url)
+        self.assertIsNone(response.data["images"][0]["renditions"])
+
+        generate_renditions(self.image)
+        response = self.client.get(url)
+
+        renditions = response.data["images"][0]["renditions"]
+        self.assertEqual(set(renditions), set(RENDITION_SIZES))
+        self.assertTrue(renditions["small"]["webp"].endswith(f"/renditions/{self.image.pk}/small.webp"))
+
+    # ! Test that new uploads are queued to the worker pool after commit
+    def test_new_image_scheduled_after_commit(self):
+        with patch("properties.renditions.get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                image = PropertyImage.objects.create(property=self.property, image=make_image_file("new.jpg"))
+                get_executor.assert_not_called()
+
+        get_executor.return_value.submit.assert_called_once()
+        self.assertEqual(get_executor.return_value.submit.call_args.args[1], [image.pk])
+
+    # ! Test that deleting an image removes its renditions
+    @override_settings(MEDIA_CLEANUP_IN_BACKGROUND=False)
+    def test_delete_removes_renditions(self):
+        generate_renditions(self.image)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.delete()
+
+        for name in rendition_names(self.image.pk):
+            self.assertFalse(default_storage.exists(name))
+
+    # ! Test the backfill command
+    def test_rebuild_renditions_command(self):
+        out = StringIO()
+
+        with patch("properties.management.commands.rebuild_renditions.ThreadPoolExecutor") as executor:
+            executor.return_value.__enter__.return_value.map = map
+            call_command("rebuild_renditions", "--workers", "2", stdout=out)
+
+        self.assertIn("Generated renditions for 1 of 1 images", out.getvalue())
+        self.image.refresh_from_db()
+        self.assertTrue(self.image.has_renditions)
@@ -0,0 +1,107 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from properties.search import FTS_TABLE, build_match_query
+from common_tests.base import BaseUserTestCase
+
+
+class PropertiesSearchTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # * Create properties with different texts
+        self.penthouse = self.create_property("Luxury penthouse", description="Penthouse with terrace and sea views", address="Paseo Marítimo 1")
+        self.flat = self.create_property("Flat in the centre", description="Bright flat, close to the beach", address="Calle Mayor 5")
+        self.house = self.create_property("Country house", description="Quiet house with garden", address="Camino Real 12")
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    # ! Helper function to get the ids returned for a search
+    def search(self, text, **params):
+        response = self.client.get(reverse("properties-list"), {"q": text, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.data["results"]]
+
+    # ! Test searching by title, description and address
+    def test_search_matches_text_columns(self):
+        self.assertEqual(self.search("garden"), [self.house.id])
+        self.assertEqual(self.search("mayor"), [self.flat.id])
+        self.assertEqual(self.search("maritimo"), [self.penthouse.id])
+
+    # ! Test prefix matching and that every term must match
+    def test_search_prefix_and_all_terms(self):
+        self.assertEqual(self.search("pent"), [self.penthouse.id])
+        self.assertEqual(self.search("house garden"), [self.house.id])
+        self.assertEqual(self.search("house beach"), [])
+
+    # ! Test that title matches rank above description matches
+    def test_search_ranked_by_relevance(self):
+        beach = self.create_property("Beach apartment", description="Apartment", address="Calle Sol 3")
+
+        self.assertEqual(self.search("beach"), [beach.id, self.flat.id])
+
+    # ! Test that FTS5 syntax in the input is not interpreted
+    def test_search_escapes_operators(self):
+        self.assertEqual(build_match_query('house" OR "flat'), '"house"* "OR"* "flat"*')
+        self.assertEqual(self.search('house" OR (flat'), [])
+        self.assertEqual(len(self.search("")), 3)
+
+    # ! Test that the index follows updates and deletes
+    def test_index_kept_in_sync(self):
+        self.house.title = "Country villa"
+        self.house.save()
+        self.assertEqual(self.search("villa"), [self.house.id])
+        self.assertEqual(self.search("country"), [self.house.id])
+
+        self.house.delete()
+        self.assertEqual(self.search("villa"), [])
+
+    # ! Test combining the search with other filters
+    def test_search_with_status_filter(self):
+        self.flat.status = "sold"
+        self.flat.save()
+
+        self.assertEqual(self.search("beach", status="sold"), [self.flat.id])
+        self.assertEqual(self.search("beach", status="available"), [])
+
+    # ! Test the rebuild management command
+    def test_rebuild_search_index_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        self.assertEqual(self.search("garden"), [])
+
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+
+        self.assertIn("Indexed 3 properties", out.getvalue())
+        self.assertEqual(self.search("garden"), [self.house.id])
+
+    # ! Test that the relevance cursor walks every result in order
+    def test_search_paginated_by_relevance(self):
+        beach = self.create_property("Beach apartment", description="Apartment", address="Calle Sol 3")
+
+        response = self.client.get(reverse("properties-list"), {"q": "beach", "page_size": 1})
+        ids = [item["id"] for item in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        ids += [item["id"] for item in response.data["results"]]
+
+        self.assertEqual(ids, [beach.id, self.flat.id])
+        self.assertIsNone(response.data["next"])
+
+    # ! Test that the full-text query runs once per page, not once per candidate row
+    def test_search_not_correlated(self):
+        self.create_property("Beach apartment", description="Apartment", address="Calle Sol 3")
+        response = self.client.get(reverse("properties-list"), {"q": "beach", "page_size": 1})
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(response.status_code, 200)
+        searches = [query["sql"] for query in context.captured_queries if "MATCH" in query["sql"]]
+        self.assertTrue(searches)
+        for sql in searches:
+            self.assertEqual(sql.count("MATCH"), 1)
+            self.assertNotIn(f"FROM {FTS_TABLE} WHERE", sql)
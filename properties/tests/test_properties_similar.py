@@ -0,0 +1,84 @@
+import time
+from django.urls import reverse
+from properties.similar import index
+from common_tests.base import BaseUserTestCase
+
+
+class PropertiesSimilarTests(BaseUserTestCase):
+    def setUp(self):
+        super().setUp()
+        # The matrix lives in memory and outlives the test transactions
+        index.invalidate()
+
+        # * Create a target flat in Madrid and candidates of different price, place and status
+        self.target = self.create_property("Target", price=200000, latitude=40.4168, longitude=-3.7038)
+        self.twin = self.create_property("Twin", price=205000, latitude=40.4170, longitude=-3.7040)
+        self.far = self.create_property("Far", price=200000, latitude=41.3874, longitude=2.1686)
+        self.pricey = self.create_property("Pricey", price=900000, latitude=40.4160, longitude=-3.7030)
+        self.sold = self.create_property("Sold", price=200000, latitude=40.4168, longitude=-3.7038, status="sold")
+        self.no_coords = self.create_property("No coords", price=200000, latitude=None, longitude=None)
+
+        jwt_token = self.get_jwt_token(self.viewer_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+    def tearDown(self):
+        index.invalidate()
+        super().tearDown()
+
+    # ! Test that candidates are ranked by price, distance and status
+    def test_similar_ranking(self):
+        response = self.client.get(reverse("property-similar", args=[self.target.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        titles = [item["title"] for item in response.data]
+        self.assertEqual(titles[0], "Twin")
+        self.assertNotIn("Target", titles)
+        self.assertEqual(set(titles), {"Twin", "Far", "Pricey", "Sold", "No coords"})
+        scores = [item["similarity"] for item in response.data]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertIn("images", response.data[0])
+
+    # ! Test the limit parameter
+    def test_similar_limit(self):
+        response = self.client.get(reverse("property-similar", args=[self.target.pk]), {"limit": 2})
+        self.assertEqual(len(response.data), 2)
+
+        response = self.client.get(reverse("property-similar", args=[self.target.pk]), {"limit": 0})
+        self.assertEqual(response.status_code, 400)
+
+    # ! Test that unknown properties return 404
+    def test_similar_not_found(self):
+        response = self.client.get(reverse("property-similar", args=[99999]))
+
+        self.assertEqual(response.status_code, 404)
+
+    # ! Test that the matrix is updated incrementally after commit
+    def test_similar_incremental_updates(self):
+        self.client.get(reverse("property-similar", args=[self.target.pk]))
+        built_at = index.built_at
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.twin.delete()
+            self.pricey.price = 200000
+            self.pricey.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            newcomer = self.create_property("Newcomer", price=200000, latitude=40.4169, longitude=-3.7039)
+
+        response = self.client.get(reverse("property-similar", args=[self.target.pk]), {"limit": 2})
+
+        self.assertEqual(index.built_at, built_at)
+        self.assertEqual({item["id"] for item in response.data}, {newcomer.pk, self.pricey.pk})
+
+    # ! Test that scoring a large catalogue stays fast
+    def test_similar_scales(self):
+        index.build()
+        # Simulate a large catalogue by appending synthetic rows to the matrix
+        for i in range(100_000):
+            index._set_row((10_000_000 + i, 100000 + i, 40 + i % 100 / 100, -3 - i % 50 / 50, "available"))
+
+        start = time.perf_counter()
+        scores = index.similar(self.target.pk, 10)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(scores), 10)
+        self.assertLess(elapsed, 0.25)
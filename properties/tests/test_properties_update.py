@@ -3,7 +3,7 @@ from accounts.models import CustomUser
 from properties.models import Property, PropertyImage
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
-from common_tests.base import BaseUserTestCase
+from common_tests.base import BaseUserTestCase, make_image_file
 
 class PropertiesUpdateTests(BaseUserTestCase):
     def setUp(self):
@@ -39,7 +39,7 @@ class PropertiesUpdateTests(BaseUserTestCase):
         self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
 
         # Creating a new dummy image
-        new_image = SimpleUploadedFile("new_image.jpg", b"new_image_data", content_type="image/jpeg")
+        new_image = make_image_file("new_image.jpg")
 
         url = reverse("property-update", args=[self.property.pk])
         data = {
@@ -64,7 +64,8 @@ class PropertiesUpdateTests(BaseUserTestCase):
         # Check that the new image was added
         new_images = PropertyImage.objects.filter(property=self.property)
         self.assertEqual(new_images.count(), 1)
-        self.assertIn("new_image", new_images.first().image.name)
+        self.assertTrue(new_images.first().image.name.startswith("property_images/"))
+        self.assertTrue(new_images.first().image.name.endswith(".jpg"))
 
     # ! Test for agent2 user trying to update agent's property
     def test_agent2_user_update_agent_property(self):
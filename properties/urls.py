@@ -5,12 +5,30 @@ from .views import (
     PropertyCreateView,
     PropertyUpdateView,
     PropertyDeleteView,
+    PropertyListCacheStatsView,
+    PropertyImportView,
+    PropertyBatchView,
+    PropertyClusterView,
+    PropertyFacetsView,
+    PropertySimilarView,
+    PropertyChangesView,
+    PropertyImageResizeView,
+    PropertyImageFileView,
 )
 
 urlpatterns = [
     path('', PropertyListView.as_view(), name='properties-list'),
+    path('facets/', PropertyFacetsView.as_view(), name='property-facets'),
+    path('changes/', PropertyChangesView.as_view(), name='property-changes'),
+    path('clusters/', PropertyClusterView.as_view(), name='property-clusters'),
     path('<int:pk>/', PropertyDetailView.as_view(), name='property-detail'),
+    path('<int:pk>/similar/', PropertySimilarView.as_view(), name='property-similar'),
+    path('images/<int:pk>/', PropertyImageResizeView.as_view(), name='property-image-resize'),
+    path('images/<int:pk>/file/', PropertyImageFileView.as_view(), name='property-image-file'),
     path('create/', PropertyCreateView.as_view(), name='property-create'),
     path('<int:pk>/update/', PropertyUpdateView.as_view(), name='property-update'),
     path('<int:pk>/delete/', PropertyDeleteView.as_view(), name='property-delete'),
+    path('batch/', PropertyBatchView.as_view(), name='property-batch'),
+    path('import/', PropertyImportView.as_view(), name='property-import'),
+    path('cache-stats/', PropertyListCacheStatsView.as_view(), name='property-list-cache-stats'),
 ]
\ No newline at end of file
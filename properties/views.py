@@ -3,26 +3,223 @@ from rest_framework import generics, permissions
 from rest_framework.mixins import UpdateModelMixin
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Property
-from .serializers import PropertySerializer
-from .permissions import IsOwnerOrAdmin, IsAgentOrAdmin
+from .models import Property, PropertyImage
+from .resize import RESIZE_FORMATS, open_resized
+from .serializers import (
+    PropertyBatchUpdateSerializer, PropertyIdsSerializer, PropertyListSerializer, PropertySerializer
+)
+from .permissions import IsOwnerOrAdmin, IsAgentOrAdmin, IsAdmin
+from . import cache as list_cache
+from .imports import FORMATS, detect_format, import_properties
+from .pagination import PropertyCursorPagination
+from .filters import PropertyFilter, parse_floats, validate_point
+from .clusters import MAX_ZOOM, get_clusters
+from .facets import apply_deltas, deltas_for, get_facets
+from .similar import index as similarity_index, schedule_refresh
+from .changes import get_changes, record_changes
 from rest_framework.generics import CreateAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
 from drf_spectacular.utils import extend_schema
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.conf import settings
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from PIL import UnidentifiedImageError
+from common.conditional import ConditionalRetrieveMixin
+from common.sparse import SparseFieldsetsViewMixin
+from common.serving import serve_file
 @extend_schema(tags=["properties"])
-class PropertyListView(generics.ListAPIView):
-    queryset = Property.objects.all()
-    serializer_class = PropertySerializer
+class PropertyListView(SparseFieldsetsViewMixin, generics.ListAPIView):
+    # Owners are joined and the covers of the whole page fetched with one window query
+    # (ROW_NUMBER() per property), so the page costs a fixed number of queries
+    # The description is only read by the detail endpoint
+    queryset = Property.objects.select_related('owner').defer('description').prefetch_related(
+        Prefetch('images', queryset=PropertyImage.objects.order_by('position', 'id')[:1], to_attr='cover_images')
+    )
+    serializer_class = PropertyListSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['status']
+    filterset_class = PropertyFilter
+    pagination_class = PropertyCursorPagination
+
+    def list(self, request, *args, **kwargs):
+        # Pages are served from the list cache until a property or image changes
+        key = list_cache.cache_key(request)
+        data = list_cache.get_page(key)
+        if data is not None:
+            response = Response(data)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        list_cache.set_page(key, response.data)
+        response.headers['X-Cache'] = 'MISS'
+        return response
 
 @extend_schema(tags=["properties"])
-class PropertyDetailView(generics.RetrieveAPIView):
+class PropertyClusterView(APIView):
+    # Map clusters: ?bbox=min_lat,min_lng,max_lat,max_lng&zoom=0..20
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        bbox = request.query_params.get('bbox')
+        if not bbox:
+            raise ValidationError({'bbox': "This parameter is required."})
+        min_lat, min_lng, max_lat, max_lng = parse_floats(bbox, 4, 'bbox')
+        validate_point(min_lat, min_lng, 'bbox')
+        validate_point(max_lat, max_lng, 'bbox')
+        if min_lat > max_lat:
+            raise ValidationError({'bbox': "min_lat must not be greater than max_lat."})
+
+        try:
+            zoom = int(request.query_params.get('zoom', ''))
+        except ValueError:
+            raise ValidationError({'zoom': f"Expected an integer between 0 and {MAX_ZOOM}."})
+        if not 0 <= zoom <= MAX_ZOOM:
+            raise ValidationError({'zoom': f"Expected an integer between 0 and {MAX_ZOOM}."})
+
+        return Response(get_clusters(min_lat, min_lng, max_lat, max_lng, zoom))
+
+@extend_schema(tags=["properties"])
+class PropertyFacetsView(generics.GenericAPIView):
+    # Status counts and price histogram for the same filters as the list
     queryset = Property.objects.all()
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = PropertyFilter
+
+    def get(self, request):
+        filtered = any(request.query_params.get(name) for name in PropertyFilter.base_filters)
+        if not filtered:
+            # Read from the summary table
+            return Response(get_facets())
+        return Response(get_facets(self.filter_queryset(self.get_queryset())))
+
+@extend_schema(tags=["properties"])
+class PropertyChangesView(APIView):
+    # Delta sync: ?since=<token> returns the properties changed and the ids deleted
+    # since then, plus the token for the next call
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', settings.PROPERTY_CHANGES_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({'since': "Expected an integer token."})
+        if since < 0 or not 1 <= limit <= settings.PROPERTY_CHANGES_PAGE_SIZE:
+            raise ValidationError({'limit': f"Must be between 1 and {settings.PROPERTY_CHANGES_PAGE_SIZE}."})
+
+        token, has_more, changed_ids, deleted = get_changes(since, limit)
+        changed = []
+        if changed_ids:
+            properties = Property.objects.select_related('owner').prefetch_related('images').in_bulk(changed_ids)
+            changed = [properties[pk] for pk in changed_ids if pk in properties]
+            # Deleted after the change was read
+            deleted += [pk for pk in changed_ids if pk not in properties]
+        return Response({
+            'token': str(token),
+            'has_more': has_more,
+            'changed': PropertySerializer(changed, many=True, context={'request': request}).data,
+            'deleted': deleted,
+        })
+
+@extend_schema(tags=["properties"])
+class PropertyDetailView(ConditionalRetrieveMixin, SparseFieldsetsViewMixin, generics.RetrieveAPIView):
+    queryset = Property.objects.select_related('owner').prefetch_related('images')
     serializer_class = PropertySerializer
     permission_classes = [permissions.IsAuthenticated]
 
+@extend_schema(tags=["properties"])
+class PropertySimilarView(APIView):
+    # Top ?limit= properties closest in price, distance and status, scored in memory
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            raise ValidationError({'limit': "Expected an integer."})
+        if not 1 <= limit <= settings.PROPERTY_SIMILAR_MAX_LIMIT:
+            raise ValidationError({'limit': f"Must be between 1 and {settings.PROPERTY_SIMILAR_MAX_LIMIT}."})
+
+        scores = similarity_index.similar(pk, limit)
+        if scores is None:
+            # Created since the matrix was built (e.g. by another process)
+            if not Property.objects.filter(pk=pk).exists():
+                raise Http404
+            similarity_index.refresh([pk])
+            scores = similarity_index.similar(pk, limit) or []
+
+        properties = Property.objects.select_related('owner').prefetch_related('images').in_bulk(
+            [property_id for property_id, _ in scores]
+        )
+        ranked = [(properties[property_id], score) for property_id, score in scores if property_id in properties]
+        results = PropertySerializer(
+            [property for property, _ in ranked], many=True, context={'request': request}
+        ).data
+        for item, (_, score) in zip(results, ranked):
+            item['similarity'] = score
+        return Response(results)
+
+@extend_schema(tags=["properties"])
+class PropertyImageResizeView(APIView):
+    # ?w=&h=&fmt=webp|jpg|png: the image fitted in the box, resized once and then served
+    # from the disk cache. Sizes are limited to PROPERTY_IMAGE_RESIZE_SIZES.
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        fmt = request.query_params.get('fmt', 'webp')
+        if fmt not in RESIZE_FORMATS:
+            raise ValidationError({'fmt': f"Expected one of: {', '.join(RESIZE_FORMATS)}."})
+        width = self.parse_dimension(request, 'w')
+        height = self.parse_dimension(request, 'h')
+        if width is None and height is None:
+            raise ValidationError({'w': "Provide w and/or h."})
+
+        image = get_object_or_404(PropertyImage, pk=pk)
+        try:
+            file = open_resized(image, width, height, fmt)
+        except (FileNotFoundError, UnidentifiedImageError):
+            raise Http404
+
+        response = FileResponse(file, content_type=RESIZE_FORMATS[fmt][2])
+        # The URL always designates the same bytes, but only authenticated users may see them
+        response['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return response
+
+    def parse_dimension(self, request, name):
+        value = request.query_params.get(name)
+        if not value:
+            return None
+        sizes = settings.PROPERTY_IMAGE_RESIZE_SIZES
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValidationError({name: "Expected an integer."})
+        if value not in sizes:
+            raise ValidationError({name: f"Expected one of: {', '.join(map(str, sizes))}."})
+        return value
+
+@extend_schema(tags=["properties"])
+class PropertyImageFileView(generics.GenericAPIView):
+    # Original image file for authenticated users, with Range / sendfile support
+    queryset = PropertyImage.objects.all()
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        image = self.get_object()
+        try:
+            return serve_file(request, image.image)
+        except FileNotFoundError:
+            raise Http404
+
 @extend_schema(tags=["properties"])
 class PropertyCreateView(CreateAPIView):
     queryset = Property.objects.all()
@@ -45,3 +242,105 @@ class PropertyDeleteView(generics.DestroyAPIView):
     queryset = Property.objects.all()
     serializer_class = PropertySerializer
     permission_classes = [IsOwnerOrAdmin]
+
+@extend_schema(tags=["properties"], request=PropertyBatchUpdateSerializer)
+class PropertyBatchView(APIView):
+    # GET ?ids=1,2,3 (or POST {"ids": [...]} for long lists) returns the properties in
+    # the requested order. PATCH applies the same status / price change to many
+    # properties with one UPDATE; ownership is enforced by the queryset instead of
+    # per-object permission checks.
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_permissions(self):
+        if self.request.method == 'PATCH':
+            return [IsAgentOrAdmin()]
+        return super().get_permissions()
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == 'admin':
+            return Property.objects.all()
+        return Property.objects.filter(owner=user)
+
+    def get(self, request):
+        ids = request.query_params.get('ids', '')
+        try:
+            ids = [int(pk) for pk in ids.split(',') if pk.strip()]
+        except ValueError:
+            raise ValidationError({'ids': "Expected comma separated ids."})
+        return self.retrieve(request, {'ids': ids})
+
+    def post(self, request):
+        return self.retrieve(request, request.data)
+
+    def retrieve(self, request, data):
+        serializer = PropertyIdsSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        properties = Property.objects.select_related('owner').prefetch_related('images').in_bulk(ids)
+        found = [pk for pk in dict.fromkeys(ids) if pk in properties]
+        data = PropertySerializer(
+            [properties[pk] for pk in found], many=True, context={'request': request}
+        ).data
+        by_id = dict(zip(found, data))
+        return Response([by_id[pk] if pk in by_id else {'id': pk, 'not_found': True} for pk in ids])
+
+    def patch(self, request):
+        serializer = PropertyBatchUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        changes = dict(serializer.validated_data)
+        ids = set(changes.pop('ids'))
+
+        with transaction.atomic():
+            queryset = self.get_queryset().filter(pk__in=ids)
+            before = list(queryset.select_for_update().values_list('pk', 'status', 'price'))
+            updated = sorted(pk for pk, _, _ in before)
+            # update() skips auto_now and post_save: set updated_at (ETags), move the
+            # facet counts and drop cached pages here
+            Property.objects.filter(pk__in=updated).update(updated_at=timezone.now(), **changes)
+            deltas = deltas_for(
+                (changes.get('status', status), changes.get('price', price)) for _, status, price in before
+            )
+            deltas.subtract(deltas_for((status, price) for _, status, price in before))
+            apply_deltas(deltas)
+            schedule_refresh(updated)
+            record_changes(updated)
+        if updated:
+            list_cache.invalidate()
+
+        return Response({'updated': updated, 'not_found': sorted(ids.difference(updated))})
+
+@extend_schema(tags=["properties"])
+class PropertyImportView(APIView):
+    # Bulk import of a CSV or NDJSON file, streamed from the temporary upload file
+    permission_classes = [IsAgentOrAdmin]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ["No file was submitted."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get('format') or detect_format(upload.name, upload.content_type or '')
+        if file_format not in FORMATS:
+            return Response(
+                {'format': [f"Unsupported format, expected one of: {', '.join(FORMATS)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        report = import_properties(upload, file_format, owner=request.user)
+        if report['created']:
+            response_status = status.HTTP_201_CREATED
+        elif report['failed']:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_200_OK
+        return Response(report, status=response_status)
+
+@extend_schema(tags=["properties"])
+class PropertyListCacheStatsView(APIView):
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(list_cache.get_stats())
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:31
+
+from django.db import migrations, models
+from common.text import make_excerpt
+
+
+def backfill_excerpts(apps, schema_editor):
+    Visit = apps.get_model('visits', 'Visit')
+    rows = []
+    for row in Visit.objects.only('pk', 'notes').iterator(chunk_size=1000):
+        row.notes_excerpt = make_excerpt(row.notes)
+        rows.append(row)
+        if len(rows) == 1000:
+            Visit.objects.bulk_update(rows, ['notes_excerpt'])
+            rows = []
+    Visit.objects.bulk_update(rows, ['notes_excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('visits', '0003_visit_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='visit',
+            name='notes_excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
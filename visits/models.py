@@ -2,8 +2,10 @@ from django.db import models
 from properties.models import Property
 from clients.models import Client
 from django.conf import settings
+from common.models import VersionedModel
+from common.text import EXCERPT_LENGTH, make_excerpt
 
-class Visit(models.Model):
+class Visit(VersionedModel):
     property = models.ForeignKey(
         Property,
         on_delete=models.CASCADE,
@@ -26,4 +28,10 @@ class Visit(models.Model):
         ('canceled', 'Canceled')
     ])
     notes = models.TextField(blank=True, null=True)
+    # Precomputed so list queries can defer the full notes
+    notes_excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, default="", editable=False)
+
+    def save(self, *args, **kwargs):
+        self.notes_excerpt = make_excerpt(self.notes)
+        super().save(*args, **kwargs)
     
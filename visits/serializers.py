@@ -3,8 +3,9 @@ from .models import Visit
 from clients.models import Client
 from properties.models import Property
 from django.utils import timezone
+from common.sparse import SparseFieldsetsMixin
 
-class VisitSerializer(serializers.ModelSerializer):
+class VisitSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Visit
         fields = ['id', 'property', 'client', 'agent', 'date', 'status', 'notes']
@@ -35,4 +36,10 @@ class VisitSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data['agent'] = self.context['request'].user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+
+class VisitListSerializer(VisitSerializer):
+    # Lists return the stored excerpt instead of the full notes
+    class Meta(VisitSerializer.Meta):
+        fields = ['id', 'property', 'client', 'agent', 'date', 'status', 'notes_excerpt']
\ No newline at end of file
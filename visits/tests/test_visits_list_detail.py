@@ -1,3 +1,5 @@
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from rest_framework import status
 from django.urls import reverse
 from accounts.models import CustomUser
@@ -165,3 +167,17 @@ class VisitsListDetailTests(BaseUserTestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         
 
+    # ! Test that the list returns an excerpt of the notes without loading them
+    def test_visits_list_returns_notes_excerpt(self):
+        Visit.objects.filter(pk=self.visit.pk).update(notes="Bring the keys.\n\n  Call first.")
+        self.visit.refresh_from_db()
+        self.visit.save()
+        jwt_token = self.get_jwt_token(self.agent_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("visit-list-create"))
+
+        self.assertNotIn("notes", response.data[0])
+        self.assertEqual(response.data[0]["notes_excerpt"], "Bring the keys. Call first.")
+        self.assertNotIn('."notes"', context.captured_queries[-1]["sql"])
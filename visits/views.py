@@ -1,29 +1,39 @@
 from django.shortcuts import render
 from rest_framework import generics
 from .models import Visit
-from .serializers import VisitSerializer
+from .serializers import VisitListSerializer, VisitSerializer
 from .permissions import IsAgentOrAdmin
 from drf_spectacular.utils import extend_schema
+from common.conditional import ConditionalRetrieveMixin
+from common.sparse import SparseFieldsetsViewMixin
 @extend_schema(tags=["Visits"])
-class VisitListCreateView(generics.ListCreateAPIView):
+class VisitListCreateView(SparseFieldsetsViewMixin, generics.ListCreateAPIView):
     serializer_class = VisitSerializer
     permission_classes = [IsAgentOrAdmin]
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return Visit.objects.none()
+        # The notes are only read by the detail endpoint
         user = self.request.user
         if user.role == 'admin':
-            return Visit.objects.all()
-        return Visit.objects.filter(agent=user)
+            return Visit.objects.defer('notes')
+        return Visit.objects.filter(agent=user).defer('notes')
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return VisitListSerializer
+        return VisitSerializer
 
     def perform_create(self, serializer):
         serializer.save(agent=self.request.user)
 
 @extend_schema(tags=["Visits"])
-class VisitRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class VisitRetrieveUpdateDestroyView(ConditionalRetrieveMixin, SparseFieldsetsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = VisitSerializer
     permission_classes = [IsAgentOrAdmin]
+    # Read by the object permission check
+    sparse_required_fields = ('agent', 'updated_at', 'version')
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):